@@ -1,17 +1,106 @@
-"""Django helper functions."""
-
-from .functions import auto_unique
-from .models import (
-    ModelWithGetOrNew,
-    ModelWithId,
-    ModelWithTimestamps,
-    ModelWithTimestampsAndFunctions,
-)
+"""Django helper functions.
+
+The exports are imported lazily the first time they are accessed, so importing the
+package does not import Django or any of the modules that are not used.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache import GetOrNewCache, SharedGetOrNewCache
+    from .constraints import natural_keys
+    from .functions import auto_index, auto_timestamp_indexes, auto_unique
+    from .instrumentation import Instrumentation, OperationStats, operation_finished
+    from .models import (
+        ModelWithChangeTracking,
+        ModelWithGetOrNew,
+        ModelWithId,
+        ModelWithTimestamps,
+        ModelWithTimestampsAndFunctions,
+        ModelWithTimestampsAndUpdateAt,
+        resolve_graph,
+    )
+    from .partitions import TimestampPartitioning, maintain_partitions
+    from .staleness import outdated_mask, outdated_pks
+
+# The module each export is imported from
+_EXPORTS = {
+    "auto_index": ".functions",
+    "auto_timestamp_indexes": ".functions",
+    "auto_unique": ".functions",
+    "GetOrNewCache": ".cache",
+    "Instrumentation": ".instrumentation",
+    "ModelWithChangeTracking": ".models",
+    "ModelWithId": ".models",
+    "ModelWithGetOrNew": ".models",
+    "ModelWithTimestamps": ".models",
+    "ModelWithTimestampsAndFunctions": ".models",
+    "ModelWithTimestampsAndUpdateAt": ".models",
+    "OperationStats": ".instrumentation",
+    "SharedGetOrNewCache": ".cache",
+    "TimestampPartitioning": ".partitions",
+    "maintain_partitions": ".partitions",
+    "natural_keys": ".constraints",
+    "operation_finished": ".instrumentation",
+    "outdated_mask": ".staleness",
+    "outdated_pks": ".staleness",
+    "resolve_graph": ".models",
+}
 
 __all__ = (
+    "auto_index",
+    "auto_timestamp_indexes",
     "auto_unique",
+    "GetOrNewCache",
+    "Instrumentation",
+    "ModelWithChangeTracking",
     "ModelWithId",
     "ModelWithGetOrNew",
     "ModelWithTimestamps",
     "ModelWithTimestampsAndFunctions",
+    "ModelWithTimestampsAndUpdateAt",
+    "OperationStats",
+    "SharedGetOrNewCache",
+    "TimestampPartitioning",
+    "maintain_partitions",
+    "natural_keys",
+    "operation_finished",
+    "outdated_mask",
+    "outdated_pks",
+    "resolve_graph",
 )
+
+
+def __getattr__(name: str) -> object:
+    """Import an export the first time it is accessed.
+
+    Args:
+        name: The name of the export.
+
+    Returns:
+        The export.
+
+    Raises:
+        `AttributeError`: If the name is not an export of the package.
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Later accesses find the export without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the exports with the rest of the module attributes.
+
+    Returns:
+        The names of the module attributes.
+    """
+    return sorted({*globals(), *__all__})
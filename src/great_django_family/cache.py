@@ -0,0 +1,537 @@
+"""Caches for get_or_new lookups."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from contextlib import ContextDecorator
+from contextvars import ContextVar, Token
+from functools import partial
+from typing import TYPE_CHECKING, Any, Self
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import TracebackType
+
+    from django.core.cache.backends.base import BaseCache
+    from django.db import models
+
+_LookupKey = tuple[tuple[str, object], ...]
+_CacheKey = tuple[type[Any], str, _LookupKey]
+_NOT_CACHED = object()
+
+_active_caches: ContextVar[tuple[GetOrNewCache, ...]] = ContextVar(
+    "_active_caches",
+    default=(),
+)
+
+
+class GetOrNewCache(ContextDecorator):
+    """Scoped identity map for get_or_new lookups.
+
+    While the cache is active every get_or_new and get_or_new_many call checks the
+    cache before querying the database, and objects fetched from the database are
+    added to the cache. Repeated lookups for the same values return the same object
+    without making any queries.
+
+    The cache can be used as a context manager or as a decorator:
+
+        with GetOrNewCache():
+            artist, _created = Artist.objects.get_or_new(name="name")
+
+    When used as a decorator every call uses a new empty cache, so objects are not
+    kept between calls and concurrent calls do not share a cache.
+
+    Only objects that exist in the database are cached, new objects are never cached
+    because they have not been saved yet. Cached objects are removed when they are
+    saved or deleted so a lookup never returns an object whose lookup values may have
+    changed. When the cache is full the least recently used object is removed.
+
+    Lookups that are known to not exist can be recorded with set_missing, which is
+    done by warm and resolve_graph. A missing lookup returns a new object without
+    making a query. Every missing lookup of a model is removed when an object of the
+    model is saved or deleted, missing lookups do not count towards maxsize.
+
+    Saved and deleted objects are noticed through post_save and post_delete, and
+    through bulk_save, add_timestamps_and_save_many and update_or_new_many which
+    save without sending post_save. Changes made with QuerySet.update, bulk_create or
+    bulk_update are not noticed.
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize: The maximum number of lookups to keep in the cache.
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[_CacheKey, models.Model] = OrderedDict()
+        self._keys_by_pk: dict[tuple[type[Any], str, object], set[_CacheKey]] = {}
+        self._missing: dict[tuple[type[Any], str], set[_LookupKey]] = {}
+        self._tokens: list[Token[tuple[GetOrNewCache, ...]]] = []
+
+    def _recreate_cm(self) -> Self:
+        """Create the cache used by a call of a decorated function.
+
+        Returns:
+            A new empty cache with the same maxsize.
+        """
+        return type(self)(self.maxsize)
+
+    def __enter__(self) -> Self:
+        """Activate the cache for the current context.
+
+        Returns:
+            The cache.
+        """
+        self._tokens.append(_active_caches.set((*_active_caches.get(), self)))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Deactivate the cache."""
+        _active_caches.reset(self._tokens.pop())
+
+    def __len__(self) -> int:
+        """Get the number of lookups in the cache.
+
+        Returns:
+            The number of lookups in the cache.
+        """
+        return len(self._entries)
+
+    def get(
+        self,
+        model: type[models.Model],
+        using: str,
+        key: _LookupKey,
+    ) -> models.Model | None:
+        """Get the cached object for a lookup.
+
+        Args:
+            model: The model of the lookup.
+            using: The database alias of the lookup.
+            key: The normalized lookup values.
+
+        Returns:
+            The cached object, or None if the lookup is not cached.
+        """
+        cache_key = (model._meta.concrete_model, using, key)  # noqa: SLF001 - _meta is public Django API
+        instance = self._entries.get(cache_key)
+        if instance is not None:
+            self._entries.move_to_end(cache_key)
+        return instance
+
+    def set(
+        self,
+        model: type[models.Model],
+        using: str,
+        key: _LookupKey,
+        instance: models.Model,
+    ) -> None:
+        """Add the object for a lookup to the cache.
+
+        Args:
+            model: The model of the lookup.
+            using: The database alias of the lookup.
+            key: The normalized lookup values.
+            instance: The object the lookup resolved to.
+        """
+        concrete_model = model._meta.concrete_model  # noqa: SLF001 - _meta is public Django API
+        cache_key = (concrete_model, using, key)
+        self._entries[cache_key] = instance
+        self._entries.move_to_end(cache_key)
+        self._keys_by_pk.setdefault((concrete_model, using, instance.pk), set()).add(
+            cache_key,
+        )
+
+        while len(self._entries) > self.maxsize:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            pk_key = (evicted_key[0], evicted_key[1], evicted.pk)
+            self._keys_by_pk[pk_key].discard(evicted_key)
+            if not self._keys_by_pk[pk_key]:
+                del self._keys_by_pk[pk_key]
+
+    def set_missing(
+        self,
+        model: type[models.Model],
+        using: str,
+        key: _LookupKey,
+    ) -> None:
+        """Record that a lookup does not match any object.
+
+        Args:
+            model: The model of the lookup.
+            using: The database alias of the lookup.
+            key: The normalized lookup values.
+        """
+        concrete_model = model._meta.concrete_model  # noqa: SLF001 - _meta is public Django API
+        self._missing.setdefault((concrete_model, using), set()).add(key)
+
+    def is_missing(
+        self,
+        model: type[models.Model],
+        using: str,
+        key: _LookupKey,
+    ) -> bool:
+        """Check if a lookup is known to not match any object.
+
+        Args:
+            model: The model of the lookup.
+            using: The database alias of the lookup.
+            key: The normalized lookup values.
+
+        Returns:
+            True if the lookup was recorded with set_missing.
+        """
+        concrete_model = model._meta.concrete_model  # noqa: SLF001 - _meta is public Django API
+        return key in self._missing.get((concrete_model, using), ())
+
+    def invalidate(self, instance: models.Model, using: str) -> None:
+        """Remove every lookup that resolved to an object from the cache.
+
+        Every missing lookup of the object's model is also removed because the object
+        may now match one of them.
+
+        Args:
+            instance: The object to remove.
+            using: The database alias the object was saved to or deleted from.
+        """
+        concrete_model = instance._meta.concrete_model  # noqa: SLF001 - _meta is public Django API
+        for cache_key in self._keys_by_pk.pop((concrete_model, using, instance.pk), ()):
+            self._entries.pop(cache_key, None)
+        self._missing.pop((concrete_model, using), None)
+
+    def clear(self) -> None:
+        """Remove every lookup from the cache."""
+        self._entries.clear()
+        self._keys_by_pk.clear()
+        self._missing.clear()
+
+
+class SharedGetOrNewCache:
+    """Natural key to primary key cache for get_or_new shared between processes.
+
+    The cache stores the primary key each get_or_new lookup resolved to in a Django
+    cache backend, so every process using the same backend can skip the lookup query.
+    Lookups that did not match anything are also cached for a shorter time. The cache
+    is enabled for a model by setting the shared_cache attribute of the model:
+
+        class Artist(ModelWithGetOrNew):
+            shared_cache = SharedGetOrNewCache(timeout=300, miss_timeout=5)
+
+    The attribute has to be set in the class body, the receivers that keep the cache
+    up to date are connected when the model class is prepared.
+
+    Every key includes a version number for the model, saving or deleting an object
+    of the model increments the version which makes every cached lookup for the model
+    stale. The version is incremented immediately and again when the transaction
+    commits, so other processes can't cache data from before the commit under the new
+    version. bulk_save, add_timestamps_and_save_many and update_or_new_many also
+    increment the version, other changes that do not send post_save or post_delete,
+    such as QuerySet.update, do not.
+    """
+
+    def __init__(
+        self,
+        alias: str = "default",
+        timeout: float = 300,
+        miss_timeout: float = 5,
+        key_prefix: str = "great_django_family",
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            alias: The alias of the Django cache to use.
+            timeout: The number of seconds to cache the primary key of a lookup.
+            miss_timeout: The number of seconds to cache a lookup that did not match
+                anything.
+            key_prefix: The prefix of every key stored in the Django cache.
+        """
+        self.alias = alias
+        self.timeout = timeout
+        self.miss_timeout = miss_timeout
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self) -> BaseCache:
+        """The Django cache the lookups are stored in."""
+        return caches[self.alias]
+
+    def _version_key(self, model: type[models.Model], using: str) -> str:
+        """Get the key of the version number of a model.
+
+        Args:
+            model: The model.
+            using: The database alias.
+
+        Returns:
+            The key of the version number.
+        """
+        label = model._meta.concrete_model._meta.label_lower  # noqa: SLF001 - _meta is public Django API
+        return f"{self.key_prefix}:{label}:{using}:version"
+
+    def _lookup_key(
+        self,
+        model: type[models.Model],
+        using: str,
+        key: _LookupKey,
+    ) -> str:
+        """Get the key of a lookup.
+
+        Args:
+            model: The model of the lookup.
+            using: The database alias of the lookup.
+            key: The normalized lookup values.
+
+        Returns:
+            The key of the lookup, the lookup values are hashed so the key is always a
+            valid memcached key.
+        """
+        label = model._meta.concrete_model._meta.label_lower  # noqa: SLF001 - _meta is public Django API
+        digest = hashlib.md5(repr(key).encode(), usedforsecurity=False).hexdigest()
+        return f"{self.key_prefix}:{label}:{using}:{digest}"
+
+    def get(
+        self,
+        model: type[models.Model],
+        using: str,
+        key: _LookupKey,
+    ) -> tuple[bool, object]:
+        """Get the cached primary key for a lookup.
+
+        Args:
+            model: The model of the lookup.
+            using: The database alias of the lookup.
+            key: The normalized lookup values.
+
+        Returns:
+            A tuple containing True if the lookup is cached and the primary key, the
+            primary key is None if the lookup is cached as not matching anything.
+        """
+        version = self.cache.get_or_set(
+            self._version_key(model, using),
+            time.time_ns,
+            timeout=None,
+        )
+        pk = self.cache.get(
+            self._lookup_key(model, using, key),
+            _NOT_CACHED,
+            version=version,
+        )
+        if pk is _NOT_CACHED:
+            return (False, None)
+        return (True, pk)
+
+    async def aget(
+        self,
+        model: type[models.Model],
+        using: str,
+        key: _LookupKey,
+    ) -> tuple[bool, object]:
+        """Async version of get.
+
+        Args:
+            model: The model of the lookup.
+            using: The database alias of the lookup.
+            key: The normalized lookup values.
+
+        Returns:
+            A tuple containing True if the lookup is cached and the primary key.
+        """
+        version = await self.cache.aget_or_set(
+            self._version_key(model, using),
+            time.time_ns,
+            timeout=None,
+        )
+        pk = await self.cache.aget(
+            self._lookup_key(model, using, key),
+            _NOT_CACHED,
+            version=version,
+        )
+        if pk is _NOT_CACHED:
+            return (False, None)
+        return (True, pk)
+
+    def set(
+        self,
+        model: type[models.Model],
+        using: str,
+        key: _LookupKey,
+        pk: object,
+    ) -> None:
+        """Cache the primary key a lookup resolved to.
+
+        Args:
+            model: The model of the lookup.
+            using: The database alias of the lookup.
+            key: The normalized lookup values.
+            pk: The primary key, or None if the lookup did not match anything.
+        """
+        version = self.cache.get_or_set(
+            self._version_key(model, using),
+            time.time_ns,
+            timeout=None,
+        )
+        self.cache.set(
+            self._lookup_key(model, using, key),
+            pk,
+            self.miss_timeout if pk is None else self.timeout,
+            version=version,
+        )
+
+    async def aset(
+        self,
+        model: type[models.Model],
+        using: str,
+        key: _LookupKey,
+        pk: object,
+    ) -> None:
+        """Async version of set.
+
+        Args:
+            model: The model of the lookup.
+            using: The database alias of the lookup.
+            key: The normalized lookup values.
+            pk: The primary key, or None if the lookup did not match anything.
+        """
+        version = await self.cache.aget_or_set(
+            self._version_key(model, using),
+            time.time_ns,
+            timeout=None,
+        )
+        await self.cache.aset(
+            self._lookup_key(model, using, key),
+            pk,
+            self.miss_timeout if pk is None else self.timeout,
+            version=version,
+        )
+
+    def invalidate(self, model: type[models.Model], using: str) -> None:
+        """Make every cached lookup for a model stale.
+
+        Args:
+            model: The model.
+            using: The database alias.
+        """
+        self._increment_version(model, using)
+        transaction.on_commit(
+            partial(self._increment_version, model, using),
+            using=using,
+        )
+
+    def _increment_version(self, model: type[models.Model], using: str) -> None:
+        """Increment the version number of a model.
+
+        Args:
+            model: The model.
+            using: The database alias.
+        """
+        version_key = self._version_key(model, using)
+        try:
+            self.cache.incr(version_key)
+        except ValueError:
+            # The version was evicted, a new version based on the time can't match
+            # any version that was used before.
+            self.cache.add(version_key, time.time_ns(), timeout=None)
+
+
+def get_active_cache() -> GetOrNewCache | None:
+    """Get the innermost active GetOrNewCache.
+
+    Returns:
+        The active cache, or None if no cache is active.
+    """
+    caches = _active_caches.get()
+    return caches[-1] if caches else None
+
+
+def invalidate_bulk_saved(
+    model: type[models.Model],
+    instances: Iterable[models.Model],
+    using: str,
+) -> None:
+    """Remove objects saved without sending post_save from the caches.
+
+    The objects are removed from every active cache together with the missing lookups
+    of the model, and the shared cache of the model is made stale.
+
+    Args:
+        model: The model of the objects.
+        instances: The objects that were saved with bulk_create or bulk_update.
+        using: The database alias the objects were saved to.
+    """
+    instances = list(instances)
+    if not instances:
+        return
+    for cache in _active_caches.get():
+        for instance in instances:
+            cache.invalidate(instance, using)
+    shared_cache = getattr(model, "shared_cache", None)
+    if isinstance(shared_cache, SharedGetOrNewCache):
+        shared_cache.invalidate(model, using)
+
+
+def _invalidate_active_caches(
+    sender: type[models.Model],  # noqa: ARG001 - Required by the signal
+    instance: models.Model,
+    using: str,
+    **kwargs: object,  # noqa: ARG001 - Required by the signal
+) -> None:
+    """Remove a saved or deleted object from every active cache."""
+    for cache in _active_caches.get():
+        cache.invalidate(instance, using)
+
+
+def _invalidate_shared_cache(
+    sender: type[models.Model],
+    using: str,
+    **kwargs: object,  # noqa: ARG001 - Required by the signal
+) -> None:
+    """Make the shared cache of a saved or deleted object's model stale."""
+    shared_cache = getattr(sender, "shared_cache", None)
+    if isinstance(shared_cache, SharedGetOrNewCache):
+        shared_cache.invalidate(sender, using)
+
+
+def connect_invalidation(model: type[models.Model]) -> None:
+    """Keep the caches of a model up to date when its objects are saved or deleted.
+
+    The receivers are connected for the model instead of for every sender, a
+    post_delete receiver disables the fast delete of QuerySet.delete for its senders.
+    The shared cache is only kept up to date if the shared_cache attribute is set when
+    the model is defined.
+
+    Args:
+        model: The model whose saved and deleted objects are removed from the caches.
+    """
+    post_save.connect(
+        _invalidate_active_caches,
+        sender=model,
+        dispatch_uid="great_django_family.cache",
+    )
+    post_delete.connect(
+        _invalidate_active_caches,
+        sender=model,
+        dispatch_uid="great_django_family.cache",
+    )
+    if isinstance(getattr(model, "shared_cache", None), SharedGetOrNewCache):
+        post_save.connect(
+            _invalidate_shared_cache,
+            sender=model,
+            dispatch_uid="great_django_family.shared_cache",
+        )
+        post_delete.connect(
+            _invalidate_shared_cache,
+            sender=model,
+            dispatch_uid="great_django_family.shared_cache",
+        )
@@ -0,0 +1,202 @@
+"""Registry of the unique constraints created with auto_unique.
+
+The constraints of every model are recorded when the model class is prepared, so the
+fields of the constraints can be used as natural keys by get_or_new_many, warm and
+update_or_new_many without searching the constraints of the model on every call.
+
+The module also registers a system check that warns about unique constraints that
+are duplicates of another unique constraint of the same model, or that are implied by
+a constraint on a subset of their fields, for example a constraint on (artist, name)
+when artist is already unique. Every redundant constraint adds an index that has to
+be updated on every write.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+from django.apps import apps
+from django.core import checks
+from django.db import models
+from django.db.models.signals import class_prepared
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.apps import AppConfig
+
+# Weak so the historical models created by migrations do not stay alive
+_natural_keys: WeakKeyDictionary[type[models.Model], tuple[tuple[str, ...], ...]] = (
+    WeakKeyDictionary()
+)
+
+
+def is_auto_unique(constraint: models.BaseConstraint) -> bool:
+    """Check if a constraint was created with auto_unique.
+
+    Constraints are recognized by the name auto_unique generates, so constraints
+    loaded from migrations are recognized as well.
+
+    Args:
+        constraint: The constraint.
+
+    Returns:
+        True if the constraint was created with auto_unique.
+    """
+    return (
+        isinstance(constraint, models.UniqueConstraint)
+        and bool(constraint.fields)
+        and constraint.condition is None
+        and constraint.name.startswith("UQ_")
+        and constraint.name.endswith(f"_{'-'.join(constraint.fields)}")
+    )
+
+
+def _register_natural_keys(
+    sender: type[models.Model],
+    **kwargs: object,  # noqa: ARG001 - Required by the signal
+) -> None:
+    """Record the auto_unique constraints of a prepared model."""
+    _natural_keys[sender] = tuple(
+        tuple(constraint.fields)  # type: ignore[reportAttributeAccessIssue]
+        for constraint in sender._meta.constraints  # noqa: SLF001 - _meta is public Django API
+        if is_auto_unique(constraint)
+    )
+
+
+class_prepared.connect(
+    _register_natural_keys,
+    dispatch_uid="great_django_family.constraints",
+)
+
+
+def natural_keys(model: type[models.Model]) -> tuple[tuple[str, ...], ...]:
+    """Get the fields of the auto_unique constraints of a model.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The field names of every auto_unique constraint in the order they were
+        defined, empty if the model does not have any.
+    """
+    return _natural_keys.get(model, ())
+
+
+def unique_field_sets(model: type[models.Model]) -> list[tuple[str, ...]]:
+    """Get every set of fields that uniquely identifies an object of a model.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The field names of the auto_unique constraints, followed by the other unique
+        constraints, unique_together and then fields with unique=True. Duplicates and
+        the primary key are not included.
+    """
+    field_sets = dict.fromkeys(natural_keys(model))
+    for fields, _description in _unique_sources(model):
+        field_sets.setdefault(fields)
+    return list(field_sets)
+
+
+def _unique_sources(model: type[models.Model]) -> list[tuple[tuple[str, ...], str]]:
+    """Get every set of unique fields of a model with a description of its source.
+
+    Args:
+        model: The model.
+
+    Returns:
+        Tuples of the field names and a description used in check messages, the
+        primary key is not included.
+    """
+    opts = model._meta  # noqa: SLF001 - _meta is public Django API
+    sources = [
+        (tuple(constraint.fields), f"constraint {constraint.name}")
+        for constraint in opts.total_unique_constraints
+    ]
+    sources += [
+        (tuple(fields), f"unique_together {tuple(fields)}")
+        for fields in opts.unique_together
+    ]
+    sources += [
+        ((field.name,), f"field {field.name} with unique=True")
+        for field in opts.concrete_fields
+        if field.unique and not field.primary_key
+    ]
+    return sources
+
+
+@checks.register(checks.Tags.models)
+def check_unique_constraints(
+    app_configs: Iterable[AppConfig] | None = None,
+    **kwargs: object,  # noqa: ARG001 - Required by the check framework
+) -> list[checks.CheckMessage]:
+    """Warn about unique constraints that are duplicates of or implied by others.
+
+    Args:
+        app_configs: The apps to check, defaults to every installed app.
+        kwargs: Other arguments of the check framework.
+
+    Returns:
+        A great_django_family.W001 warning for every duplicate and a
+        great_django_family.W002 warning for every implied constraint.
+    """
+    if app_configs is None:
+        model_lists: Iterable[Iterable[type[models.Model]]] = [apps.get_models()]
+    else:
+        model_lists = [app_config.get_models() for app_config in app_configs]
+
+    messages: list[checks.CheckMessage] = []
+    for model_list in model_lists:
+        for model in model_list:
+            if not model._meta.proxy:  # noqa: SLF001 - _meta is public Django API
+                messages += _check_model(model)
+    return messages
+
+
+def _check_model(model: type[models.Model]) -> list[checks.CheckMessage]:
+    """Check the unique constraints of a model.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The warnings for the model.
+    """
+    pk_name = model._meta.pk.name  # type: ignore[reportOptionalMemberAccess]  # noqa: SLF001 - _meta is public Django API
+    sources = [((pk_name,), "primary key"), *_unique_sources(model)]
+    messages: list[checks.CheckMessage] = []
+    for index, (fields, description) in enumerate(sources):
+        # A duplicate is only reported as a duplicate, the first source of the fields
+        # is checked for being implied by another source
+        for other_fields, other_description in sources[:index]:
+            if set(other_fields) == set(fields):
+                messages.append(
+                    checks.Warning(
+                        f"The {description} is a duplicate of the {other_description}.",
+                        hint="Remove one of them, each one adds an index that is "
+                        "updated on every write.",
+                        obj=model,
+                        id="great_django_family.W001",
+                    ),
+                )
+                break
+        else:
+            implied_by = [
+                other_description
+                for other_fields, other_description in sources
+                if set(other_fields) < set(fields)
+            ]
+            if implied_by:
+                messages.append(
+                    checks.Warning(
+                        f"The {description} is implied by the {implied_by[0]}.",
+                        hint="Remove it unless its index is needed for queries, it "
+                        "adds an index that is updated on every write.",
+                        obj=model,
+                        id="great_django_family.W002",
+                    ),
+                )
+    return messages
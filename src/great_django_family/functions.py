@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-import inspect
+import hashlib
+import sys
 
 from django.db import models
 
+# Imported so the auto_unique constraints are recorded when their models are prepared
+from . import constraints  # noqa: F401
+
 
 class StackInspectionError(Exception):
     """Error raised when the stack is invalid."""
@@ -19,6 +23,9 @@ def auto_unique(*fields: str) -> models.UniqueConstraint:
     generated to decrease the possibility of accidently making two constraints
     with the same name.
 
+    The fields of the constraint are recorded as a natural key of the model when the
+    model is prepared, see great_django_family.constraints.
+
     Args:
         *fields: The fields to create a unique constraint for.
 
@@ -29,21 +36,105 @@ def auto_unique(*fields: str) -> models.UniqueConstraint:
         `StackInspectionError`: If the function is not called from within the
         `Meta` class of a model.
     """
-    # This function may not be reliable because it relies on undocumented
-    # behavior of the inspect module
-    # https://stackoverflow.com/questions/900392/getting-the-caller-function-name-inside-another-function-in-python
-    # The first frame will be the Meta class, the second one will be the actual
-    # class.
-    for i, frame_info in enumerate(inspect.stack()):
-        if frame_info.function == "Meta":
-            model_name = inspect.stack()[i + 1].function
-            return models.UniqueConstraint(
-                fields=fields,
-                name=f"UQ_{model_name}_{'-'.join(fields)}",
-            )
+    return models.UniqueConstraint(
+        fields=fields,
+        name=f"UQ_{_get_model_name('auto_unique')}_{'-'.join(fields)}",
+    )
+
+
+def auto_index(*fields: str, condition: models.Q | None = None) -> models.Index:
+    """Automatically generate an index for the given fields.
+
+    This is the index equivalent of auto_unique. Django limits index names to 30
+    characters so names that would be longer are shortened and given a hash of the
+    full name, the same fields always generate the same name so migrations are not
+    recreated.
+
+    Args:
+        *fields: The fields to create an index for.
+        condition: A condition to make the index a partial index, this is ignored on
+            databases that do not support partial indexes.
+
+    Returns:
+        The generated index.
+
+    Raises:
+        `StackInspectionError`: If the function is not called from within the
+        `Meta` class of a model.
+    """
+    name = f"IX_{_get_model_name('auto_index')}_{'-'.join(fields)}"
+    if condition is not None or len(name) > models.Index.max_name_length:
+        # The condition is part of the hash so that indexes on the same fields with
+        # different conditions do not have the same name.
+        digest = hashlib.md5(
+            f"{name}{condition}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()[:8]
+        name = f"{name[: models.Index.max_name_length - len(digest) - 1]}_{digest}"
+    return models.Index(fields=fields, name=name, condition=condition)
+
+
+def auto_timestamp_indexes(
+    *,
+    updated_at: bool = False,
+    condition: models.Q | None = None,
+) -> list[models.Index]:
+    """Automatically generate the indexes used to find outdated rows.
+
+    The indexes are for the up_to_date and outdated querysets of
+    ModelWithTimestampsAndFunctions. A composite index on info_timestamp and
+    info_modified_timestamp covers filters on both timestamps or only info_timestamp
+    and a second index covers filters on only info_modified_timestamp.
+
+    Args:
+        updated_at: Also generate an index on updated_at for models that use
+            ModelWithTimestampsAndUpdateAt.
+        condition: A condition to make every index a partial index, this is ignored
+            on databases that do not support partial indexes.
+
+    Returns:
+        The generated indexes.
+
+    Raises:
+        `StackInspectionError`: If the function is not called from within the
+        `Meta` class of a model.
+    """
+    indexes = [
+        auto_index("info_timestamp", "info_modified_timestamp", condition=condition),
+        auto_index("info_modified_timestamp", condition=condition),
+    ]
+    if updated_at:
+        indexes.append(auto_index("updated_at", condition=condition))
+    return indexes
+
+
+def _get_model_name(function_name: str) -> str:
+    """Get the name of the model whose Meta class is currently being defined.
+
+    Args:
+        function_name: The name of the function that needs the model name, this is
+            used in the error message.
+
+    Returns:
+        The name of the model.
+
+    Raises:
+        `StackInspectionError`: If the function is not called from within the
+        `Meta` class of a model.
+    """
+    # This function may not be reliable because it relies on sys._getframe which is
+    # CPython specific, it is used instead of inspect.stack because inspect.stack
+    # loads the source code for every frame which is very slow.
+    # The first frame named Meta will be the Meta class, the frame before it will be
+    # the actual class.
+    frame = sys._getframe(1)  # noqa: SLF001 - There is no public equivalent
+    while frame is not None:
+        if frame.f_code.co_name == "Meta" and frame.f_back is not None:
+            return frame.f_back.f_code.co_name
+        frame = frame.f_back
 
     msg = (
-        "auto_unique failed because the Meta class was not found, "
-        "auto_unique may have been called incorrectly."
+        f"{function_name} failed because the Meta class was not found, "
+        f"{function_name} may have been called incorrectly."
     )
     raise StackInspectionError(msg)
@@ -0,0 +1,298 @@
+"""Instrumentation for the managers and models of great-django-family."""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+import time
+from contextlib import ContextDecorator, ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Self, TypeVar, cast
+
+from django.db import connections, models
+from django.dispatch import Signal
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+_F = TypeVar("_F", bound="Callable[..., Any]")
+
+operation_finished = Signal()
+"""Signal sent after an instrumented operation finishes.
+
+The sender is the model and the signal is sent with the keyword arguments operation,
+hits, misses, queries and seconds. The signal is only sent when it has receivers or
+an Instrumentation is active, otherwise instrumented operations have no overhead
+besides checking if instrumentation is enabled.
+"""
+
+_active_instrumentations: ContextVar[tuple[Instrumentation, ...]] = ContextVar(
+    "_active_instrumentations",
+    default=(),
+)
+
+
+@dataclass
+class OperationStats:
+    """Statistics for one operation of one model."""
+
+    calls: int = 0
+    """The number of times the operation was called."""
+    hits: int = 0
+    """The number of objects that were found in the database or a cache."""
+    misses: int = 0
+    """The number of objects that did not exist and were created."""
+    queries: int = 0
+    """The number of queries made by the operation."""
+    seconds: float = 0.0
+    """The total wall time spent in the operation."""
+
+
+class Instrumentation(ContextDecorator):
+    """Collect statistics for instrumented operations.
+
+    The instrumentation can be used as a context manager or as a decorator:
+
+        with Instrumentation() as instrumentation:
+            Artist.objects.get_or_new(name="name")
+        instrumentation.stats["app.Artist"]["get_or_new"].queries
+
+    Query counts are only collected for synchronous operations, async operations run
+    their queries on a different thread.
+
+    When used as a decorator the statistics of every call are collected in the same
+    instrumentation, including calls made at the same time from different threads.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the instrumentation."""
+        self.stats: dict[str, dict[str, OperationStats]] = {}
+        """Statistics for every operation, keyed by the model label and operation."""
+        # Guards stats, a decorating instrumentation is shared by every thread
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        """Start collecting statistics in the current context.
+
+        Returns:
+            The instrumentation.
+        """
+        _active_instrumentations.set((*_active_instrumentations.get(), self))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop collecting statistics in the current context."""
+        # The instrumentation is removed from the stack of the current context instead
+        # of resetting a token, a token stored on the instrumentation would be shared
+        # by every thread that uses the same instrumentation as a decorator.
+        active = list(_active_instrumentations.get())
+        del active[len(active) - 1 - active[::-1].index(self)]
+        _active_instrumentations.set(tuple(active))
+
+    def record(  # noqa: PLR0913 - Every statistic is a separate argument
+        self,
+        model: type[models.Model],
+        operation: str,
+        *,
+        hits: int,
+        misses: int,
+        queries: int,
+        seconds: float,
+    ) -> None:
+        """Add the statistics of a finished operation.
+
+        The statistics are updated while holding a lock, so operations that finish at
+        the same time in different threads are all counted.
+
+        Args:
+            model: The model the operation was for.
+            operation: The name of the operation.
+            hits: The number of objects that were found.
+            misses: The number of objects that were created.
+            queries: The number of queries made.
+            seconds: The wall time of the operation.
+        """
+        with self._lock:
+            model_stats = self.stats.setdefault(model._meta.label, {})  # noqa: SLF001 - _meta is public Django API
+            stats = model_stats.setdefault(operation, OperationStats())
+            stats.calls += 1
+            stats.hits += hits
+            stats.misses += misses
+            stats.queries += queries
+            stats.seconds += seconds
+
+
+def count_get_or_new(result: tuple[models.Model, bool]) -> tuple[int, int]:
+    """Count the hits and misses of a get_or_new result.
+
+    Args:
+        result: The result of get_or_new.
+
+    Returns:
+        A tuple containing the number of hits and misses.
+    """
+    _instance, created = result
+    return (0, 1) if created else (1, 0)
+
+
+def count_get_or_new_many(
+    result: list[tuple[models.Model, bool]],
+) -> tuple[int, int]:
+    """Count the hits and misses of a get_or_new_many result.
+
+    Args:
+        result: The result of get_or_new_many.
+
+    Returns:
+        A tuple containing the number of hits and misses.
+    """
+    misses = sum(created for _instance, created in result)
+    return (len(result) - misses, misses)
+
+
+def _is_enabled() -> bool:
+    """Check if instrumented operations need to collect statistics.
+
+    Returns:
+        True if an Instrumentation is active or operation_finished has receivers.
+    """
+    return bool(_active_instrumentations.get() or operation_finished.receivers)
+
+
+def _get_model(owner: object) -> type[models.Model]:
+    """Get the model of the object an operation was called on.
+
+    Args:
+        owner: The manager, queryset, model class or model instance.
+
+    Returns:
+        The model.
+    """
+    if isinstance(owner, models.Manager | models.QuerySet):
+        return owner.model
+    if isinstance(owner, type):
+        return owner
+    return type(owner)  # type: ignore[reportReturnType]
+
+
+def _finish(  # noqa: PLR0913 - Every statistic is a separate argument
+    owner: object,
+    operation: str,
+    count: Callable[[Any], tuple[int, int]] | None,
+    result: object,
+    *,
+    queries: int,
+    seconds: float,
+) -> None:
+    """Record a finished operation and send operation_finished.
+
+    Args:
+        owner: The manager, queryset, model class or model instance the operation was
+            called on.
+        operation: The name of the operation.
+        count: The function that counts the hits and misses of the result.
+        result: The result of the operation.
+        queries: The number of queries made.
+        seconds: The wall time of the operation.
+    """
+    model = _get_model(owner)
+    hits, misses = count(result) if count is not None else (0, 0)
+    for instrumentation in _active_instrumentations.get():
+        instrumentation.record(
+            model,
+            operation,
+            hits=hits,
+            misses=misses,
+            queries=queries,
+            seconds=seconds,
+        )
+    operation_finished.send(
+        sender=model,
+        operation=operation,
+        hits=hits,
+        misses=misses,
+        queries=queries,
+        seconds=seconds,
+    )
+
+
+def instrumented(
+    operation: str,
+    count: Callable[[Any], tuple[int, int]] | None = None,
+) -> Callable[[_F], _F]:
+    """Instrument a manager or model method.
+
+    When instrumentation is disabled the method is called directly so the only
+    overhead is checking if instrumentation is enabled.
+
+    Args:
+        operation: The name of the operation.
+        count: A function that counts the hits and misses from the result of the
+            method, if not given the operation has no hits or misses.
+
+    Returns:
+        The decorator.
+    """
+
+    def decorator(method: _F) -> _F:
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(
+                owner: object,
+                *args: object,
+                **kwargs: object,
+            ) -> object:
+                if not _is_enabled():
+                    return await method(owner, *args, **kwargs)
+
+                start = time.perf_counter()
+                result = await method(owner, *args, **kwargs)
+                seconds = time.perf_counter() - start
+                _finish(owner, operation, count, result, queries=0, seconds=seconds)
+                return result
+
+            return cast("_F", async_wrapper)
+
+        @functools.wraps(method)
+        def wrapper(owner: object, *args: object, **kwargs: object) -> object:
+            if not _is_enabled():
+                return method(owner, *args, **kwargs)
+
+            queries = 0
+
+            def count_queries(
+                execute: Callable[..., object],
+                *execute_args: object,
+            ) -> object:
+                nonlocal queries
+                queries += 1
+                return execute(*execute_args)
+
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(count_queries))
+                start = time.perf_counter()
+                result = method(owner, *args, **kwargs)
+                seconds = time.perf_counter() - start
+            _finish(
+                owner,
+                operation,
+                count,
+                result,
+                queries=queries,
+                seconds=seconds,
+            )
+            return result
+
+        return cast("_F", wrapper)
+
+    return decorator
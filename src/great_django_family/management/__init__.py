@@ -0,0 +1,12 @@
+"""Management commands for great-django-family.
+
+Django only finds the commands of installed apps, so the commands are only available
+after great_django_family is added to INSTALLED_APPS:
+
+    INSTALLED_APPS = [
+        ...
+        "great_django_family",
+    ]
+
+The models, querysets and functions of the package work without installing it.
+"""
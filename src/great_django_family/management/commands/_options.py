@@ -0,0 +1,102 @@
+"""Options shared by the commands for models with timestamps.
+
+Django does not load modules that start with an underscore as commands.
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentTypeError
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+# The package is not always installed under the same name so it is imported relatively
+from ...models import ModelWithTimestampsAndFunctions  # noqa: TID252
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, naive timestamps use the current time zone.
+
+    Args:
+        value: The timestamp.
+
+    Returns:
+        The aware timestamp.
+
+    Raises:
+        `ArgumentTypeError`: If the value is not an ISO 8601 timestamp.
+    """
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except ValueError as error:
+        msg = f"{value!r} is not an ISO 8601 timestamp."
+        raise ArgumentTypeError(msg) from error
+    if timezone.is_naive(timestamp):
+        return timezone.make_aware(timestamp)
+    return timestamp
+
+
+def add_timestamp_arguments(parser: ArgumentParser) -> None:
+    """Add the arguments that select the models and the outdated rows.
+
+    Args:
+        parser: The argument parser.
+    """
+    parser.add_argument(
+        "models",
+        nargs="*",
+        help="Labels of the models, e.g. app.Model, defaults to every model that "
+        "subclasses ModelWithTimestampsAndFunctions.",
+    )
+    parser.add_argument(
+        "--minimum-info-timestamp",
+        type=parse_timestamp,
+        help="Rows with an older info_timestamp are outdated.",
+    )
+    parser.add_argument(
+        "--minimum-modified-timestamp",
+        type=parse_timestamp,
+        help="Rows with an older info_modified_timestamp are outdated.",
+    )
+
+
+def get_timestamp_models(
+    labels: list[str],
+) -> list[type[ModelWithTimestampsAndFunctions]]:
+    """Get the models selected by the models argument.
+
+    Args:
+        labels: The labels of the requested models.
+
+    Returns:
+        The requested models, or every model that subclasses
+        ModelWithTimestampsAndFunctions.
+
+    Raises:
+        `CommandError`: If a model does not exist or does not have the timestamp
+            functions.
+    """
+    if not labels:
+        return [
+            model
+            for model in apps.get_models()
+            if issubclass(model, ModelWithTimestampsAndFunctions)
+        ]
+
+    selected: list[type[ModelWithTimestampsAndFunctions]] = []
+    for label in labels:
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError) as error:
+            raise CommandError(str(error)) from error
+        if not issubclass(model, ModelWithTimestampsAndFunctions):
+            msg = f"{label} is not a subclass of ModelWithTimestampsAndFunctions."
+            raise CommandError(msg)
+        selected.append(model)
+    return selected
@@ -0,0 +1,84 @@
+"""Create upcoming partitions and detach or archive old data."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+# The package is not always installed under the same name so it is imported relatively
+from ...partitions import get_partitioning, maintain_partitions  # noqa: TID252
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+    from django.db import models
+
+
+class Command(BaseCommand):
+    """Run maintain_partitions for every model with partitioning enabled."""
+
+    help = __doc__
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the arguments of the command.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help="Labels of the models to maintain, e.g. app.Model, defaults to every "
+            "model with partitioning enabled.",
+        )
+        parser.add_argument(
+            "--database",
+            help="The database to use, defaults to the database each model is "
+            "written to.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:  # noqa: ARG002 - Required by BaseCommand
+        """Maintain the partitions of the models.
+
+        Args:
+            args: The positional arguments.
+            options: The parsed options.
+        """
+        for model in self._get_models(options["models"]):  # type: ignore[reportArgumentType]
+            report = maintain_partitions(model, using=options["database"])  # type: ignore[reportArgumentType]
+            label = model._meta.label  # noqa: SLF001 - _meta is public Django API
+            for name in report.created:
+                self.stdout.write(f"{label}: created partition {name}")
+            for name in report.detached:
+                self.stdout.write(f"{label}: detached partition {name}")
+            if report.archived_rows:
+                self.stdout.write(f"{label}: archived {report.archived_rows} rows")
+
+    def _get_models(self, labels: list[str]) -> list[type[models.Model]]:
+        """Get the models to maintain.
+
+        Args:
+            labels: The labels of the requested models.
+
+        Returns:
+            The requested models, or every model with partitioning enabled.
+
+        Raises:
+            `CommandError`: If a model does not exist or does not have partitioning.
+        """
+        if not labels:
+            return [model for model in apps.get_models() if get_partitioning(model)]
+
+        selected: list[type[models.Model]] = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as error:
+                raise CommandError(str(error)) from error
+            if get_partitioning(model) is None:
+                msg = f"Partitioning is not enabled for {label}."
+                raise CommandError(msg)
+            selected.append(model)
+        return selected
@@ -0,0 +1,100 @@
+"""Refresh the outdated rows of models with timestamps on worker processes."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+# The package is not always installed under the same name so it is imported relatively
+from ...refresh import refresh_outdated_in_processes  # noqa: TID252
+from ._options import add_timestamp_arguments, get_timestamp_models
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+    from collections.abc import Callable
+    from datetime import datetime
+
+_MILLISECONDS = 1000
+
+
+class Command(BaseCommand):
+    """Run refresh_outdated_in_processes for every model and print statistics."""
+
+    help = __doc__
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the arguments of the command.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument(
+            "fetch",
+            help="Dotted path of the function that refreshes a single row and returns "
+            "its info_timestamp, e.g. app.refresh.fetch_artist.",
+        )
+        add_timestamp_arguments(parser)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=4,
+            help="The number of worker processes, 0 runs the batches in this process.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of rows in each batch.",
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            type=int,
+            help="The maximum number of batches that are queued at a time, defaults "
+            "to twice the number of processes.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:  # noqa: ARG002 - Required by BaseCommand
+        """Refresh the outdated rows of the models.
+
+        Args:
+            args: The positional arguments.
+            options: The parsed options.
+        """
+        fetch = self._get_fetch(options["fetch"])  # type: ignore[reportArgumentType]
+        for model in get_timestamp_models(options["models"]):  # type: ignore[reportArgumentType]
+            stats = refresh_outdated_in_processes(
+                model,
+                fetch,
+                options["minimum_info_timestamp"],  # type: ignore[reportArgumentType]
+                options["minimum_modified_timestamp"],  # type: ignore[reportArgumentType]
+                processes=options["processes"],  # type: ignore[reportArgumentType]
+                batch_size=options["batch_size"],  # type: ignore[reportArgumentType]
+                max_in_flight=options["max_in_flight"],  # type: ignore[reportArgumentType]
+            )
+            label = model._meta.label  # noqa: SLF001 - _meta is public Django API
+            self.stdout.write(
+                f"{label}: refreshed {stats.rows} rows in {stats.seconds:.2f}s "
+                f"({stats.rows_per_second:.1f} rows/s) in {stats.batches} batches, "
+                f"batch latency p50 {stats.batch_percentile(50) * _MILLISECONDS:.0f}ms "
+                f"p95 {stats.batch_percentile(95) * _MILLISECONDS:.0f}ms "
+                f"max {stats.batch_percentile(100) * _MILLISECONDS:.0f}ms",
+            )
+
+    def _get_fetch(self, path: str) -> Callable[..., datetime]:
+        """Import the fetch function.
+
+        Args:
+            path: The dotted path of the function.
+
+        Returns:
+            The function.
+
+        Raises:
+            `CommandError`: If the function can not be imported.
+        """
+        try:
+            return import_string(path)
+        except ImportError as error:
+            raise CommandError(str(error)) from error
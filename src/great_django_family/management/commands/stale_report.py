@@ -0,0 +1,50 @@
+"""Report the number of outdated rows of models with timestamps."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+
+from ._options import add_timestamp_arguments, get_timestamp_models
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+class Command(BaseCommand):
+    """Count the outdated rows of every model in the database."""
+
+    help = __doc__
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the arguments of the command.
+
+        Args:
+            parser: The argument parser.
+        """
+        add_timestamp_arguments(parser)
+        parser.add_argument(
+            "--database",
+            help="The database to use, defaults to the database each model is read "
+            "from.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:  # noqa: ARG002 - Required by BaseCommand
+        """Print the number of rows and outdated rows of the models.
+
+        Args:
+            args: The positional arguments.
+            options: The parsed options.
+        """
+        for model in get_timestamp_models(options["models"]):  # type: ignore[reportArgumentType]
+            queryset = model.timestamps_queryset(options["database"])  # type: ignore[reportArgumentType]
+            total, outdated = queryset.outdated_counts(
+                options["minimum_info_timestamp"],  # type: ignore[reportArgumentType]
+                options["minimum_modified_timestamp"],  # type: ignore[reportArgumentType]
+            )
+            percentage = outdated / total * 100 if total else 0.0
+            label = model._meta.label  # noqa: SLF001 - _meta is public Django API
+            self.stdout.write(
+                f"{label}: {outdated} of {total} rows outdated ({percentage:.1f}%)",
+            )
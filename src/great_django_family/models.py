@@ -2,10 +2,34 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import ClassVar, Self, TypeVar
+import operator
+from collections.abc import AsyncIterable, Mapping
+from datetime import datetime, timedelta
+from functools import cache, reduce
+from itertools import islice
+from typing import TYPE_CHECKING, ClassVar, Self, TypeVar
 
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Now
+from django.db.models.signals import class_prepared
+
+from .cache import (
+    GetOrNewCache,
+    SharedGetOrNewCache,
+    connect_invalidation,
+    get_active_cache,
+    invalidate_bulk_saved,
+)
+from .constraints import unique_field_sets
+from .instrumentation import count_get_or_new, count_get_or_new_many, instrumented
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+
+    from .partitions import TimestampPartitioning
 
 
 class ModelWithId(models.Model):
@@ -34,11 +58,475 @@ class ModelWithTimestamps(models.Model):
     info_modified_timestamp = models.DateTimeField()
     """Timestamp representing when the information in the database was last modified."""
 
+    partitioning: ClassVar[TimestampPartitioning | None] = None
+    """Set to partition the table by info_timestamp, see TimestampPartitioning."""
+
+    class Meta:  # type: ignore[reportIncompatibleVariableOverride]
+        """Required to make the model abstract."""
+
+        abstract = True  # Required to be able to subclass models.Model
+
+
+_T = TypeVar("_T", bound=models.Model)
+_V = TypeVar("_V")
+
+
+_MUTABLE_TYPES = (dict, list, set, bytearray)
+
+
+class ModelWithChangeTracking(models.Model):
+    """Abstract model that only saves the fields that changed since it was loaded.
+
+    The values of an object are recorded when it is loaded from the database, the
+    values are not copied so recording them is cheap. save() compares the current
+    values with the recorded values and passes the fields that changed as
+    update_fields, if no fields changed nothing is written. This also applies to
+    add_timestamps_and_save when combined with ModelWithTimestampsAndFunctions:
+
+        class Artist(ModelWithChangeTracking, ModelWithTimestampsAndFunctions): ...
+
+    Mutable values such as the dictionaries and lists of a JSONField can be changed
+    in place without the change being visible in the recorded value, so those fields
+    are always saved. If save() is called with update_fields, force_insert or a
+    different database the fields are not compared. When nothing is written the
+    pre_save and post_save signals are not sent.
+    """
+
+    _loaded_values: dict[str, object] | None = None
+
     class Meta:  # type: ignore[reportIncompatibleVariableOverride]
         """Required to make the model abstract."""
 
         abstract = True  # Required to be able to subclass models.Model
 
+    def save(
+        self,
+        *,
+        force_insert: bool | tuple[type[models.Model], ...] = False,
+        force_update: bool = False,
+        using: str | None = None,
+        update_fields: Iterable[str] | None = None,
+    ) -> None:
+        """Save the object, only writing the fields that changed.
+
+        Args:
+            force_insert: Force the save to be an INSERT.
+            force_update: Force the save to be an UPDATE.
+            using: The database alias to save to.
+            update_fields: The fields to save, if not given the fields that changed
+                are saved.
+        """
+        tracked = (
+            self._loaded_values is not None
+            and not self._state.adding
+            and not force_insert
+            and update_fields is None
+            and using in (None, self._state.db)
+        )
+        if tracked:
+            update_fields = self.get_dirty_fields()
+            if not update_fields:
+                return
+
+        super().save(
+            force_insert=force_insert,
+            force_update=force_update,
+            using=using,
+            update_fields=update_fields,
+        )
+        self.reset_changes(update_fields)
+
+    @classmethod
+    def from_db(
+        cls,
+        db: str | None,
+        field_names: Iterable[str],
+        values: Iterable[object],
+    ) -> Self:
+        """Create an object loaded from the database and record its values.
+
+        Args:
+            db: The database alias the object was loaded from.
+            field_names: The attnames of the loaded fields.
+            values: The values of the loaded fields.
+
+        Returns:
+            The object.
+        """
+        instance = super().from_db(db, field_names, values)  # type: ignore[reportArgumentType]
+        instance.reset_changes()
+        return instance
+
+    def reset_changes(self, field_names: Iterable[str] | None = None) -> None:
+        """Record the current values as the values that are in the database.
+
+        Args:
+            field_names: The fields to record, defaults to every loaded field.
+        """
+        opts = self._meta
+        if field_names is None or self._loaded_values is None:
+            attnames = [field.attname for field in opts.concrete_fields]
+            self._loaded_values = {}
+        else:
+            attnames = [opts.get_field(name).attname for name in field_names]  # type: ignore[reportAttributeAccessIssue]
+        for attname in attnames:
+            # Deferred fields are not in __dict__ until they are loaded
+            if attname in self.__dict__:
+                self._loaded_values[attname] = self.__dict__[attname]
+
+    def get_dirty_fields(self) -> list[str]:
+        """Get the fields that changed since the object was loaded or saved.
+
+        Returns:
+            The names of the changed fields, every loaded field besides the primary key
+            if the object was not loaded from the database.
+        """
+        loaded_values = self._loaded_values or {}
+        dirty: list[str] = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            if field.attname not in loaded_values:
+                dirty.append(field.name)
+                continue
+            value = self.__dict__[field.attname]
+            loaded = loaded_values[field.attname]
+            if isinstance(loaded, _MUTABLE_TYPES) or (
+                value is not loaded and value != loaded
+            ):
+                dirty.append(field.name)
+        return dirty
+
+    def refresh_from_db(
+        self,
+        using: str | None = None,
+        fields: Iterable[str] | None = None,
+        from_queryset: models.QuerySet[Self] | None = None,
+    ) -> None:
+        """Reload the object from the database and record the reloaded values.
+
+        Args:
+            using: The database alias to load from.
+            fields: The fields to reload, defaults to every loaded field.
+            from_queryset: The queryset to load the object with.
+        """
+        fields = None if fields is None else list(fields)
+        super().refresh_from_db(using, fields, from_queryset)
+        self.reset_changes(fields)
+
+
+def _up_to_date_filter(
+    minimum_info_timestamp: datetime | None = None,
+    minimum_modified_timestamp: datetime | None = None,
+) -> models.Q:
+    """Build a filter matching ModelWithTimestampsAndFunctions.is_up_to_date.
+
+    Args:
+        minimum_info_timestamp: The minimum info_timestamp required for the data to
+            be considered up to date.
+        minimum_modified_timestamp: The minimum info_modified_timestamp that is
+            required for the data to be considered up to date.
+
+    Returns:
+        The filter for rows that are up to date.
+    """
+    # If no timestamp is present the information has to be outdated
+    up_to_date = models.Q(
+        info_timestamp__isnull=False,
+        info_modified_timestamp__isnull=False,
+    )
+    if minimum_info_timestamp:
+        up_to_date &= models.Q(info_timestamp__gte=minimum_info_timestamp)
+    if minimum_modified_timestamp:
+        up_to_date &= models.Q(info_modified_timestamp__gte=minimum_modified_timestamp)
+    return up_to_date
+
+
+def _outdated_filter(
+    minimum_info_timestamp: datetime | None = None,
+    minimum_modified_timestamp: datetime | None = None,
+) -> models.Q:
+    """Build a filter matching ModelWithTimestampsAndFunctions.is_outdated.
+
+    This is the inverse of _up_to_date_filter written out explicitly so that it does
+    not depend on how the database negates comparisons with NULL.
+
+    Args:
+        minimum_info_timestamp: The minimum info_timestamp required for the data to
+            be considered up to date.
+        minimum_modified_timestamp: The minimum info_modified_timestamp that is
+            required for the data to be considered up to date.
+
+    Returns:
+        The filter for rows that are outdated.
+    """
+    outdated = models.Q(info_timestamp__isnull=True) | models.Q(
+        info_modified_timestamp__isnull=True,
+    )
+    if minimum_info_timestamp:
+        outdated |= models.Q(info_timestamp__lt=minimum_info_timestamp)
+    if minimum_modified_timestamp:
+        outdated |= models.Q(info_modified_timestamp__lt=minimum_modified_timestamp)
+    return outdated
+
+
+class _TimestampsQuerySet(models.QuerySet[_T]):
+    def up_to_date(
+        self,
+        minimum_info_timestamp: datetime | None = None,
+        minimum_modified_timestamp: datetime | None = None,
+    ) -> Self:
+        """Filter to rows that are up to date.
+
+        This is the database version of ModelWithTimestampsAndFunctions.is_up_to_date.
+
+        Args:
+            minimum_info_timestamp: The minimum info_timestamp required for the data to
+                be considered up to date.
+            minimum_modified_timestamp: The minimum info_modified_timestamp that is
+                required for the data to be considered up to date.
+
+        Returns:
+            The filtered queryset.
+        """
+        return self.filter(
+            _up_to_date_filter(minimum_info_timestamp, minimum_modified_timestamp),
+        )
+
+    def outdated(
+        self,
+        minimum_info_timestamp: datetime | None = None,
+        minimum_modified_timestamp: datetime | None = None,
+    ) -> Self:
+        """Filter to rows that are outdated.
+
+        This is the database version of ModelWithTimestampsAndFunctions.is_outdated.
+
+        Args:
+            minimum_info_timestamp: The minimum info_timestamp required for the data to
+                be considered up to date.
+            minimum_modified_timestamp: The minimum info_modified_timestamp that is
+                required for the data to be considered up to date.
+
+        Returns:
+            The filtered queryset.
+        """
+        return self.filter(
+            _outdated_filter(minimum_info_timestamp, minimum_modified_timestamp),
+        )
+
+    def outdated_counts(
+        self,
+        minimum_info_timestamp: datetime | None = None,
+        minimum_modified_timestamp: datetime | None = None,
+    ) -> tuple[int, int]:
+        """Count the rows and the outdated rows with a single query.
+
+        Args:
+            minimum_info_timestamp: The minimum info_timestamp required for the data to
+                be considered up to date.
+            minimum_modified_timestamp: The minimum info_modified_timestamp that is
+                required for the data to be considered up to date.
+
+        Returns:
+            A tuple containing the number of rows and the number of outdated rows.
+        """
+        counts = self.aggregate(
+            total=models.Count("pk"),
+            outdated=models.Count(
+                "pk",
+                filter=_outdated_filter(
+                    minimum_info_timestamp,
+                    minimum_modified_timestamp,
+                ),
+            ),
+        )
+        return (counts["total"], counts["outdated"])
+
+    @instrumented("touch")
+    def touch(
+        self,
+        info_timestamp: datetime,
+        modified_timestamp: datetime | None = None,
+    ) -> int:
+        """Set the timestamps of every row with a single UPDATE statement.
+
+        This is the database version of add_timestamps_and_save for rows whose
+        information was verified without any other fields changing.
+
+        Args:
+            info_timestamp: The timestamp to set info_timestamp to.
+            modified_timestamp: The timestamp to set info_modified_timestamp to, if
+                not given the current time of the database is used.
+
+        Returns:
+            The number of rows that were updated.
+        """
+        return self.update(
+            info_timestamp=info_timestamp,
+            info_modified_timestamp=modified_timestamp or Now(),
+        )
+
+    @instrumented("touch_modified")
+    def touch_modified(self, modified_timestamp: datetime | None = None) -> int:
+        """Set info_modified_timestamp of every row with a single UPDATE statement.
+
+        Args:
+            modified_timestamp: The timestamp to set info_modified_timestamp to, if not
+                given the current time of the database is used.
+
+        Returns:
+            The number of rows that were updated.
+        """
+        return self.update(info_modified_timestamp=modified_timestamp or Now())
+
+    def iter_chunks(
+        self,
+        chunk_size: int = 2000,
+        batch_size: int | None = None,
+    ) -> Iterator[list[_T]]:
+        """Iterate over the rows in chunks and save changes to their timestamps.
+
+        Rows are fetched in primary key order with keyset pagination, each chunk is
+        fetched with pk__gt the last primary key of the previous chunk, so there is no
+        OFFSET and only one chunk is in memory at a time. When the next chunk is
+        requested the rows of the previous chunk whose info_timestamp or
+        info_modified_timestamp changed are saved with bulk_update, only the timestamp
+        fields that changed are written.
+
+        Changes to the last chunk are saved when the iteration finishes, breaking out
+        of the loop discards the changes to the current chunk.
+
+        Args:
+            chunk_size: The number of rows in each chunk.
+            batch_size: The batch size to pass to bulk_update.
+
+        Yields:
+            Lists of up to chunk_size rows.
+        """
+        queryset = self.order_by("pk")
+        last_pk = None
+        while True:
+            chunk_queryset = (
+                queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            )
+            chunk = list(chunk_queryset[:chunk_size])
+            if not chunk:
+                return
+
+            original = [
+                (row.info_timestamp, row.info_modified_timestamp)  # type: ignore[reportAttributeAccessIssue]
+                for row in chunk
+            ]
+            yield chunk
+            self._save_changed_timestamps(chunk, original, batch_size)
+            last_pk = chunk[-1].pk
+            if len(chunk) < chunk_size:
+                return
+
+    def _save_changed_timestamps(
+        self,
+        chunk: list[_T],
+        original: list[tuple[datetime | None, datetime | None]],
+        batch_size: int | None,
+    ) -> None:
+        """Save the rows of a chunk whose timestamps changed.
+
+        Args:
+            chunk: The rows of the chunk.
+            original: The (info_timestamp, info_modified_timestamp) of every row when
+                it was fetched.
+            batch_size: The batch size to pass to bulk_update.
+        """
+        changed: list[_T] = []
+        fields: set[str] = set()
+        for row, (info_timestamp, modified_timestamp) in zip(
+            chunk,
+            original,
+            strict=True,
+        ):
+            row_fields = {
+                field
+                for field, value in (
+                    ("info_timestamp", info_timestamp),
+                    ("info_modified_timestamp", modified_timestamp),
+                )
+                if getattr(row, field) != value
+            }
+            if row_fields:
+                changed.append(row)
+                fields |= row_fields
+        if changed:
+            # The filters of this queryset are not applied to the update
+            _TimestampsQuerySet(self.model, using=self.db).bulk_update(
+                changed,
+                sorted(fields),
+                batch_size=batch_size,
+            )
+
+
+class _TimestampsManager(models.Manager[_T]):
+    def get_queryset(self) -> _TimestampsQuerySet[_T]:
+        """Use _TimestampsQuerySet for every query made through the manager.
+
+        Returns:
+            The queryset for the manager.
+        """
+        return _TimestampsQuerySet(self.model, using=self._db)
+
+    def up_to_date(
+        self,
+        minimum_info_timestamp: datetime | None = None,
+        minimum_modified_timestamp: datetime | None = None,
+    ) -> _TimestampsQuerySet[_T]:
+        """Filter to rows that are up to date, see _TimestampsQuerySet.up_to_date."""
+        return self.get_queryset().up_to_date(
+            minimum_info_timestamp,
+            minimum_modified_timestamp,
+        )
+
+    def outdated(
+        self,
+        minimum_info_timestamp: datetime | None = None,
+        minimum_modified_timestamp: datetime | None = None,
+    ) -> _TimestampsQuerySet[_T]:
+        """Filter to rows that are outdated, see _TimestampsQuerySet.outdated."""
+        return self.get_queryset().outdated(
+            minimum_info_timestamp,
+            minimum_modified_timestamp,
+        )
+
+    def outdated_counts(
+        self,
+        minimum_info_timestamp: datetime | None = None,
+        minimum_modified_timestamp: datetime | None = None,
+    ) -> tuple[int, int]:
+        """Count the rows and the outdated rows, see _TimestampsQuerySet."""
+        return self.get_queryset().outdated_counts(
+            minimum_info_timestamp,
+            minimum_modified_timestamp,
+        )
+
+    def touch(
+        self,
+        info_timestamp: datetime,
+        modified_timestamp: datetime | None = None,
+    ) -> int:
+        """Set the timestamps of every row, see _TimestampsQuerySet.touch."""
+        return self.get_queryset().touch(info_timestamp, modified_timestamp)
+
+    def touch_modified(self, modified_timestamp: datetime | None = None) -> int:
+        """Set info_modified_timestamp of every row, see _TimestampsQuerySet."""
+        return self.get_queryset().touch_modified(modified_timestamp)
+
+    def iter_chunks(
+        self,
+        chunk_size: int = 2000,
+        batch_size: int | None = None,
+    ) -> Iterator[list[_T]]:
+        """Iterate over every row in chunks, see _TimestampsQuerySet.iter_chunks."""
+        return self.get_queryset().iter_chunks(chunk_size, batch_size)
+
 
 class ModelWithTimestampsAndFunctions(ModelWithTimestamps):
     """Abstract model with timestamps and functions.
@@ -47,11 +535,28 @@ class ModelWithTimestampsAndFunctions(ModelWithTimestamps):
     functions.
     """
 
+    objects: ClassVar[_TimestampsManager[Self]] = _TimestampsManager()
+
     class Meta:  # type: ignore[reportIncompatibleVariableOverride]
         """Required to make the model abstract."""
 
         abstract = True  # Required to be able to subclass models.Model
 
+    @classmethod
+    def timestamps_queryset(cls, using: str | None = None) -> _TimestampsQuerySet[Self]:
+        """Get a queryset with the timestamp methods of objects.
+
+        This does not use objects, so the timestamp methods are available even if a
+        subclass replaces objects with a different manager.
+
+        Args:
+            using: The database alias, defaults to the database chosen by the routers.
+
+        Returns:
+            A queryset of every row of the model.
+        """
+        return _TimestampsQuerySet(cls, using=using)
+
     def is_up_to_date(
         self,
         minimum_info_timestamp: datetime | None = None,
@@ -103,6 +608,7 @@ class ModelWithTimestampsAndFunctions(ModelWithTimestamps):
             minimum_modified_timestamp,
         )
 
+    @instrumented("add_timestamps_and_save")
     def add_timestamps_and_save(self, info_timestamp: datetime) -> None:
         """Add timestamps to the model and save it.
 
@@ -115,76 +621,1456 @@ class ModelWithTimestampsAndFunctions(ModelWithTimestamps):
         self.add_timestamps(info_timestamp)
         self.save()
 
-    def add_timestamps(self, info_timestamp: datetime) -> None:
+    @instrumented("aadd_timestamps_and_save")
+    async def aadd_timestamps_and_save(self, info_timestamp: datetime) -> None:
+        """Async version of add_timestamps_and_save.
+
+        Args:
+            info_timestamp: The timestamp to add to the model.
+
+        Returns:
+            None
+        """
+        self.add_timestamps(info_timestamp)
+        await self.asave()
+
+    def add_timestamps(
+        self,
+        info_timestamp: datetime,
+        modified_timestamp: datetime | None = None,
+    ) -> None:
         """Add timestamps to the model.
 
         Args:
             info_timestamp: The timestamp to add to the model.
+            modified_timestamp: The timestamp to use for info_modified_timestamp, if
+                not given the current time is used.
 
         Returns:
             None
         """
         self.info_timestamp = info_timestamp
-        self.info_modified_timestamp = datetime.now().astimezone()
+        self.info_modified_timestamp = modified_timestamp or datetime.now().astimezone()
 
+    @classmethod
+    @instrumented("add_timestamps_and_save_many")
+    def add_timestamps_and_save_many(
+        cls,
+        instances: Iterable[Self],
+        info_timestamp: datetime,
+        batch_size: int | None = None,
+    ) -> tuple[int, int]:
+        """Add timestamps to many instances and save them in bulk.
 
-class ModelWithTimestampsAndUpdateAt(ModelWithTimestamps):
-    """Abstract model with timestamps and update_at.
+        Every instance is given the same info_modified_timestamp. Instances that have
+        not been saved or loaded from the database are inserted with bulk_create and
+        the rest are updated with bulk_update, so the number of queries depends on the
+        batch size instead of the number of instances. New instances are inserted even
+        if their primary key has a default, such as a UUIDField with default=uuid4.
 
-    This includes info_timestamp, info_modified_timestamp, update_at and
-    timestamp related functions.
-    """
+        Args:
+            instances: The instances to add timestamps to and save.
+            info_timestamp: The timestamp to add to the instances.
+            batch_size: The maximum number of instances to save in a single query, by
+                default the largest batch size the database supports is used.
 
-    updated_at = models.DateTimeField()
-    """Timestamp representing when the information need to be updated."""
+        Returns:
+            A tuple containing the number of instances that were inserted and the
+            number of instances that were updated.
+        """
+        instances = list(instances)
+        modified_timestamp = datetime.now().astimezone()
+        for instance in instances:
+            instance.add_timestamps(info_timestamp, modified_timestamp)
+        return cls.bulk_save(instances, batch_size)
 
-    class Meta:  # type: ignore[reportIncompatibleVariableOverride]
-        """Required to make the model abstract."""
+    @classmethod
+    @instrumented("aadd_timestamps_and_save_many")
+    async def aadd_timestamps_and_save_many(
+        cls,
+        instances: Iterable[Self],
+        info_timestamp: datetime,
+        batch_size: int | None = None,
+    ) -> tuple[int, int]:
+        """Async version of add_timestamps_and_save_many.
 
-        abstract = True  # Required to be able to subclass models.Model
+        Args:
+            instances: The instances to add timestamps to and save.
+            info_timestamp: The timestamp to add to the instances.
+            batch_size: The maximum number of instances to save in a single query, by
+                default the largest batch size the database supports is used.
 
+        Returns:
+            A tuple containing the number of instances that were inserted and the
+            number of instances that were updated.
+        """
+        instances = list(instances)
+        modified_timestamp = datetime.now().astimezone()
+        for instance in instances:
+            instance.add_timestamps(info_timestamp, modified_timestamp)
+        return await cls.abulk_save(instances, batch_size)
 
-_T = TypeVar("_T", bound=models.Model)
+    @classmethod
+    def _split_new(cls, instances: Iterable[Self]) -> tuple[list[Self], list[Self]]:
+        """Split instances into new and existing instances.
 
+        Instances are new if they have not been saved or loaded from the database, the
+        same check Model.save uses. The primary key can not be used because primary
+        keys with a default, such as a UUIDField with default=uuid4, are set on new
+        instances.
 
-class _GetOrNewManager(models.Manager[_T]):
-    def get_or_new(self, **values: str | int | models.Model) -> tuple[_T, bool]:
-        """Get an object if it exist, otherwise create it.
+        Args:
+            instances: The instances to split.
 
-        This is similar to get_or_create but with some small differences. get_or_create
-        will immediatly attempt to create and save an object even if it doesn't have all
-        the required information for the object to be saved, get_or_new will not save
-        the object on initialization, and instead must be saved manually when all of the
-        information has been added to the object.
+        Returns:
+            A tuple containing the new instances and the existing instances.
+        """
+        new_instances: list[Self] = []
+        existing_instances: list[Self] = []
+        for instance in instances:
+            if instance._state.adding:  # noqa: SLF001 - _state is public Django API
+                new_instances.append(instance)
+            else:
+                existing_instances.append(instance)
+        return (new_instances, existing_instances)
 
-        This is useful for when creating a new object but not all of the information is
-        easily avaialble at the time of object initialization.
+    @classmethod
+    def _bulk_update_fields(cls) -> list[str]:
+        """Get the fields that bulk_save updates for existing instances.
+
+        Returns:
+            The name of every concrete field except the primary key.
+        """
+        return [
+            field.name for field in cls._meta.concrete_fields if not field.primary_key
+        ]
+
+    @classmethod
+    @instrumented("bulk_save")
+    def bulk_save(
+        cls,
+        instances: Iterable[Self],
+        batch_size: int | None = None,
+    ) -> tuple[int, int]:
+        """Save many instances in bulk.
+
+        Instances that have not been saved or loaded from the database are inserted
+        with bulk_create and the rest are updated with bulk_update, so the number of
+        queries depends on the batch size instead of the number of instances. New
+        instances are inserted even if their primary key has a default, such as a
+        UUIDField with default=uuid4. Neither sends post_save, so the saved instances
+        are removed from the get_or_new caches afterwards.
 
         Args:
-            values: The values to use to get or create the object, the keys are the
-            field names and the values are the values to use for the fields.
+            instances: The instances to save.
+            batch_size: The maximum number of instances to save in a single query, by
+                default the largest batch size the database supports is used.
 
         Returns:
-            A tuple containing the object and a boolean representing if the object was
-            created or not, if the object was created the boolean will be True, if the
-            object was fetched the boolean will be False
+            A tuple containing the number of instances that were inserted and the
+            number of instances that were updated.
+        """
+        new_instances, existing_instances = cls._split_new(instances)
+        manager = cls._default_manager
+        if new_instances:
+            manager.bulk_create(new_instances, batch_size=batch_size)
+        updated = 0
+        if existing_instances:
+            updated = manager.bulk_update(
+                existing_instances,
+                cls._bulk_update_fields(),
+                batch_size=batch_size,
+            )
+        invalidate_bulk_saved(cls, [*new_instances, *existing_instances], manager.db)
+        return (len(new_instances), updated)
+
+    @classmethod
+    @instrumented("abulk_save")
+    async def abulk_save(
+        cls,
+        instances: Iterable[Self],
+        batch_size: int | None = None,
+    ) -> tuple[int, int]:
+        """Async version of bulk_save.
 
+        Args:
+            instances: The instances to save.
+            batch_size: The maximum number of instances to save in a single query, by
+                default the largest batch size the database supports is used.
+
+        Returns:
+            A tuple containing the number of instances that were inserted and the
+            number of instances that were updated.
         """
-        try:
-            return (self.get(**values), False)
-        except self.model.DoesNotExist:
-            return (self.model(**values), True)
+        new_instances, existing_instances = cls._split_new(instances)
+        manager = cls._default_manager
+        if new_instances:
+            await manager.abulk_create(new_instances, batch_size=batch_size)
+        updated = 0
+        if existing_instances:
+            updated = await manager.abulk_update(
+                existing_instances,
+                cls._bulk_update_fields(),
+                batch_size=batch_size,
+            )
+        await sync_to_async(invalidate_bulk_saved)(
+            cls,
+            [*new_instances, *existing_instances],
+            manager.db,
+        )
+        return (len(new_instances), updated)
 
 
-class ModelWithGetOrNew(models.Model):
-    """Model template with a get_or_new function."""
+class _UpdateAtQuerySet(models.QuerySet[_T]):
+    def due(self, now: datetime | None = None) -> Self:
+        """Filter to rows whose updated_at has passed.
 
-    # The types here don't exactly match up, but this implementation is as close
-    # as possible to Django's official example on how to implement something
-    # similar. See: https://docs.djangoproject.com/en/5.0/topics/db/managers/
-    objects: ClassVar[_GetOrNewManager[Self]] = _GetOrNewManager()
+        Args:
+            now: The time to compare updated_at to, defaults to the current time.
 
-    class Meta:  # type: ignore[reportIncompatibleVariableOverride]
-        """Required to make the model abstract."""
+        Returns:
+            The filtered queryset.
+        """
+        return self.filter(updated_at__lte=now or datetime.now().astimezone())
 
-        abstract = True  # Required to be able to subclass models.Model
+
+class _UpdateAtManager(models.Manager[_T]):
+    def get_queryset(self) -> _UpdateAtQuerySet[_T]:
+        """Use _UpdateAtQuerySet for every query made through the manager.
+
+        Returns:
+            The queryset for the manager.
+        """
+        return _UpdateAtQuerySet(self.model, using=self._db)
+
+    def due(self, now: datetime | None = None) -> _UpdateAtQuerySet[_T]:
+        """Filter to rows whose updated_at has passed, see _UpdateAtQuerySet.due."""
+        return self.get_queryset().due(now)
+
+    @instrumented("process_due")
+    def process_due(
+        self,
+        worker: Callable[[list[_T]], object],
+        limit: int = 100,
+        backoff: timedelta | Callable[[_T], timedelta] = timedelta(hours=1),
+        now: datetime | None = None,
+    ) -> int:
+        """Claim the rows that are due to be updated and pass them to a worker.
+
+        Up to limit rows are claimed in order of updated_at with
+        select_for_update(skip_locked=True), so several processes can call
+        process_due at the same time without processing the same row twice. After the
+        worker finishes the updated_at of every claimed row is moved forward by
+        backoff. The rows stay locked until the worker finishes, if the worker raises
+        an exception the rows are released without being rescheduled.
+
+        Args:
+            worker: The function that processes the claimed rows.
+            limit: The maximum number of rows to claim.
+            backoff: How long to wait before a row is due again, either a fixed
+                timedelta or a function that returns the timedelta for a row.
+            now: The time to compare updated_at to, defaults to the current time.
+
+        Returns:
+            The number of rows that were processed.
+        """
+        now = now or datetime.now().astimezone()
+        skip_locked = connections[self.db].features.has_select_for_update_skip_locked
+        with transaction.atomic(using=self.db):
+            rows = list(
+                self.due(now)
+                .select_for_update(skip_locked=skip_locked)
+                .order_by("updated_at")[:limit],
+            )
+            if not rows:
+                return 0
+
+            worker(rows)
+            for row in rows:
+                delay = backoff(row) if callable(backoff) else backoff
+                row.updated_at = now + delay  # type: ignore[reportAttributeAccessIssue]
+            self.bulk_update(rows, ["updated_at"])
+        return len(rows)
+
+
+class ModelWithTimestampsAndUpdateAt(ModelWithTimestamps):
+    """Abstract model with timestamps and update_at.
+
+    This includes info_timestamp, info_modified_timestamp, update_at and
+    timestamp related functions.
+    """
+
+    objects: ClassVar[_UpdateAtManager[Self]] = _UpdateAtManager()
+
+    updated_at = models.DateTimeField()
+    """Timestamp representing when the information need to be updated."""
+
+    class Meta:  # type: ignore[reportIncompatibleVariableOverride]
+        """Required to make the model abstract."""
+
+        abstract = True  # Required to be able to subclass models.Model
+
+
+_LookupKey = tuple[tuple[str, object], ...]
+
+
+def _lookup_key(
+    model: type[models.Model],
+    values: Mapping[str, str | int | models.Model],
+) -> _LookupKey:
+    """Build a hashable key for a set of get_or_new lookup values.
+
+    Field names are resolved to their attnames and values are converted to the python
+    type the database would return, so that a key built from lookup values matches a
+    key built from a fetched instance with _instance_key.
+
+    Args:
+        model: The model the lookup values are for.
+        values: The lookup values, the keys must be field names of the model.
+
+    Returns:
+        A sorted tuple of (attname, value) pairs.
+    """
+    opts = model._meta  # noqa: SLF001 - _meta is public Django API
+    key: list[tuple[str, object]] = []
+    for name, value in values.items():
+        field = opts.pk if name == "pk" else opts.get_field(name)
+        if isinstance(value, models.Model):
+            key.append((field.attname, value.pk))  # type: ignore[reportAttributeAccessIssue]
+        elif field.is_relation:
+            key.append((field.attname, field.target_field.to_python(value)))  # type: ignore[reportAttributeAccessIssue]
+        else:
+            key.append((field.attname, field.to_python(value)))  # type: ignore[reportAttributeAccessIssue]
+    return tuple(sorted(key))
+
+
+def _instance_key(instance: models.Model, attnames: Iterable[str]) -> _LookupKey:
+    """Build the lookup key an instance would match for the given attnames.
+
+    Args:
+        instance: The instance to build the key for.
+        attnames: The sorted attnames of the lookup.
+
+    Returns:
+        A sorted tuple of (attname, value) pairs.
+    """
+    return tuple((attname, getattr(instance, attname)) for attname in attnames)
+
+
+_Lookup = Mapping[str, str | int | models.Model]
+_Batch = list[tuple[_LookupKey, _Lookup]]
+
+
+def _lookup_fields(values: _Lookup) -> list[str]:
+    """Get the fields that have to be loaded to evaluate a lookup.
+
+    Args:
+        values: The lookup values, the keys may include lookups such as name__iexact.
+
+    Returns:
+        The names of the fields used by the lookup, the primary key is always loaded so
+        it is not included.
+    """
+    fields = {name.split(LOOKUP_SEP, 1)[0] for name in values}
+    fields.discard("pk")
+    return sorted(fields)
+
+
+async def _aiterate(iterable: Iterable[_V] | AsyncIterable[_V]) -> AsyncIterator[_V]:
+    """Iterate over an iterable or an async iterable asynchronously.
+
+    Args:
+        iterable: The iterable.
+
+    Yields:
+        The items of the iterable.
+    """
+    if isinstance(iterable, AsyncIterable):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+class _GetOrNewManager(models.Manager[_T]):
+    @instrumented("get_or_new", count_get_or_new)
+    def get_or_new(self, **values: str | int | models.Model) -> tuple[_T, bool]:
+        """Get an object if it exist, otherwise create it.
+
+        This is similar to get_or_create but with some small differences. get_or_create
+        will immediatly attempt to create and save an object even if it doesn't have all
+        the required information for the object to be saved, get_or_new will not save
+        the object on initialization, and instead must be saved manually when all of the
+        information has been added to the object.
+
+        This is useful for when creating a new object but not all of the information is
+        easily avaialble at the time of object initialization.
+
+        Args:
+            values: The values to use to get or create the object, the keys are the
+            field names and the values are the values to use for the fields.
+
+        Returns:
+            A tuple containing the object and a boolean representing if the object was
+            created or not, if the object was created the boolean will be True, if the
+            object was fetched the boolean will be False
+
+        """
+        key, cached = self._get_cached_lookup(values)
+        if cached is not None:
+            return cached
+
+        shared_cache = self._get_shared_cache()
+        if shared_cache is not None and key is not None:
+            found, pk = shared_cache.get(self.model, self.db, key)
+            if found:
+                return self._from_shared_cache(key, pk, values)
+
+        try:
+            instance = self.get(**values)
+        except self.model.DoesNotExist:
+            if shared_cache is not None and key is not None:
+                shared_cache.set(self.model, self.db, key, None)
+            return (self.model(**values), True)
+
+        if key is not None:
+            self._add_to_cache({key: instance})
+            if shared_cache is not None:
+                shared_cache.set(self.model, self.db, key, instance.pk)
+        return (instance, False)
+
+    @instrumented("aget_or_new", count_get_or_new)
+    async def aget_or_new(self, **values: str | int | models.Model) -> tuple[_T, bool]:
+        """Async version of get_or_new.
+
+        Args:
+            values: The values to use to get or create the object, the keys are the
+            field names and the values are the values to use for the fields.
+
+        Returns:
+            A tuple containing the object and a boolean representing if the object was
+            created or not.
+        """
+        key, cached = self._get_cached_lookup(values)
+        if cached is not None:
+            return cached
+
+        shared_cache = self._get_shared_cache()
+        if shared_cache is not None and key is not None:
+            found, pk = await shared_cache.aget(self.model, self.db, key)
+            if found:
+                return self._from_shared_cache(key, pk, values)
+
+        try:
+            instance = await self.aget(**values)
+        except self.model.DoesNotExist:
+            if shared_cache is not None and key is not None:
+                await shared_cache.aset(self.model, self.db, key, None)
+            return (self.model(**values), True)
+
+        if key is not None:
+            self._add_to_cache({key: instance})
+            if shared_cache is not None:
+                await shared_cache.aset(self.model, self.db, key, instance.pk)
+        return (instance, False)
+
+    @instrumented("exists_or_new", count_get_or_new)
+    def exists_or_new(self, **values: str | int | models.Model) -> tuple[_T, bool]:
+        """Get an object with only its lookup fields if it exists, otherwise create it.
+
+        This is the same as get_or_new except that only the primary key and the fields
+        used in the lookup are fetched, every other field is deferred and is loaded
+        from the database the first time it is accessed. This avoids transferring large
+        fields when the caller only needs to know if the object exists.
+
+        Saving a fetched object only updates the fields that have been loaded.
+
+        Args:
+            values: The values to use to get or create the object, the keys are the
+            field names and the values are the values to use for the fields.
+
+        Returns:
+            A tuple containing the object and a boolean representing if the object was
+            created or not.
+        """
+        _key, cached = self._get_cached_lookup(values)
+        if cached is not None:
+            return cached
+
+        try:
+            instance = self.only(*_lookup_fields(values)).get(**values)
+        except self.model.DoesNotExist:
+            return (self.model(**values), True)
+        return (instance, False)
+
+    @instrumented("aexists_or_new", count_get_or_new)
+    async def aexists_or_new(
+        self,
+        **values: str | int | models.Model,
+    ) -> tuple[_T, bool]:
+        """Async version of exists_or_new.
+
+        Args:
+            values: The values to use to get or create the object, the keys are the
+            field names and the values are the values to use for the fields.
+
+        Returns:
+            A tuple containing the object and a boolean representing if the object was
+            created or not.
+        """
+        _key, cached = self._get_cached_lookup(values)
+        if cached is not None:
+            return cached
+
+        try:
+            instance = await self.only(*_lookup_fields(values)).aget(**values)
+        except self.model.DoesNotExist:
+            return (self.model(**values), True)
+        return (instance, False)
+
+    def _get_cached_lookup(
+        self,
+        values: _Lookup,
+    ) -> tuple[_LookupKey | None, tuple[_T, bool] | None]:
+        """Get the result of a lookup from the active GetOrNewCache.
+
+        Args:
+            values: The lookup values.
+
+        Returns:
+            A tuple containing the normalized lookup key, or None if the lookup can't be
+            cached, and the result of get_or_new, or None if the lookup is not cached.
+        """
+        cache = get_active_cache()
+        if cache is None and self._get_shared_cache() is None:
+            return (None, None)
+
+        try:
+            key = _lookup_key(self.model, values)
+        except FieldDoesNotExist:
+            # Lookups such as name__iexact can't be normalized so they aren't cached
+            return (None, None)
+        if cache is None:
+            return (key, None)
+        if cache.is_missing(self.model, self.db, key):
+            return (key, (self.model(**values), True))
+        cached = cache.get(self.model, self.db, key)
+        if cached is None:
+            return (key, None)
+        return (key, (cached, False))  # type: ignore[reportReturnType]
+
+    def _get_shared_cache(self) -> SharedGetOrNewCache | None:
+        """Get the SharedGetOrNewCache of the model.
+
+        Returns:
+            The shared cache, or None if the model does not have one.
+        """
+        shared_cache = getattr(self.model, "shared_cache", None)
+        if not isinstance(shared_cache, SharedGetOrNewCache):
+            return None
+        return shared_cache
+
+    def _from_shared_cache(
+        self,
+        key: _LookupKey,
+        pk: object,
+        values: _Lookup,
+    ) -> tuple[_T, bool]:
+        """Build the result of get_or_new from a lookup in the shared cache.
+
+        Args:
+            key: The normalized lookup key.
+            pk: The cached primary key, or None if the lookup did not match anything.
+            values: The lookup values.
+
+        Returns:
+            A new object if the lookup did not match anything, otherwise an object with
+            only the primary key and the lookup fields loaded.
+        """
+        if pk is None:
+            return (self.model(**values), True)
+
+        opts = self.model._meta  # noqa: SLF001 - _meta is public Django API
+        loaded = {**dict(key), opts.pk.attname: pk}  # type: ignore[reportOptionalMemberAccess]
+        field_names = [
+            field.attname for field in opts.concrete_fields if field.attname in loaded
+        ]
+        instance = self.model.from_db(
+            self.db,
+            field_names,
+            [loaded[field_name] for field_name in field_names],
+        )
+        return (instance, False)
+
+    def _get_cached(
+        self,
+        keys: Iterable[_LookupKey],
+    ) -> tuple[dict[_LookupKey, _T], set[_LookupKey]]:
+        """Get the objects for lookup keys from the active GetOrNewCache.
+
+        Args:
+            keys: The normalized lookup keys.
+
+        Returns:
+            A tuple containing a dictionary mapping the keys that are cached to their
+            objects and the keys that are cached as missing.
+        """
+        cache = get_active_cache()
+        if cache is None:
+            return ({}, set())
+
+        found: dict[_LookupKey, _T] = {}
+        missing: set[_LookupKey] = set()
+        for key in keys:
+            if cache.is_missing(self.model, self.db, key):
+                missing.add(key)
+                continue
+            cached = cache.get(self.model, self.db, key)
+            if cached is not None:
+                found[key] = cached  # type: ignore[reportArgumentType]
+        return (found, missing)
+
+    def _add_to_cache(self, found: Mapping[_LookupKey, _T]) -> None:
+        """Add fetched objects to the active GetOrNewCache.
+
+        Args:
+            found: A dictionary mapping normalized lookup keys to their objects.
+        """
+        cache = get_active_cache()
+        if cache is not None:
+            for key, instance in found.items():
+                cache.set(self.model, self.db, key, instance)
+
+    def _batch_size(
+        self,
+        pending: _Batch,
+        batch_size: int | None,
+    ) -> int:
+        """Get the number of lookups to include in a single query.
+
+        Args:
+            pending: The (key, values) pairs of the lookups to fetch.
+            batch_size: The requested batch size.
+
+        Returns:
+            The requested batch size, or the largest batch size the database supports
+            if no batch size was requested.
+        """
+        if batch_size is not None:
+            return batch_size
+
+        opts = self.model._meta  # noqa: SLF001 - _meta is public Django API
+        longest_key = max((key for key, _ in pending), key=len)
+        fields = [opts.get_field(attname) for attname, _ in longest_key]
+        return connections[self.db].ops.bulk_batch_size(fields, pending)
+
+    def _batch_queryset(
+        self,
+        batch: _Batch,
+    ) -> models.QuerySet[_T]:
+        """Build a single query that fetches every object for a batch of lookups.
+
+        Args:
+            batch: The (key, values) pairs of the lookups to fetch.
+
+        Returns:
+            The queryset for the batch.
+        """
+        attname_sets = {tuple(attname for attname, _ in key) for key, _ in batch}
+        if len(attname_sets) == 1 and len(next(iter(attname_sets))) == 1:
+            # Every lookup is on the same field so a single IN query can be used, NULL
+            # never matches IN so None is looked up with IS NULL like get_or_new does
+            ((attname,),) = attname_sets
+            values = [key[0][1] for key, _ in batch]
+            not_null = [value for value in values if value is not None]
+            conditions: list[models.Q] = []
+            if not_null:
+                conditions.append(models.Q(**{f"{attname}__in": not_null}))
+            if len(not_null) < len(values):
+                conditions.append(models.Q(**{f"{attname}__isnull": True}))
+            return self.filter(reduce(operator.or_, conditions))
+        return self.filter(
+            reduce(operator.or_, (models.Q(**values) for _, values in batch)),
+        )
+
+    def _match_batch(
+        self,
+        batch: _Batch,
+        instances: Iterable[_T],
+    ) -> dict[_LookupKey, _T]:
+        """Match the objects fetched for a batch of lookups to their lookups.
+
+        Args:
+            batch: The (key, values) pairs of the lookups that were fetched.
+            instances: The objects returned by the query for the batch.
+
+        Returns:
+            A dictionary mapping the key of every lookup that exists to its object.
+
+        Raises:
+            `MultipleObjectsReturned`: If more than one object matches a lookup.
+        """
+        batch_keys = {key for key, _ in batch}
+        attname_sets = {tuple(attname for attname, _ in key) for key in batch_keys}
+
+        found: dict[_LookupKey, _T] = {}
+        for instance in instances:
+            for attnames in attname_sets:
+                key = _instance_key(instance, attnames)
+                if key not in batch_keys:
+                    continue
+                if key in found and found[key].pk != instance.pk:
+                    msg = (
+                        f"get_or_new_many returned more than one "
+                        f"{self.model.__name__} for the lookup {dict(key)}."
+                    )
+                    raise self.model.MultipleObjectsReturned(msg)
+                found[key] = instance
+        return found
+
+    def _prepare_many(
+        self,
+        lookups: list[_Lookup],
+    ) -> tuple[list[_LookupKey], dict[_LookupKey, _T], _Batch]:
+        """Normalize the lookups for get_or_new_many.
+
+        Args:
+            lookups: The lookups passed to get_or_new_many.
+
+        Returns:
+            A tuple containing the key of every lookup, the objects that were found in
+            the active GetOrNewCache and the unique (key, values) pairs that still need
+            to be fetched, lookups that are cached as missing are not fetched.
+
+        Raises:
+            `ValueError`: If a lookup does not contain any values or uses a name that is
+                not a field of the model, such as name__iexact.
+        """
+        if not all(lookups):
+            msg = "get_or_new_many requires every lookup to contain at least one value."
+            raise ValueError(msg)
+
+        keys: list[_LookupKey] = []
+        for values in lookups:
+            try:
+                keys.append(_lookup_key(self.model, values))
+            except FieldDoesNotExist as error:
+                msg = (
+                    f"get_or_new_many only supports exact lookups on fields of "
+                    f"{self.model.__name__}, {dict(values)} is not supported."
+                )
+                raise ValueError(msg) from error
+        found, missing = self._get_cached(keys)
+        # dict keeps the first occurrence of each key so duplicates are resolved once
+        pending = [
+            (key, values)
+            for key, values in dict(zip(keys, lookups, strict=True)).items()
+            if key not in found and key not in missing
+        ]
+        return (keys, found, pending)
+
+    def _results_many(
+        self,
+        lookups: list[_Lookup],
+        keys: list[_LookupKey],
+        found: dict[_LookupKey, _T],
+    ) -> list[tuple[_T, bool]]:
+        """Build the results of get_or_new_many in the same order as the lookups.
+
+        Args:
+            lookups: The lookups passed to get_or_new_many.
+            keys: The key of every lookup.
+            found: The objects that exist.
+
+        Returns:
+            A list of tuples containing the object and a boolean representing if the
+            object was created or not.
+        """
+        results: list[tuple[_T, bool]] = []
+        new: dict[_LookupKey, _T] = {}
+        for key, values in zip(keys, lookups, strict=True):
+            if key in found:
+                results.append((found[key], False))
+            elif key in new:
+                results.append((new[key], False))
+            else:
+                new[key] = self.model(**values)
+                results.append((new[key], True))
+        return results
+
+    def _fetch_many(
+        self,
+        pending: _Batch,
+        batch_size: int | None,
+    ) -> dict[_LookupKey, _T]:
+        """Fetch the objects for lookups in batches and add them to the cache.
+
+        Args:
+            pending: The (key, values) pairs of the lookups to fetch.
+            batch_size: The requested batch size.
+
+        Returns:
+            A dictionary mapping the key of every lookup that exists to its object.
+        """
+        found: dict[_LookupKey, _T] = {}
+        if not pending:
+            return found
+        batch_size = self._batch_size(pending, batch_size)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            fetched = self._match_batch(batch, self._batch_queryset(batch))
+            self._add_to_cache(fetched)
+            found.update(fetched)
+        return found
+
+    async def _afetch_many(
+        self,
+        pending: _Batch,
+        batch_size: int | None,
+    ) -> dict[_LookupKey, _T]:
+        """Async version of _fetch_many.
+
+        Args:
+            pending: The (key, values) pairs of the lookups to fetch.
+            batch_size: The requested batch size.
+
+        Returns:
+            A dictionary mapping the key of every lookup that exists to its object.
+        """
+        found: dict[_LookupKey, _T] = {}
+        if not pending:
+            return found
+        batch_size = self._batch_size(pending, batch_size)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            instances = [instance async for instance in self._batch_queryset(batch)]
+            fetched = self._match_batch(batch, instances)
+            self._add_to_cache(fetched)
+            found.update(fetched)
+        return found
+
+    @instrumented("get_or_new_many", count_get_or_new_many)
+    def get_or_new_many(
+        self,
+        lookups: Iterable[_Lookup],
+        batch_size: int | None = None,
+    ) -> list[tuple[_T, bool]]:
+        """Get or create objects for many lookups using as few queries as possible.
+
+        This is the bulk version of get_or_new, instead of one query per lookup the
+        lookups are combined into chunked IN/OR queries. New objects are not saved, the
+        same as get_or_new.
+
+        Duplicate lookups are only resolved once, if a duplicate lookup does not exist
+        the same new object is returned for every occurrence but only the first
+        occurrence is marked as created, this prevents the same object from being
+        saved twice.
+
+        Only exact lookups on fields of the model are supported (e.g. name="test" or
+        artist=artist), lookups that span relationships or use a lookup type such as
+        name__iexact cannot be matched back to their results.
+
+        Args:
+            lookups: The values to use for each object, each lookup is the same as the
+                values that would be passed to get_or_new.
+            batch_size: The maximum number of lookups to include in a single query, by
+                default the largest batch size the database supports is used.
+
+        Returns:
+            A list of tuples containing the object and a boolean representing if the
+            object was created or not, in the same order as the lookups.
+
+        Raises:
+            `ValueError`: If a lookup does not contain any values or is not an exact
+                lookup on a field of the model.
+            `MultipleObjectsReturned`: If more than one object matches a lookup.
+        """
+        lookups = list(lookups)
+        keys, found, pending = self._prepare_many(lookups)
+        found.update(self._fetch_many(pending, batch_size))
+        return self._results_many(lookups, keys, found)
+
+    @instrumented("aget_or_new_many", count_get_or_new_many)
+    async def aget_or_new_many(
+        self,
+        lookups: Iterable[_Lookup],
+        batch_size: int | None = None,
+    ) -> list[tuple[_T, bool]]:
+        """Async version of get_or_new_many.
+
+        Args:
+            lookups: The values to use for each object, each lookup is the same as the
+                values that would be passed to get_or_new.
+            batch_size: The maximum number of lookups to include in a single query, by
+                default the largest batch size the database supports is used.
+
+        Returns:
+            A list of tuples containing the object and a boolean representing if the
+            object was created or not, in the same order as the lookups.
+        """
+        lookups = list(lookups)
+        keys, found, pending = self._prepare_many(lookups)
+        found.update(await self._afetch_many(pending, batch_size))
+        return self._results_many(lookups, keys, found)
+
+    def iter_get_or_new(
+        self,
+        lookups: Iterable[_Lookup],
+        batch_size: int = 1000,
+    ) -> Iterator[tuple[_T, bool]]:
+        """Get or create objects for a stream of lookups with bounded memory.
+
+        The lookups are consumed lazily in windows of batch_size, each window is
+        resolved with get_or_new_many and its results are yielded before the next
+        window is read. Only one window is held in memory at a time and a stream of N
+        lookups takes roughly N / batch_size queries.
+
+        Duplicate lookups are only resolved together when they are in the same window.
+        To avoid creating the same object twice save new objects as they are yielded,
+        a later window will then find the saved object.
+
+        Args:
+            lookups: The lookups, each lookup is the same as the values that would be
+                passed to get_or_new.
+            batch_size: The number of lookups to read and resolve at a time.
+
+        Yields:
+            Tuples containing the object and a boolean representing if the object was
+            created or not, in the same order as the lookups.
+        """
+        iterator = iter(lookups)
+        while window := list(islice(iterator, batch_size)):
+            yield from self.get_or_new_many(window)
+
+    async def aiter_get_or_new(
+        self,
+        lookups: Iterable[_Lookup] | AsyncIterable[_Lookup],
+        batch_size: int = 1000,
+    ) -> AsyncIterator[tuple[_T, bool]]:
+        """Async version of iter_get_or_new.
+
+        Args:
+            lookups: The lookups, either an iterable or an async iterable.
+            batch_size: The number of lookups to read and resolve at a time.
+
+        Yields:
+            Tuples containing the object and a boolean representing if the object was
+            created or not, in the same order as the lookups.
+        """
+        window: list[_Lookup] = []
+        async for lookup in _aiterate(lookups):
+            window.append(lookup)
+            if len(window) >= batch_size:
+                for result in await self.aget_or_new_many(window):
+                    yield result
+                window = []
+        if window:
+            for result in await self.aget_or_new_many(window):
+                yield result
+
+    def _prepare_warm(
+        self,
+        lookups: Iterable[_Lookup | tuple[object, ...]],
+    ) -> tuple[GetOrNewCache, _Batch]:
+        """Normalize the lookups for warm and cache the lookups that can't exist.
+
+        Args:
+            lookups: The lookups passed to warm.
+
+        Returns:
+            A tuple containing the active cache and the (key, values) pairs that need
+            to be fetched.
+
+        Raises:
+            `RuntimeError`: If no GetOrNewCache is active.
+            `ValueError`: If a natural key does not have one value for every natural
+            key field.
+        """
+        cache = get_active_cache()
+        if cache is None:
+            msg = "warm requires an active GetOrNewCache."
+            raise RuntimeError(msg)
+
+        natural_key_fields: tuple[str, ...] | None = None
+        dict_lookups: list[_Lookup] = []
+        for lookup in lookups:
+            if isinstance(lookup, tuple):
+                natural_key_fields = natural_key_fields or self.natural_key_fields()
+                if len(lookup) != len(natural_key_fields):
+                    msg = f"{lookup} does not match the fields {natural_key_fields}."
+                    raise ValueError(msg)
+                lookup = dict(zip(natural_key_fields, lookup, strict=True))  # noqa: PLW2901 - Normalized in place
+            dict_lookups.append(lookup)  # type: ignore[reportArgumentType]
+
+        _keys, _found, pending = self._prepare_many(dict_lookups)
+        fetchable: _Batch = []
+        for key, values in pending:
+            # An object related to an unsaved object can't exist yet
+            if any(
+                isinstance(value, models.Model) and value.pk is None
+                for value in values.values()
+            ):
+                cache.set_missing(self.model, self.db, key)
+            else:
+                fetchable.append((key, values))
+        return (cache, fetchable)
+
+    @instrumented("warm")
+    def warm(
+        self,
+        lookups: Iterable[_Lookup | tuple[object, ...]],
+        batch_size: int | None = None,
+    ) -> int:
+        """Resolve many lookups into the active GetOrNewCache.
+
+        Existing objects are fetched the same way as get_or_new_many and added to the
+        cache, lookups that do not exist are cached as missing. Afterwards get_or_new
+        and get_or_new_many calls for the same lookups do not make any queries until
+        an object of the model is saved or deleted.
+
+        Lookups can be dictionaries of field values or tuples of values for the fields
+        returned by natural_key_fields.
+
+        Args:
+            lookups: The lookups to resolve.
+            batch_size: The maximum number of lookups to include in a single query, by
+                default the largest batch size the database supports is used.
+
+        Returns:
+            The number of objects that were fetched.
+        """
+        cache, pending = self._prepare_warm(lookups)
+        fetched = self._fetch_many(pending, batch_size)
+        for key, _values in pending:
+            if key not in fetched:
+                cache.set_missing(self.model, self.db, key)
+        return len(fetched)
+
+    @instrumented("awarm")
+    async def awarm(
+        self,
+        lookups: Iterable[_Lookup | tuple[object, ...]],
+        batch_size: int | None = None,
+    ) -> int:
+        """Async version of warm.
+
+        Args:
+            lookups: The lookups to resolve.
+            batch_size: The maximum number of lookups to include in a single query, by
+                default the largest batch size the database supports is used.
+
+        Returns:
+            The number of objects that were fetched.
+        """
+        cache, pending = self._prepare_warm(lookups)
+        fetched = await self._afetch_many(pending, batch_size)
+        for key, _values in pending:
+            if key not in fetched:
+                cache.set_missing(self.model, self.db, key)
+        return len(fetched)
+
+    def natural_key_fields(self) -> tuple[str, ...]:
+        """Get the fields that uniquely identify an object of the model.
+
+        The first constraint created with auto_unique is used, followed by the other
+        unique constraints, unique_together and then fields with unique=True.
+
+        Returns:
+            The names of the fields that uniquely identify an object.
+
+        Raises:
+            `ValueError`: If the model does not have any unique fields besides the
+            primary key.
+        """
+        for fields in unique_field_sets(self.model):
+            return fields
+
+        msg = f"{self.model.__name__} does not have any unique fields."
+        raise ValueError(msg)
+
+    def _upsert_fields(
+        self,
+        update_fields: Iterable[str] | None,
+        unique_fields: Iterable[str] | None,
+    ) -> tuple[list[str], tuple[str, ...]]:
+        """Get the update and unique fields for update_or_new_many.
+
+        Args:
+            update_fields: The requested update fields.
+            unique_fields: The requested unique fields.
+
+        Returns:
+            A tuple containing the update fields and the unique fields.
+        """
+        unique_fields = (
+            self.natural_key_fields() if unique_fields is None else tuple(unique_fields)
+        )
+        if update_fields is None:
+            opts = self.model._meta  # noqa: SLF001 - _meta is public Django API
+            update_fields = [
+                field.name
+                for field in opts.concrete_fields
+                if not field.primary_key and field.name not in unique_fields
+            ]
+        return (list(update_fields), unique_fields)
+
+    @instrumented("update_or_new_many")
+    def update_or_new_many(
+        self,
+        instances: Iterable[_T],
+        update_fields: Iterable[str] | None = None,
+        unique_fields: Iterable[str] | None = None,
+        batch_size: int | None = None,
+    ) -> list[_T]:
+        """Save many objects, updating the objects that already exist.
+
+        This replaces calling get_or_new, modifying the object and then saving it. On
+        databases that support it a single INSERT ... ON CONFLICT DO UPDATE statement
+        is used for every batch so there is no race between checking if an object
+        exists and saving it, on other databases each object is looked up with SELECT
+        ... FOR UPDATE and saved individually inside of a transaction. The lookups
+        always query the database, the get_or_new caches are not used.
+
+        The instances should not contain more than one object with the same unique
+        fields. The saved objects are removed from the get_or_new caches, the
+        INSERT ... ON CONFLICT DO UPDATE statement does not send post_save.
+
+        Args:
+            instances: The unsaved objects to insert or update.
+            update_fields: The fields to update when an object already exists, by
+                default every field that is not a unique field or the primary key.
+            unique_fields: The fields that identify if an object already exists, by
+                default the fields from natural_key_fields are used.
+            batch_size: The maximum number of objects to save in a single query, by
+                default the largest batch size the database supports is used.
+
+        Returns:
+            The saved objects with their primary keys set.
+        """
+        instances = list(instances)
+        if not instances:
+            return []
+
+        update_fields, unique_fields = self._upsert_fields(update_fields, unique_fields)
+        features = connections[self.db].features
+        if update_fields and features.supports_update_conflicts_with_target:
+            instances = self.bulk_create(
+                instances,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+            invalidate_bulk_saved(self.model, instances, self.db)
+            return instances
+
+        with transaction.atomic(using=self.db):
+            for instance in instances:
+                # get_or_new is not used because a stale missing lookup in a cache
+                # would insert an object that already exists
+                existing_pk = (
+                    self.select_for_update()
+                    .filter(
+                        **{field: getattr(instance, field) for field in unique_fields},
+                    )
+                    .values_list("pk", flat=True)
+                    .first()
+                )
+                if existing_pk is None:
+                    instance.save(using=self.db)
+                else:
+                    instance.pk = existing_pk
+                    instance.save(
+                        using=self.db,
+                        force_update=True,
+                        update_fields=update_fields,
+                    )
+        return instances
+
+    @instrumented("aupdate_or_new_many")
+    async def aupdate_or_new_many(
+        self,
+        instances: Iterable[_T],
+        update_fields: Iterable[str] | None = None,
+        unique_fields: Iterable[str] | None = None,
+        batch_size: int | None = None,
+    ) -> list[_T]:
+        """Async version of update_or_new_many.
+
+        The per object fallback for databases that do not support ON CONFLICT needs a
+        transaction so it is run with sync_to_async.
+
+        Args:
+            instances: The unsaved objects to insert or update.
+            update_fields: The fields to update when an object already exists, by
+                default every field that is not a unique field or the primary key.
+            unique_fields: The fields that identify if an object already exists, by
+                default the fields from natural_key_fields are used.
+            batch_size: The maximum number of objects to save in a single query, by
+                default the largest batch size the database supports is used.
+
+        Returns:
+            The saved objects with their primary keys set.
+        """
+        instances = list(instances)
+        if not instances:
+            return []
+
+        update_fields, unique_fields = self._upsert_fields(update_fields, unique_fields)
+        features = connections[self.db].features
+        if update_fields and features.supports_update_conflicts_with_target:
+            instances = await self.abulk_create(
+                instances,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+            await sync_to_async(invalidate_bulk_saved)(self.model, instances, self.db)
+            return instances
+        return await sync_to_async(self.update_or_new_many)(
+            instances,
+            update_fields,
+            unique_fields,
+            batch_size,
+        )
+
+
+class ModelWithGetOrNew(models.Model):
+    """Model template with a get_or_new function."""
+
+    # The types here don't exactly match up, but this implementation is as close
+    # as possible to Django's official example on how to implement something
+    # similar. See: https://docs.djangoproject.com/en/5.0/topics/db/managers/
+    objects: ClassVar[_GetOrNewManager[Self]] = _GetOrNewManager()
+    shared_cache: ClassVar[SharedGetOrNewCache | None] = None
+    """Set to cache get_or_new lookups across processes, see SharedGetOrNewCache."""
+
+    class Meta:  # type: ignore[reportIncompatibleVariableOverride]
+        """Required to make the model abstract."""
+
+        abstract = True  # Required to be able to subclass models.Model
+
+    def save_new_or_refetch(
+        self,
+        merge_fields: Iterable[str] | None = None,
+        using: str | None = None,
+    ) -> tuple[Self, bool]:
+        """Save a new object, or merge it into the object that was saved first.
+
+        This handles two processes both getting created=True from get_or_new for the
+        same lookup and both saving the object. The object is inserted and if the
+        insert violates a unique constraint the object that won the race is fetched,
+        the values of merge_fields are copied onto it and it is saved.
+
+        Outside of a transaction the insert is made directly so there are no extra
+        queries unless the insert fails. Inside of a transaction the insert is wrapped
+        in a savepoint so that a failed insert does not break the transaction.
+
+        Args:
+            merge_fields: The fields to copy onto the existing object, defaults to every
+                field besides the primary key.
+            using: The database alias to save to.
+
+        Returns:
+            A tuple containing the saved object and a boolean representing if the
+            object was created, if the object was not created the saved object is the
+            existing object.
+
+        Raises:
+            `IntegrityError`: If the insert failed for a reason other than a unique
+            constraint, or the existing object was deleted before it could be fetched.
+        """
+        using = using or router.db_for_write(type(self), instance=self)
+        if not self._state.adding:
+            self.save(using=using)
+            return (self, False)
+
+        try:
+            if connections[using].in_atomic_block:
+                with transaction.atomic(using=using):
+                    self.save(using=using, force_insert=True)
+            else:
+                self.save(using=using, force_insert=True)
+        except IntegrityError:
+            existing = self._get_conflicting(using)
+            if existing is None:
+                raise
+        else:
+            return (self, True)
+
+        opts = self._meta
+        if merge_fields is None:
+            merge_fields = [
+                field.name for field in opts.concrete_fields if not field.primary_key
+            ]
+        merge_fields = list(merge_fields)
+        for field_name in merge_fields:
+            attname = opts.get_field(field_name).attname  # type: ignore[reportAttributeAccessIssue]
+            setattr(existing, attname, getattr(self, attname))
+        if merge_fields:
+            existing.save(using=using, update_fields=merge_fields)
+        return (existing, False)
+
+    def _get_conflicting(self, using: str) -> Self | None:
+        """Get the saved object that has the same unique values as this object.
+
+        Args:
+            using: The database alias to search.
+
+        Returns:
+            The conflicting object, or None if there isn't one.
+        """
+        lookups: list[models.Q] = []
+        for field_names in unique_field_sets(type(self)):
+            attnames = [self._meta.get_field(name).attname for name in field_names]  # type: ignore[reportAttributeAccessIssue]
+            values = {attname: getattr(self, attname) for attname in attnames}
+            # NULL values never conflict with each other
+            if None not in values.values():
+                lookups.append(models.Q(**values))
+        if not lookups:
+            return None
+        return (
+            type(self)
+            .objects.using(using)
+            .filter(reduce(operator.or_, lookups))
+            .first()
+        )
+
+
+# The manager and queryset of every abstract model that defines objects, used to give
+# models that subclass several of them a manager with the methods of all of them
+_MIXIN_MANAGERS: tuple[
+    tuple[type[models.Model], type[models.Manager], type[models.QuerySet]],
+    ...,
+] = (
+    (ModelWithGetOrNew, _GetOrNewManager, models.QuerySet),
+    (ModelWithTimestampsAndFunctions, _TimestampsManager, _TimestampsQuerySet),
+    (ModelWithTimestampsAndUpdateAt, _UpdateAtManager, _UpdateAtQuerySet),
+)
+
+
+@cache
+def _combined_manager(
+    manager_classes: tuple[type[models.Manager], ...],
+    queryset_classes: tuple[type[models.QuerySet], ...],
+) -> type[models.Manager]:
+    """Create a manager class that combines several managers and their querysets.
+
+    Args:
+        manager_classes: The managers to combine, earlier managers take precedence.
+        queryset_classes: The querysets the managers use.
+
+    Returns:
+        The combined manager class, the same classes always return the same class.
+    """
+    # QuerySet is a base of the other querysets so it can only come last
+    queryset_bases = tuple(
+        queryset_class
+        for queryset_class in dict.fromkeys(queryset_classes)
+        if queryset_class is not models.QuerySet
+    ) or (models.QuerySet,)
+    queryset_class = type("_CombinedQuerySet", queryset_bases, {})
+
+    def get_queryset(self: models.Manager) -> models.QuerySet:
+        return queryset_class(self.model, using=self._db)
+
+    return type("_CombinedManager", manager_classes, {"get_queryset": get_queryset})
+
+
+def _combine_managers(
+    sender: type[models.Model],
+    **kwargs: object,  # noqa: ARG001 - Required by the signal
+) -> None:
+    """Give a model that subclasses several of the abstract models a combined manager.
+
+    Django only inherits the first manager named objects, so without this a model
+    that subclasses ModelWithGetOrNew and ModelWithTimestampsAndFunctions would not
+    have the timestamp methods on objects. Models that define objects are not changed.
+    """
+    opts = sender._meta  # noqa: SLF001 - _meta is public Django API
+    if any(manager.name == "objects" for manager in opts.local_managers):
+        return
+    mixins = sorted(
+        (
+            (mixin, manager_class, queryset_class)
+            for mixin, manager_class, queryset_class in _MIXIN_MANAGERS
+            if issubclass(sender, mixin)
+        ),
+        key=lambda item: sender.__mro__.index(item[0]),
+    )
+    if len(mixins) > 1:
+        manager_class = _combined_manager(
+            tuple(manager_class for _mixin, manager_class, _queryset in mixins),
+            tuple(queryset_class for _mixin, _manager, queryset_class in mixins),
+        )
+        sender.add_to_class("objects", manager_class())
+
+
+class_prepared.connect(_combine_managers, dispatch_uid="great_django_family.models")
+
+
+def _connect_cache_invalidation(
+    sender: type[models.Model],
+    **kwargs: object,  # noqa: ARG001 - Required by the signal
+) -> None:
+    """Keep the caches up to date for models that subclass ModelWithGetOrNew.
+
+    Other models are not given post_save and post_delete receivers, so their deletes
+    can still use the fast delete of QuerySet.delete.
+    """
+    if issubclass(sender, ModelWithGetOrNew):
+        connect_invalidation(sender)
+
+
+class_prepared.connect(
+    _connect_cache_invalidation,
+    dispatch_uid="great_django_family.models.cache",
+)
+
+
+def resolve_graph(
+    lookups: Mapping[
+        type[ModelWithGetOrNew],
+        Iterable[_Lookup | tuple[object, ...]]
+        | Callable[[], Iterable[_Lookup | tuple[object, ...]]],
+    ],
+    batch_size: int | None = None,
+) -> GetOrNewCache:
+    """Resolve the lookups of several models with one query per model.
+
+    The models are warmed in order with warm, so the lookups of a model can refer to
+    objects of the models before it. When the lookups are a function it is called
+    after the models before it are warmed, so it can use get_or_new for those models
+    without making any queries:
+
+        with resolve_graph({
+            Series: [("name",)],
+            Episode: lambda: [
+                {"series": Series.objects.get_or_new(name="name")[0], "number": 1},
+            ],
+        }):
+            series, _created = Series.objects.get_or_new(name="name")
+            episode, _created = Episode.objects.get_or_new(series=series, number=1)
+
+    Lookups that refer to an unsaved object are cached as missing without a query.
+
+    Args:
+        lookups: The lookups of every model, in the order the models are resolved.
+        batch_size: The maximum number of lookups to include in a single query.
+
+    Returns:
+        The active GetOrNewCache, or a new cache if no cache is active. Use the cache
+        as a context manager to make the resolved lookups available to get_or_new.
+    """
+    cache = get_active_cache()
+    if cache is None:
+        cache = GetOrNewCache()
+    with cache:
+        for model, model_lookups in lookups.items():
+            model.objects.warm(
+                model_lookups() if callable(model_lookups) else model_lookups,
+                batch_size,
+            )
+    return cache
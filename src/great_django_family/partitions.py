@@ -0,0 +1,380 @@
+"""Time based partitioning of the tables of models with timestamps.
+
+Partitioning is enabled for a model by setting its partitioning attribute:
+
+    class Episode(ModelWithTimestamps):
+        partitioning = TimestampPartitioning(interval="month", premake=3, retain=12)
+
+On PostgreSQL, if the table of the model is a partitioned table created with
+PARTITION BY RANGE (info_timestamp), maintain_partitions creates a partition for the
+current interval and the next premake intervals, and detaches the partitions that
+are older than retain intervals. Detached partitions are kept as regular tables so
+they can be archived or dropped. Django can not create a partitioned table so the
+table has to be converted with a RunSQL migration. PostgreSQL requires the partition
+key to be part of the primary key, so the primary key must include info_timestamp.
+
+On every other database, and on PostgreSQL tables that are not partitioned, rows
+older than retain intervals are moved into an archive table with the same columns
+named <table>_archive. This keeps the main table small without partitioning.
+
+The manage_partitions management command runs maintain_partitions for every model
+with partitioning enabled. The command is only available when great_django_family is
+in INSTALLED_APPS.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Literal
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from django.db import models
+    from django.db.backends.base.base import BaseDatabaseWrapper
+
+Interval = Literal["day", "week", "month"]
+
+_INTERVALS: tuple[Interval, ...] = ("day", "week", "month")
+_MONTHS_PER_YEAR = 12
+_NAME_FORMAT = "%Y%m%d"
+
+
+@dataclass(frozen=True)
+class TimestampPartitioning:
+    """Partitioning of the table of a model by info_timestamp."""
+
+    interval: Interval = "month"
+    """The length of time each partition covers."""
+    premake: int = 3
+    """The number of partitions to create ahead of the current interval."""
+    retain: int | None = None
+    """The number of intervals before the current interval to keep, older data is
+    detached or archived. If None the data is never detached or archived."""
+
+    def __post_init__(self) -> None:
+        """Validate the options.
+
+        Raises:
+            `ValueError`: If the interval is not supported or a count is negative.
+        """
+        if self.interval not in _INTERVALS:
+            msg = f"interval must be one of {_INTERVALS}, not {self.interval!r}."
+            raise ValueError(msg)
+        if self.premake < 0 or (self.retain is not None and self.retain < 0):
+            msg = "premake and retain can not be negative."
+            raise ValueError(msg)
+
+
+@dataclass
+class PartitionReport:
+    """The changes made by maintain_partitions."""
+
+    created: list[str] = field(default_factory=list)
+    """The partitions that were created."""
+    detached: list[str] = field(default_factory=list)
+    """The partitions that were detached."""
+    archived_rows: int = 0
+    """The number of rows that were moved into the archive table."""
+
+
+def bucket_start(timestamp: datetime, interval: Interval) -> datetime:
+    """Get the start of the interval that contains a timestamp.
+
+    Intervals are calculated in UTC, weeks start on Monday.
+
+    Args:
+        timestamp: The timestamp.
+        interval: The length of the interval.
+
+    Returns:
+        The start of the interval.
+    """
+    start = timestamp.astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        return start - timedelta(days=start.weekday())
+    if interval == "month":
+        return start.replace(day=1)
+    return start
+
+
+def shift_bucket(start: datetime, interval: Interval, count: int) -> datetime:
+    """Get the start of the interval count intervals after another interval.
+
+    Args:
+        start: The start of an interval.
+        interval: The length of the interval.
+        count: The number of intervals to move, negative values move backwards.
+
+    Returns:
+        The start of the shifted interval.
+    """
+    if interval == "month":
+        years, month = divmod(start.month - 1 + count, _MONTHS_PER_YEAR)
+        return start.replace(year=start.year + years, month=month + 1)
+    days = 7 if interval == "week" else 1
+    return start + timedelta(days=days * count)
+
+
+def partition_name(model: type[models.Model], start: datetime) -> str:
+    """Get the name of the partition of a model that starts at a timestamp.
+
+    Args:
+        model: The model.
+        start: The start of the interval of the partition.
+
+    Returns:
+        The name of the partition.
+    """
+    return f"{model._meta.db_table}_p{start.strftime(_NAME_FORMAT)}"  # noqa: SLF001 - _meta is public Django API
+
+
+def get_partitioning(model: type[models.Model]) -> TimestampPartitioning | None:
+    """Get the partitioning of a model.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The partitioning, or None if partitioning is not enabled for the model.
+    """
+    partitioning = getattr(model, "partitioning", None)
+    if isinstance(partitioning, TimestampPartitioning):
+        return partitioning
+    return None
+
+
+def is_partitioned(model: type[models.Model], using: str) -> bool:
+    """Check if the table of a model is a PostgreSQL partitioned table.
+
+    Args:
+        model: The model.
+        using: The database alias.
+
+    Returns:
+        True if the table is partitioned.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table JOIN pg_class "
+            "ON pg_class.oid = pg_partitioned_table.partrelid "
+            "WHERE pg_class.relname = %s AND pg_table_is_visible(pg_class.oid)",
+            [model._meta.db_table],  # noqa: SLF001 - _meta is public Django API
+        )
+        return cursor.fetchone() is not None
+
+
+def maintain_partitions(
+    model: type[models.Model],
+    now: datetime | None = None,
+    using: str | None = None,
+) -> PartitionReport:
+    """Create upcoming partitions and detach or archive old data for a model.
+
+    Args:
+        model: The model, partitioning must be enabled for the model.
+        now: The current time, defaults to the current time.
+        using: The database alias, defaults to the database the model is written to.
+
+    Returns:
+        The changes that were made.
+
+    Raises:
+        `ValueError`: If partitioning is not enabled for the model.
+    """
+    partitioning = get_partitioning(model)
+    if partitioning is None:
+        msg = f"Partitioning is not enabled for {model.__name__}."
+        raise ValueError(msg)
+
+    using = using or router.db_for_write(model)
+    current = bucket_start(now or timezone.now(), partitioning.interval)
+    cutoff = None
+    if partitioning.retain is not None:
+        cutoff = shift_bucket(current, partitioning.interval, -partitioning.retain)
+
+    report = PartitionReport()
+    if is_partitioned(model, using):
+        report.created = _create_partitions(model, using, partitioning, current)
+        if cutoff is not None:
+            report.detached = _detach_partitions(model, using, partitioning, cutoff)
+    elif cutoff is not None:
+        report.archived_rows = _archive_rows(model, using, cutoff)
+    return report
+
+
+def _create_partitions(
+    model: type[models.Model],
+    using: str,
+    partitioning: TimestampPartitioning,
+    current: datetime,
+) -> list[str]:
+    """Create the partitions for the current and upcoming intervals.
+
+    Args:
+        model: The model.
+        using: The database alias.
+        partitioning: The partitioning of the model.
+        current: The start of the current interval.
+
+    Returns:
+        The names of the partitions that did not exist and were created.
+
+    Raises:
+        `ValueError`: If a partition name is too long for the database.
+    """
+    connection = connections[using]
+    existing = _partition_names(model, connection)
+    created: list[str] = []
+    table = connection.ops.quote_name(model._meta.db_table)  # noqa: SLF001 - _meta is public Django API
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for offset in range(partitioning.premake + 1):
+            start = shift_bucket(current, partitioning.interval, offset)
+            name = partition_name(model, start)
+            if name in existing:
+                continue
+            if len(name) > connection.ops.max_name_length():
+                msg = f"The partition name {name} is too long."
+                raise ValueError(msg)
+            end = shift_bucket(start, partitioning.interval, 1)
+            # Bounds are literals because PostgreSQL does not allow parameters in DDL,
+            # isoformat only contains digits and separators.
+            cursor.execute(
+                f"CREATE TABLE {connection.ops.quote_name(name)} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')",
+            )
+            created.append(name)
+    return created
+
+
+def _detach_partitions(
+    model: type[models.Model],
+    using: str,
+    partitioning: TimestampPartitioning,
+    cutoff: datetime,
+) -> list[str]:
+    """Detach the partitions that end before a cutoff.
+
+    Only partitions named by partition_name are detached.
+
+    Args:
+        model: The model.
+        using: The database alias.
+        partitioning: The partitioning of the model.
+        cutoff: The start of the oldest interval to keep.
+
+    Returns:
+        The names of the partitions that were detached.
+    """
+    connection = connections[using]
+    prefix = partition_name(model, cutoff)[: -len(cutoff.strftime(_NAME_FORMAT))]
+    table = connection.ops.quote_name(model._meta.db_table)  # noqa: SLF001 - _meta is public Django API
+    detached: list[str] = []
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for name in sorted(_partition_names(model, connection)):
+            if not name.startswith(prefix):
+                continue
+            try:
+                start = datetime.strptime(
+                    name.removeprefix(prefix),
+                    _NAME_FORMAT,
+                ).replace(tzinfo=UTC)
+            except ValueError:
+                continue
+            if shift_bucket(start, partitioning.interval, 1) > cutoff:
+                continue
+            partition = connection.ops.quote_name(name)
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {partition}")
+            detached.append(name)
+    return detached
+
+
+def _partition_names(
+    model: type[models.Model],
+    connection: BaseDatabaseWrapper,
+) -> set[str]:
+    """Get the names of the partitions of a PostgreSQL partitioned table.
+
+    Args:
+        model: The model.
+        connection: The database connection.
+
+    Returns:
+        The names of the partitions.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)",
+            [model._meta.db_table],  # noqa: SLF001 - _meta is public Django API
+        )
+        return {name for (name,) in cursor.fetchall()}
+
+
+def _archive_rows(model: type[models.Model], using: str, cutoff: datetime) -> int:
+    """Move the rows older than a cutoff into the archive table of a model.
+
+    The rows are moved with raw SQL so signals are not sent and rows that are
+    referenced by a foreign key can not be moved. On PostgreSQL the rows are deleted
+    and inserted into the archive table by a single statement. On other databases the
+    primary keys of the rows are selected first, locked if the database supports it,
+    and only those rows are copied and deleted. Either way a row that is inserted
+    while the rows are moved is never deleted without being archived.
+
+    Args:
+        model: The model.
+        using: The database alias.
+        cutoff: The rows with an info_timestamp before the cutoff are moved.
+
+    Returns:
+        The number of rows that were moved.
+    """
+    connection = connections[using]
+    opts = model._meta  # noqa: SLF001 - _meta is public Django API
+    quote_name = connection.ops.quote_name
+    table = quote_name(opts.db_table)
+    archive = quote_name(f"{opts.db_table}_archive")
+    columns = ", ".join(quote_name(column.column) for column in opts.concrete_fields)
+    timestamp_field = opts.get_field("info_timestamp")
+    where = f"{quote_name(timestamp_field.column)} < %s"  # type: ignore[reportAttributeAccessIssue]
+    params = [timestamp_field.get_db_prep_value(cutoff, connection)]  # type: ignore[reportAttributeAccessIssue]
+
+    # The identifiers are quoted with quote_name and the values are parameters
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {archive} AS "  # noqa: S608
+            f"SELECT {columns} FROM {table} WHERE 1 = 0",
+        )
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {table} WHERE {where} "  # noqa: S608
+                f"RETURNING {columns}) "
+                f"INSERT INTO {archive} ({columns}) SELECT {columns} FROM moved",
+                params,
+            )
+            return cursor.rowcount
+
+        pk = quote_name(opts.pk.column)  # type: ignore[reportOptionalMemberAccess]
+        lock = " FOR UPDATE" if connection.features.has_select_for_update else ""
+        cursor.execute(f"SELECT {pk} FROM {table} WHERE {where}{lock}", params)  # noqa: S608
+        pks = [row_pk for (row_pk,) in cursor.fetchall()]
+        batch_size = max(connection.ops.bulk_batch_size([opts.pk], pks), 1)
+        moved = 0
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start : start + batch_size]
+            in_batch = f"{pk} IN ({', '.join(['%s'] * len(batch))})"
+            cursor.execute(
+                f"INSERT INTO {archive} ({columns}) "  # noqa: S608
+                f"SELECT {columns} FROM {table} WHERE {in_batch}",
+                batch,
+            )
+            cursor.execute(f"DELETE FROM {table} WHERE {in_batch}", batch)  # noqa: S608
+            moved += cursor.rowcount
+        return moved
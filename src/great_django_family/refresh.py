@@ -0,0 +1,390 @@
+"""Refresh outdated rows of models with timestamps.
+
+refresh_outdated_in_processes runs refresh batches in worker processes. The workers
+are spawned instead of forked and unpickle the functions of this module before Django
+is set up in the worker, so this module must not import models at import time.
+
+The refresh_stale management command runs refresh_outdated_in_processes and the
+stale_report command counts the outdated rows, both commands are only available when
+great_django_family is in INSTALLED_APPS.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, TypeVar
+
+import django
+from django.apps import apps
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from .models import ModelWithTimestampsAndFunctions
+
+_M = TypeVar("_M", bound="ModelWithTimestampsAndFunctions")
+
+
+@dataclass
+class RefreshStats:
+    """Statistics for a refresh of the outdated rows of a model."""
+
+    rows: int = 0
+    """The number of rows that were refreshed."""
+    seconds: float = 0.0
+    """The total wall time of the refresh."""
+    batch_seconds: list[float] = field(default_factory=list)
+    """The wall time of every batch, measured in the process that ran the batch."""
+
+    @property
+    def batches(self) -> int:
+        """The number of batches that were run."""
+        return len(self.batch_seconds)
+
+    @property
+    def rows_per_second(self) -> float:
+        """The number of rows refreshed per second of wall time."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def batch_percentile(self, percentile: float) -> float:
+        """Get a percentile of the batch wall times with the nearest rank method.
+
+        Args:
+            percentile: The percentile between 0 and 100.
+
+        Returns:
+            The batch wall time at the percentile, 0 if no batches were run.
+        """
+        if not self.batch_seconds:
+            return 0.0
+        ordered = sorted(self.batch_seconds)
+        rank = math.ceil(percentile / 100 * len(ordered))
+        return ordered[max(rank, 1) - 1]
+
+
+def refresh_outdated(  # noqa: PLR0913 - The arguments are all independent options
+    model: type[_M],
+    fetch: Callable[[_M], datetime],
+    minimum_info_timestamp: datetime | None = None,
+    minimum_modified_timestamp: datetime | None = None,
+    *,
+    chunk_size: int = 2000,
+    max_workers: int = 8,
+    max_in_flight: int | None = None,
+    batch_size: int = 500,
+) -> int:
+    """Refresh every outdated row of a model.
+
+    Outdated rows are streamed from the database with iterator so only chunk_size rows
+    are loaded at a time. Each row is passed to fetch on a thread pool, fetch should
+    update the fields of the row in place and return the timestamp of when the
+    information was obtained. Refreshed rows are given timestamps with add_timestamps
+    and saved in batches with bulk_save on the calling thread.
+
+    fetch runs on worker threads so it should not use the database, this allows
+    network requests made by fetch to overlap with the database writes.
+
+    Args:
+        model: The model to refresh.
+        fetch: The function that refreshes a single row.
+        minimum_info_timestamp: The minimum info_timestamp required for the data to
+            be considered up to date.
+        minimum_modified_timestamp: The minimum info_modified_timestamp that is
+            required for the data to be considered up to date.
+        chunk_size: The number of rows to fetch from the database at a time.
+        max_workers: The number of threads to run fetch on.
+        max_in_flight: The maximum number of rows that are being fetched or waiting to
+            be fetched at a time, defaults to twice max_workers.
+        batch_size: The number of refreshed rows to save at a time.
+
+    Returns:
+        The number of rows that were refreshed.
+    """
+    rows = (
+        model.timestamps_queryset()
+        .outdated(
+            minimum_info_timestamp,
+            minimum_modified_timestamp,
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    max_in_flight = max_in_flight or max_workers * 2
+
+    in_flight: dict[Future[datetime], _M] = {}
+    refreshed: list[_M] = []
+    saved = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for row in rows:
+                if len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    refreshed.extend(_add_timestamps(done, in_flight))
+                if len(refreshed) >= batch_size:
+                    saved += _save(model, refreshed)
+                    refreshed = []
+                in_flight[executor.submit(fetch, row)] = row
+
+            refreshed.extend(_add_timestamps(wait(in_flight).done, in_flight))
+            saved += _save(model, refreshed)
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+    return saved
+
+
+def _add_timestamps(
+    done: Iterable[Future[datetime]],
+    in_flight: dict[Future[datetime], _M],
+) -> list[_M]:
+    """Add timestamps to the rows whose fetch has finished.
+
+    Args:
+        done: The finished futures.
+        in_flight: The rows that are being fetched, finished rows are removed.
+
+    Returns:
+        The rows that finished.
+    """
+    modified_timestamp = datetime.now().astimezone()
+    finished: list[_M] = []
+    for future in done:
+        row = in_flight.pop(future)
+        row.add_timestamps(future.result(), modified_timestamp)
+        finished.append(row)
+    return finished
+
+
+def _save(model: type[_M], rows: list[_M]) -> int:
+    """Save refreshed rows.
+
+    Args:
+        model: The model of the rows.
+        rows: The rows to save.
+
+    Returns:
+        The number of rows that were saved.
+    """
+    _created, updated = model.bulk_save(rows)
+    return updated
+
+
+def refresh_outdated_in_processes(  # noqa: PLR0913 - The arguments are all independent options
+    model: type[_M],
+    fetch: Callable[[_M], datetime],
+    minimum_info_timestamp: datetime | None = None,
+    minimum_modified_timestamp: datetime | None = None,
+    *,
+    processes: int = 4,
+    batch_size: int = 500,
+    max_in_flight: int | None = None,
+) -> RefreshStats:
+    """Refresh every outdated row of a model in batches on worker processes.
+
+    The primary keys of the outdated rows are fetched in batches of batch_size with
+    keyset pagination and sent to the workers. Each worker loads the rows of a batch
+    that are still outdated, calls fetch on them one at a time and saves them with
+    bulk_save. This is useful when fetch is CPU bound, refresh_outdated is usually
+    faster when fetch waits on the network.
+
+    The workers are spawned and set up Django themselves, so every worker has its own
+    database connection and fetch can use the database. fetch must be importable by
+    the workers, for example a function defined at the top level of a module, and it
+    should update the fields of the row in place and return the timestamp of when the
+    information was obtained.
+
+    Args:
+        model: The model to refresh.
+        fetch: The function that refreshes a single row.
+        minimum_info_timestamp: The minimum info_timestamp required for the data to
+            be considered up to date.
+        minimum_modified_timestamp: The minimum info_modified_timestamp that is
+            required for the data to be considered up to date.
+        processes: The number of worker processes, if 0 the batches are run in the
+            calling process.
+        batch_size: The number of rows in each batch.
+        max_in_flight: The maximum number of batches that are being run or waiting to
+            be run at a time, defaults to twice processes.
+
+    Returns:
+        The statistics of the refresh.
+    """
+    start = time.perf_counter()
+    batches = _outdated_pk_batches(
+        model,
+        minimum_info_timestamp,
+        minimum_modified_timestamp,
+        batch_size,
+    )
+    label = model._meta.label  # noqa: SLF001 - _meta is public Django API
+
+    stats = RefreshStats()
+    if processes == 0:
+        for batch in batches:
+            rows, seconds = _refresh_batch(
+                label,
+                batch,
+                fetch,
+                minimum_info_timestamp,
+                minimum_modified_timestamp,
+            )
+            stats.rows += rows
+            stats.batch_seconds.append(seconds)
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    max_in_flight = max_in_flight or processes * 2
+    in_flight: set[Future[tuple[int, float]]] = set()
+    with _process_pool(processes) as executor:
+        try:
+            for batch in batches:
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    _add_batch_stats(stats, done)
+                in_flight.add(
+                    executor.submit(
+                        _refresh_batch,
+                        label,
+                        batch,
+                        fetch,
+                        minimum_info_timestamp,
+                        minimum_modified_timestamp,
+                    ),
+                )
+            _add_batch_stats(stats, wait(in_flight).done)
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def _outdated_pk_batches(
+    model: type[_M],
+    minimum_info_timestamp: datetime | None,
+    minimum_modified_timestamp: datetime | None,
+    batch_size: int,
+) -> Iterator[list[object]]:
+    """Get the primary keys of the outdated rows in batches.
+
+    Every batch is fetched with pk__gt the last primary key of the previous batch, so
+    no cursor is kept open while the workers write to the table. A cursor that stays
+    open would hold a lock that prevents the workers from committing on SQLite.
+
+    Args:
+        model: The model.
+        minimum_info_timestamp: The minimum info_timestamp required for the data to
+            be considered up to date.
+        minimum_modified_timestamp: The minimum info_modified_timestamp that is
+            required for the data to be considered up to date.
+        batch_size: The number of primary keys in each batch.
+
+    Yields:
+        Lists of up to batch_size primary keys in ascending order.
+    """
+    queryset = (
+        model.timestamps_queryset()
+        .outdated(minimum_info_timestamp, minimum_modified_timestamp)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    last_pk = None
+    while True:
+        batch_queryset = (
+            queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        )
+        batch = list(batch_queryset[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1]
+
+
+def _process_pool(processes: int) -> Executor:
+    """Create the pool of worker processes for refresh_outdated_in_processes.
+
+    Forked workers would share the database connections of the parent process, so the
+    workers are spawned and set up Django with _setup_worker.
+
+    Args:
+        processes: The number of worker processes.
+
+    Returns:
+        The process pool.
+    """
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_setup_worker,
+    )
+
+
+def _setup_worker() -> None:
+    """Set up Django in a worker process."""
+    django.setup()
+
+
+def _add_batch_stats(
+    stats: RefreshStats,
+    done: Iterable[Future[tuple[int, float]]],
+) -> None:
+    """Add the results of finished batches to the statistics.
+
+    Args:
+        stats: The statistics to add to.
+        done: The finished batches.
+    """
+    for future in done:
+        rows, seconds = future.result()
+        stats.rows += rows
+        stats.batch_seconds.append(seconds)
+
+
+def _refresh_batch(
+    label: str,
+    pks: list[object],
+    fetch: Callable[[_M], datetime],
+    minimum_info_timestamp: datetime | None,
+    minimum_modified_timestamp: datetime | None,
+) -> tuple[int, float]:
+    """Refresh a batch of rows, the rows that are no longer outdated are skipped.
+
+    Args:
+        label: The label of the model, models can not be sent to worker processes.
+        pks: The primary keys of the rows.
+        fetch: The function that refreshes a single row.
+        minimum_info_timestamp: The minimum info_timestamp required for the data to
+            be considered up to date.
+        minimum_modified_timestamp: The minimum info_modified_timestamp that is
+            required for the data to be considered up to date.
+
+    Returns:
+        A tuple containing the number of rows that were refreshed and the wall time of
+        the batch.
+    """
+    start = time.perf_counter()
+    model: type[_M] = apps.get_model(label)  # type: ignore[reportAssignmentType]
+    rows = list(
+        model.timestamps_queryset()
+        .outdated(
+            minimum_info_timestamp,
+            minimum_modified_timestamp,
+        )
+        .filter(pk__in=pks),
+    )
+    info_timestamps = [fetch(row) for row in rows]
+    modified_timestamp = datetime.now().astimezone()
+    for row, info_timestamp in zip(rows, info_timestamps, strict=True):
+        row.add_timestamps(info_timestamp, modified_timestamp)
+    return (_save(model, rows), time.perf_counter() - start)
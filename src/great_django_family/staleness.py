@@ -0,0 +1,203 @@
+"""Check if many rows are outdated without creating model instances.
+
+These functions have the same semantics as ModelWithTimestampsAndFunctions.is_outdated
+but work on columns of values, for example the columns of:
+
+    Artist.objects.values_list("pk", "info_timestamp", "info_modified_timestamp")
+
+The columns can be lists of datetimes where None is a missing timestamp, or NumPy
+datetime64 arrays where NaT is a missing timestamp. NumPy is optional and is only
+imported when a NumPy array is given.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from itertools import compress
+from typing import TYPE_CHECKING, Any, TypeVar, overload
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import numpy as np
+    from numpy.typing import NDArray
+
+_T = TypeVar("_T")
+
+
+def _is_numpy_array(column: object) -> bool:
+    """Check if a column is a NumPy array without importing NumPy.
+
+    Args:
+        column: The column to check.
+
+    Returns:
+        True if the column is a NumPy array.
+    """
+    return type(column).__module__ == "numpy"
+
+
+def _to_datetime64(timestamp: datetime) -> np.datetime64:
+    """Convert a timestamp to a datetime64 that can be compared with a column.
+
+    datetime64 has no timezone so aware timestamps are converted to UTC, which is how
+    Django stores timestamps when USE_TZ is enabled.
+
+    Args:
+        timestamp: The timestamp to convert.
+
+    Returns:
+        The timestamp as a datetime64.
+    """
+    import numpy as np  # noqa: PLC0415 - NumPy is an optional dependency
+
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(UTC).replace(tzinfo=None)
+    return np.datetime64(timestamp, "us")
+
+
+def _outdated_array(
+    info_timestamps: NDArray[np.datetime64],
+    modified_timestamps: NDArray[np.datetime64],
+    minimum_info_timestamp: datetime | None,
+    minimum_modified_timestamp: datetime | None,
+) -> NDArray[np.bool_]:
+    """Check which rows are outdated using NumPy.
+
+    Args:
+        info_timestamps: The info_timestamp of every row.
+        modified_timestamps: The info_modified_timestamp of every row.
+        minimum_info_timestamp: The minimum info_timestamp required for the data to
+            be considered up to date.
+        minimum_modified_timestamp: The minimum info_modified_timestamp that is
+            required for the data to be considered up to date.
+
+    Returns:
+        A boolean array that is True for every outdated row.
+    """
+    import numpy as np  # noqa: PLC0415 - NumPy is an optional dependency
+
+    info_timestamps = np.asarray(info_timestamps, dtype="datetime64[us]")
+    modified_timestamps = np.asarray(modified_timestamps, dtype="datetime64[us]")
+    # If no timestamp is present the information has to be outdated
+    outdated = np.isnat(info_timestamps) | np.isnat(modified_timestamps)
+    if minimum_info_timestamp:
+        outdated |= info_timestamps < _to_datetime64(minimum_info_timestamp)
+    if minimum_modified_timestamp:
+        outdated |= modified_timestamps < _to_datetime64(minimum_modified_timestamp)
+    return outdated
+
+
+@overload
+def outdated_mask(
+    info_timestamps: NDArray[np.datetime64],
+    modified_timestamps: NDArray[np.datetime64],
+    minimum_info_timestamp: datetime | None = None,
+    minimum_modified_timestamp: datetime | None = None,
+) -> NDArray[np.bool_]: ...
+
+
+@overload
+def outdated_mask(
+    info_timestamps: Sequence[datetime | None],
+    modified_timestamps: Sequence[datetime | None],
+    minimum_info_timestamp: datetime | None = None,
+    minimum_modified_timestamp: datetime | None = None,
+) -> list[bool]: ...
+
+
+def outdated_mask(
+    info_timestamps: Sequence[datetime | None] | NDArray[np.datetime64],
+    modified_timestamps: Sequence[datetime | None] | NDArray[np.datetime64],
+    minimum_info_timestamp: datetime | None = None,
+    minimum_modified_timestamp: datetime | None = None,
+) -> list[bool] | NDArray[np.bool_]:
+    """Check which rows are outdated.
+
+    Args:
+        info_timestamps: The info_timestamp of every row.
+        modified_timestamps: The info_modified_timestamp of every row.
+        minimum_info_timestamp: The minimum info_timestamp required for the data to
+            be considered up to date.
+        minimum_modified_timestamp: The minimum info_modified_timestamp that is
+            required for the data to be considered up to date.
+
+    Returns:
+        A mask that is True for every outdated row, a NumPy array if either column is
+        a NumPy array and a list otherwise.
+
+    Raises:
+        ValueError: If the columns have different lengths.
+    """
+    if len(info_timestamps) != len(modified_timestamps):
+        msg = "The timestamp columns must have the same length."
+        raise ValueError(msg)
+
+    if _is_numpy_array(info_timestamps) or _is_numpy_array(modified_timestamps):
+        return _outdated_array(
+            info_timestamps,  # type: ignore[reportArgumentType]
+            modified_timestamps,  # type: ignore[reportArgumentType]
+            minimum_info_timestamp,
+            minimum_modified_timestamp,
+        )
+
+    # Falsy minimums are ignored the same way is_up_to_date ignores them
+    minimum_info_timestamp = minimum_info_timestamp or None
+    minimum_modified_timestamp = minimum_modified_timestamp or None
+    return [
+        info_timestamp is None
+        or modified_timestamp is None
+        or (
+            minimum_info_timestamp is not None
+            and info_timestamp < minimum_info_timestamp
+        )
+        or (
+            minimum_modified_timestamp is not None
+            and modified_timestamp < minimum_modified_timestamp
+        )
+        for info_timestamp, modified_timestamp in zip(
+            info_timestamps,
+            modified_timestamps,
+            strict=True,
+        )
+    ]
+
+
+def outdated_pks(
+    pks: Sequence[_T] | NDArray[Any],
+    info_timestamps: Sequence[datetime | None] | NDArray[np.datetime64],
+    modified_timestamps: Sequence[datetime | None] | NDArray[np.datetime64],
+    minimum_info_timestamp: datetime | None = None,
+    minimum_modified_timestamp: datetime | None = None,
+) -> list[_T] | NDArray[Any]:
+    """Get the primary keys of the outdated rows.
+
+    Args:
+        pks: The primary key of every row.
+        info_timestamps: The info_timestamp of every row.
+        modified_timestamps: The info_modified_timestamp of every row.
+        minimum_info_timestamp: The minimum info_timestamp required for the data to
+            be considered up to date.
+        minimum_modified_timestamp: The minimum info_modified_timestamp that is
+            required for the data to be considered up to date.
+
+    Returns:
+        The primary keys of the outdated rows in their original order, a NumPy array
+        if pks is a NumPy array and a list otherwise.
+
+    Raises:
+        ValueError: If the columns have different lengths.
+    """
+    if len(pks) != len(info_timestamps):
+        msg = "The primary key and timestamp columns must have the same length."
+        raise ValueError(msg)
+
+    mask = outdated_mask(
+        info_timestamps,  # type: ignore[reportArgumentType]
+        modified_timestamps,  # type: ignore[reportArgumentType]
+        minimum_info_timestamp,
+        minimum_modified_timestamp,
+    )
+    if _is_numpy_array(pks):
+        return pks[mask]  # type: ignore[reportIndexIssue]
+    return list(compress(pks, mask))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("test_app", "0005_implementedmodelwithtimestamps"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImplementedUniqueGetOrNew",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("value", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("name",), name="UQ_ImplementedUniqueGetOrNew_name"
+                    )
+                ],
+            },
+        ),
+    ]
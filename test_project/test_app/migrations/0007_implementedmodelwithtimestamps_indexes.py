@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("test_app", "0006_implementeduniquegetornew"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="implementedmodelwithtimestamps",
+            index=models.Index(
+                fields=["info_timestamp", "info_modified_timestamp"],
+                name="IX_ImplementedModelWi_712ee607",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="implementedmodelwithtimestamps",
+            index=models.Index(
+                fields=["info_modified_timestamp"],
+                name="IX_ImplementedModelWi_8e5aec65",
+            ),
+        ),
+    ]
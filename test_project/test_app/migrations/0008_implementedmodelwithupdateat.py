@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("test_app", "0007_implementedmodelwithtimestamps_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImplementedModelWithUpdateAt",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("info_timestamp", models.DateTimeField()),
+                ("info_modified_timestamp", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("name", models.CharField(max_length=100)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["info_timestamp", "info_modified_timestamp"],
+                        name="IX_ImplementedModelWi_200ba1cf",
+                    ),
+                    models.Index(
+                        fields=["info_modified_timestamp"],
+                        name="IX_ImplementedModelWi_ddcf7a53",
+                    ),
+                    models.Index(
+                        fields=["updated_at"], name="IX_ImplementedModelWi_0a134b66"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("test_app", "0008_implementedmodelwithupdateat"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImplementedModelWithChangeTracking",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("info_timestamp", models.DateTimeField()),
+                ("info_modified_timestamp", models.DateTimeField()),
+                ("name", models.CharField(max_length=100)),
+                ("data", models.JSONField(default=None, null=True)),
+            ],
+        ),
+    ]
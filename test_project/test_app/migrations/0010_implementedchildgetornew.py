@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("test_app", "0009_implementedmodelwithchangetracking"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImplementedChildGetOrNew",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.IntegerField()),
+                (
+                    "parent",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="test_app.implementeduniquegetornew",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("parent", "number"),
+                        name="UQ_ImplementedChildGetOrNew_parent-number",
+                    )
+                ],
+            },
+        ),
+    ]
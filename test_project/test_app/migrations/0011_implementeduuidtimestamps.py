@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:46
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("test_app", "0010_implementedchildgetornew"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImplementedUuidTimestamps",
+            fields=[
+                ("info_timestamp", models.DateTimeField()),
+                ("info_modified_timestamp", models.DateTimeField()),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("test_app", "0011_implementeduuidtimestamps"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImplementedGetOrNewWithTimestamps",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("info_timestamp", models.DateTimeField()),
+                ("info_modified_timestamp", models.DateTimeField()),
+                ("name", models.CharField(max_length=100)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("name",),
+                        name="UQ_ImplementedGetOrNewWithTimestamps_name",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("test_app", "0012_implementedgetornewwithtimestamps"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="implementedgetornew",
+            name="nickname",
+            field=models.CharField(default=None, max_length=100, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("test_app", "0013_implementedgetornew_nickname"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImplementedSharedCacheGetOrNew",
+            fields=[],
+            options={
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("test_app.implementeduniquegetornew",),
+        ),
+    ]
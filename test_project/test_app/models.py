@@ -1,11 +1,18 @@
 """Models for test_app."""
 
+from uuid import uuid4
+
 from django.db import models
 
 from src.great_django_family import (
+    ModelWithChangeTracking,
     ModelWithGetOrNew,
     ModelWithId,
     ModelWithTimestampsAndFunctions,
+    ModelWithTimestampsAndUpdateAt,
+    SharedGetOrNewCache,
+    auto_timestamp_indexes,
+    auto_unique,
 )
 
 
@@ -14,12 +21,25 @@ class ImplementedGetOrNew(ModelWithId, ModelWithGetOrNew):
     """Implemntation of a model using GetOrNew."""
 
     name = models.CharField(max_length=100)
+    nickname = models.CharField(max_length=100, null=True, default=None)  # noqa: DJ001 - NULL is tested
 
     # This is defined just to clear up some false positives from Pylance
     class Meta:  # type: ignore  # noqa: PGH003 - Meta has false positives
         """Meta class for TestGetOrNew."""
 
 
+class ImplementedUniqueGetOrNew(ModelWithId, ModelWithGetOrNew):
+    """Implemntation of a model using GetOrNew with a unique constraint."""
+
+    name = models.CharField(max_length=100)
+    value = models.IntegerField(default=0)
+
+    class Meta:  # type: ignore  # noqa: PGH003 - Meta has false positives
+        """Meta class for ImplementedUniqueGetOrNew."""
+
+        constraints = (auto_unique("name"),)
+
+
 class ImplementedModelWithTimestamps(ModelWithId, ModelWithTimestampsAndFunctions):
     """Implemntation of a model using GetOrNew."""
 
@@ -28,3 +48,78 @@ class ImplementedModelWithTimestamps(ModelWithId, ModelWithTimestampsAndFunction
     # This is defined just to clear up some false positives from Pylance
     class Meta:  # type: ignore  # noqa: PGH003 - Meta has false positives
         """Meta class for TestGetOrNew."""
+
+        indexes = auto_timestamp_indexes()
+
+
+class ImplementedModelWithUpdateAt(ModelWithId, ModelWithTimestampsAndUpdateAt):
+    """Implemntation of a model using ModelWithTimestampsAndUpdateAt."""
+
+    name = models.CharField(max_length=100)
+
+    class Meta:  # type: ignore  # noqa: PGH003 - Meta has false positives
+        """Meta class for ImplementedModelWithUpdateAt."""
+
+        indexes = auto_timestamp_indexes(updated_at=True)
+
+
+class ImplementedModelWithChangeTracking(
+    ModelWithId,
+    ModelWithChangeTracking,
+    ModelWithTimestampsAndFunctions,
+):
+    """Implemntation of a model using ModelWithChangeTracking."""
+
+    name = models.CharField(max_length=100)
+    data = models.JSONField(null=True, default=None)
+
+    class Meta:  # type: ignore  # noqa: PGH003 - Meta has false positives
+        """Meta class for ImplementedModelWithChangeTracking."""
+
+
+class ImplementedChildGetOrNew(ModelWithId, ModelWithGetOrNew):
+    """Implemntation of a model using GetOrNew with a foreign key."""
+
+    parent = models.ForeignKey(ImplementedUniqueGetOrNew, on_delete=models.CASCADE)
+    number = models.IntegerField()
+
+    class Meta:  # type: ignore  # noqa: PGH003 - Meta has false positives
+        """Meta class for ImplementedChildGetOrNew."""
+
+        constraints = (auto_unique("parent", "number"),)
+
+
+class ImplementedUuidTimestamps(ModelWithTimestampsAndFunctions):
+    """Implemntation of a model with timestamps and a primary key with a default."""
+
+    id = models.UUIDField(primary_key=True, default=uuid4)
+    name = models.CharField(max_length=100)
+
+    class Meta:  # type: ignore  # noqa: PGH003 - Meta has false positives
+        """Meta class for ImplementedUuidTimestamps."""
+
+
+class ImplementedGetOrNewWithTimestamps(
+    ModelWithId,
+    ModelWithGetOrNew,
+    ModelWithTimestampsAndFunctions,
+):
+    """Implemntation of a model using GetOrNew and timestamps together."""
+
+    name = models.CharField(max_length=100)
+
+    class Meta:  # type: ignore  # noqa: PGH003 - Meta has false positives
+        """Meta class for ImplementedGetOrNewWithTimestamps."""
+
+        constraints = (auto_unique("name"),)
+
+
+class ImplementedSharedCacheGetOrNew(ImplementedUniqueGetOrNew):
+    """Implemntation of a model using GetOrNew with a SharedGetOrNewCache."""
+
+    shared_cache = SharedGetOrNewCache()
+
+    class Meta:  # type: ignore  # noqa: PGH003 - Meta has false positives
+        """Meta class for ImplementedSharedCacheGetOrNew."""
+
+        proxy = True
@@ -43,7 +43,8 @@ module_parts = __name__.split(".")
 app_name = (
     ".".join(module_parts[1:-1]) + ".test_app" if len(module_parts) > 2 else "test_app"
 )
-INSTALLED_APPS = [*installed_apps, app_name]
+# The package is installed so its management commands can be tested
+INSTALLED_APPS = [*installed_apps, "src.great_django_family", app_name]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
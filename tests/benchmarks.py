@@ -0,0 +1,451 @@
+"""Benchmarks for great-django-family.
+
+Run with: python -m tests.benchmarks [--sizes 1000 10000 ...] [--repeat 3]
+
+Every benchmark runs against an in-memory SQLite test database. Each size is seeded
+from scratch and every measurement is rolled back afterwards, so every repeat starts
+from the same data. The reported time is the fastest of the repeats, which makes the
+results comparable from run to run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import os
+import random
+import time
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import django
+
+# The benchmarks run outside of pytest so Django has to be configured manually, the
+# same settings as pytest.ini are used.
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "test_project.test_project.settings")
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+
+from src.great_django_family import auto_unique, outdated_pks  # noqa: E402
+from test_project.test_app.models import (  # noqa: E402
+    ImplementedGetOrNew,
+    ImplementedModelWithTimestamps,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Fixed timestamps so that every run uses the same data
+CURRENT_TIMESTAMP = datetime(2024, 1, 1, tzinfo=UTC)
+PAST_TIMESTAMP = CURRENT_TIMESTAMP - timedelta(days=1)
+
+DEFAULT_SIZES = (1_000, 10_000)
+HIT_RATIOS = (0.0, 0.5, 1.0)
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """The result of a single benchmark."""
+
+    name: str
+    """The name of the benchmark."""
+    size: int
+    """The number of rows in the table."""
+    operations: int
+    """The number of objects the benchmark processed."""
+    seconds: float
+    """The fastest time of all of the repeats."""
+    queries: int
+    """The number of queries made."""
+    peak_memory: int
+    """The peak memory allocated in bytes."""
+
+    def __str__(self) -> str:
+        """Format the result as a row of the results table.
+
+        Returns:
+            The formatted result.
+        """
+        per_operation = self.seconds / self.operations * 1_000_000
+        return (
+            f"{self.name:<40} {self.size:>9} {self.operations:>9} "
+            f"{self.seconds:>10.4f} {per_operation:>10.2f} {self.queries:>8} "
+            f"{self.peak_memory / 1024:>10.1f}"
+        )
+
+
+HEADER = (
+    f"{'benchmark':<40} {'size':>9} {'ops':>9} {'seconds':>10} {'us/op':>10} "
+    f"{'queries':>8} {'peak KiB':>10}"
+)
+
+
+def _measure(
+    name: str,
+    size: int,
+    operations: int,
+    function: Callable[[], object],
+    repeat: int,
+) -> BenchmarkResult:
+    """Measure the time, query count and peak memory of a function.
+
+    Every run is wrapped in a transaction that is rolled back so the database is the
+    same for every run. Time, queries and memory are measured in separate runs so the
+    measurements do not affect each other.
+
+    Args:
+        name: The name of the benchmark.
+        size: The number of rows in the table.
+        operations: The number of objects the function processes.
+        function: The function to measure.
+        repeat: The number of times to time the function.
+
+    Returns:
+        The result of the benchmark.
+    """
+
+    def run() -> None:
+        with transaction.atomic():
+            function()
+            transaction.set_rollback(True)
+
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    # CaptureQueriesContext only keeps the last 9000 queries so the queries are
+    # counted with an execute wrapper instead.
+    queries = 0
+
+    def count_queries(
+        execute: Callable[..., object],
+        *args: object,
+    ) -> object:
+        nonlocal queries
+        queries += 1
+        return execute(*args)
+
+    with connection.execute_wrapper(count_queries):
+        run()
+
+    tracemalloc.start()
+    try:
+        run()
+        _current, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=name,
+        size=size,
+        operations=operations,
+        seconds=min(timings),
+        queries=queries,
+        peak_memory=peak_memory,
+    )
+
+
+def _seed(size: int) -> None:
+    """Fill the benchmark tables with rows.
+
+    Args:
+        size: The number of rows to create in each table.
+    """
+    ImplementedGetOrNew.objects.bulk_create(
+        (ImplementedGetOrNew(name=str(i)) for i in range(size)),
+        batch_size=10_000,
+    )
+    # Half of the rows are outdated so the staleness benchmarks have work to do
+    ImplementedModelWithTimestamps.objects.bulk_create(
+        (
+            ImplementedModelWithTimestamps(
+                name=str(i),
+                info_timestamp=PAST_TIMESTAMP if i % 2 else CURRENT_TIMESTAMP,
+                info_modified_timestamp=CURRENT_TIMESTAMP,
+            )
+            for i in range(size)
+        ),
+        batch_size=10_000,
+    )
+
+
+def _lookups(size: int, count: int, hit_ratio: float) -> list[dict[str, str]]:
+    """Build lookups where a fixed fraction of them exist.
+
+    Args:
+        size: The number of rows in the table.
+        count: The number of lookups to build.
+        hit_ratio: The fraction of lookups that exist.
+
+    Returns:
+        The lookups in a fixed random order.
+    """
+    hits = int(count * hit_ratio)
+    lookups = [{"name": str(i % size)} for i in range(hits)]
+    lookups += [{"name": f"missing-{i}"} for i in range(count - hits)]
+    random.Random(0).shuffle(lookups)  # noqa: S311 - Only used to order lookups
+    return lookups
+
+
+def benchmark_get_or_new(
+    size: int,
+    repeat: int,
+    sample_size: int,
+) -> list[BenchmarkResult]:
+    """Compare get_or_new with get_or_new_many for different hit ratios.
+
+    Args:
+        size: The number of rows in the table.
+        repeat: The number of times to time each benchmark.
+        sample_size: The maximum number of lookups for the per call benchmarks.
+
+    Returns:
+        The results of the benchmarks.
+    """
+    results: list[BenchmarkResult] = []
+    for hit_ratio in HIT_RATIOS:
+        lookups = _lookups(size, min(size, sample_size), hit_ratio)
+        results.append(
+            _measure(
+                f"get_or_new hit={hit_ratio:.0%}",
+                size,
+                len(lookups),
+                lambda lookups=lookups: [
+                    ImplementedGetOrNew.objects.get_or_new(**lookup)
+                    for lookup in lookups
+                ],
+                repeat,
+            ),
+        )
+
+        lookups = _lookups(size, size, hit_ratio)
+        results.append(
+            _measure(
+                f"get_or_new_many hit={hit_ratio:.0%}",
+                size,
+                len(lookups),
+                lambda lookups=lookups: ImplementedGetOrNew.objects.get_or_new_many(
+                    lookups,
+                ),
+                repeat,
+            ),
+        )
+    return results
+
+
+def benchmark_timestamp_save(
+    size: int,
+    repeat: int,
+    sample_size: int,
+) -> list[BenchmarkResult]:
+    """Compare add_timestamps_and_save with add_timestamps_and_save_many.
+
+    Args:
+        size: The number of rows in the table.
+        repeat: The number of times to time each benchmark.
+        sample_size: The maximum number of rows for the per call benchmark.
+
+    Returns:
+        The results of the benchmarks.
+    """
+    sample = list(ImplementedModelWithTimestamps.objects.all()[:sample_size])
+    instances = list(ImplementedModelWithTimestamps.objects.all())
+    return [
+        _measure(
+            "add_timestamps_and_save",
+            size,
+            len(sample),
+            lambda: [
+                instance.add_timestamps_and_save(CURRENT_TIMESTAMP)
+                for instance in sample
+            ],
+            repeat,
+        ),
+        _measure(
+            "add_timestamps_and_save_many",
+            size,
+            len(instances),
+            lambda: ImplementedModelWithTimestamps.add_timestamps_and_save_many(
+                instances,
+                CURRENT_TIMESTAMP,
+            ),
+            repeat,
+        ),
+    ]
+
+
+def benchmark_staleness(size: int, repeat: int) -> list[BenchmarkResult]:
+    """Compare the ways of finding outdated rows.
+
+    Args:
+        size: The number of rows in the table.
+        repeat: The number of times to time each benchmark.
+
+    Returns:
+        The results of the benchmarks.
+    """
+    return [
+        _measure(
+            "is_outdated",
+            size,
+            size,
+            lambda: [
+                instance.pk
+                for instance in ImplementedModelWithTimestamps.objects.all()
+                if instance.is_outdated(CURRENT_TIMESTAMP)
+            ],
+            repeat,
+        ),
+        _measure(
+            "outdated queryset",
+            size,
+            size,
+            lambda: list(
+                ImplementedModelWithTimestamps.objects.outdated(
+                    CURRENT_TIMESTAMP,
+                ).values_list("pk", flat=True),
+            ),
+            repeat,
+        ),
+        _measure(
+            "outdated_pks",
+            size,
+            size,
+            lambda: outdated_pks(
+                *zip(
+                    *ImplementedModelWithTimestamps.objects.values_list(
+                        "pk",
+                        "info_timestamp",
+                        "info_modified_timestamp",
+                    ),
+                    strict=True,
+                ),
+                CURRENT_TIMESTAMP,
+            ),
+            repeat,
+        ),
+    ]
+
+
+def _inspect_stack_model_name() -> str:
+    """Get the model name the way auto_unique did before it used sys._getframe.
+
+    Returns:
+        The name of the model.
+    """
+    for i, frame_info in enumerate(inspect.stack()):
+        if frame_info.function == "Meta":
+            return inspect.stack()[i + 1].function
+    msg = "Meta class not found."
+    raise RuntimeError(msg)
+
+
+def _define_model(get_name: Callable[[], object], depth: int) -> None:
+    """Define a model like class that calls get_name from its Meta class.
+
+    Args:
+        get_name: The function to call from the Meta class.
+        depth: The number of extra frames to add to the stack, this represents the
+            frames Django adds when importing models during django.setup().
+    """
+    if depth:
+        _define_model(get_name, depth - 1)
+        return
+
+    class ModelName:  # type: ignore[reportUnusedClass]
+        class Meta:
+            get_name()
+
+
+def benchmark_auto_unique(
+    number: int = 1_000,
+    depth: int = 50,
+    repeat: int = 5,
+) -> list[BenchmarkResult]:
+    """Compare the cost of auto_unique with the old inspect.stack implementation.
+
+    Args:
+        number: The number of models to define for each implementation.
+        depth: The number of extra frames on the stack when each model is defined.
+        repeat: The number of times to time each implementation.
+
+    Returns:
+        The results of the benchmarks.
+    """
+    implementations: dict[str, Callable[[], object]] = {
+        "auto_unique (inspect.stack)": _inspect_stack_model_name,
+        "auto_unique": lambda: auto_unique("field1", "field2"),
+    }
+    results: list[BenchmarkResult] = []
+    for name, get_name in implementations.items():
+        seconds = min(
+            timeit.repeat(
+                lambda get_name=get_name: _define_model(get_name, depth),
+                number=number,
+                repeat=repeat,
+            ),
+        )
+        results.append(BenchmarkResult(name, 0, number, seconds, 0, 0))
+    return results
+
+
+def run_benchmarks(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    repeat: int = 3,
+    sample_size: int = 10_000,
+    model_count: int = 1_000,
+) -> list[BenchmarkResult]:
+    """Run every benchmark for every table size.
+
+    The database must already be set up, the data for each size is rolled back after
+    the benchmarks for that size finish.
+
+    Args:
+        sizes: The number of rows to benchmark with.
+        repeat: The number of times to time each benchmark.
+        sample_size: The maximum number of objects for the per call benchmarks, the
+            per call benchmarks make one query per object so they would take too long
+            on large tables.
+        model_count: The number of models to define for the auto_unique benchmark.
+
+    Returns:
+        The results of the benchmarks.
+    """
+    results = benchmark_auto_unique(model_count, repeat=repeat)
+    for size in sizes:
+        with transaction.atomic():
+            _seed(size)
+            results += benchmark_get_or_new(size, repeat, sample_size)
+            results += benchmark_timestamp_save(size, repeat, sample_size)
+            results += benchmark_staleness(size, repeat)
+            transaction.set_rollback(True)
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks against a test database and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sample-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        results = run_benchmarks(tuple(args.sizes), args.repeat, args.sample_size)
+    finally:
+        connection.creation.destroy_test_db(":memory:", verbosity=0)
+
+    print(HEADER)  # noqa: T201
+    for result in results:
+        print(result)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
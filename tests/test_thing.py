@@ -3,17 +3,63 @@
 from __future__ import annotations
 
 import datetime
+import math
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pytest
-from django.core.management import call_command
-from django.db import models
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, models
+from django.test.utils import CaptureQueriesContext, isolate_apps
 
-from src.great_django_family import auto_unique
+from src.great_django_family import (
+    GetOrNewCache,
+    Instrumentation,
+    OperationStats,
+    TimestampPartitioning,
+    auto_index,
+    auto_timestamp_indexes,
+    auto_unique,
+    maintain_partitions,
+    natural_keys,
+    operation_finished,
+    outdated_mask,
+    outdated_pks,
+    resolve_graph,
+)
+from src.great_django_family.cache import get_active_cache
+from src.great_django_family.constraints import check_unique_constraints
+from src.great_django_family.functions import StackInspectionError
+from src.great_django_family.instrumentation import instrumented
+from src.great_django_family.partitions import bucket_start, shift_bucket
+from src.great_django_family.refresh import (
+    RefreshStats,
+    refresh_outdated,
+    refresh_outdated_in_processes,
+)
 from test_project.test_app.models import (
+    ImplementedChildGetOrNew,
     ImplementedGetOrNew,
+    ImplementedGetOrNewWithTimestamps,
+    ImplementedModelWithChangeTracking,
     ImplementedModelWithTimestamps,
+    ImplementedModelWithUpdateAt,
+    ImplementedSharedCacheGetOrNew,
+    ImplementedUniqueGetOrNew,
+    ImplementedUuidTimestamps,
 )
+from tests.benchmarks import run_benchmarks
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
 
 CURRENT_TIMESTAMP = datetime.datetime.now().astimezone()
 PAST_TIMESTAMP = CURRENT_TIMESTAMP - datetime.timedelta(days=1)
@@ -43,6 +89,42 @@ class TestForMigrations:
         assert output.getvalue().strip() == "No changes detected"
 
 
+class TestImport:
+    # The cumulative import time of the package in microseconds, the package only
+    # imports typing and importlib so this leaves plenty of room for slow machines.
+    IMPORT_TIME_BUDGET = 50_000
+
+    def test_cold_import(self) -> None:
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                "import src.great_django_family",
+            ],
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent.parent,
+            text=True,
+        ).stderr
+        # Lines are formatted as "import time: self | cumulative | module"
+        imports = {
+            line.split("|")[2].strip(): int(line.split("|")[1])
+            for line in output.splitlines()[1:]
+        }
+        assert imports["src.great_django_family"] < self.IMPORT_TIME_BUDGET
+        assert not any(module.startswith("django") for module in imports)
+
+    def test_lazy_exports(self) -> None:
+        from src import great_django_family  # noqa: PLC0415 - Testing the import
+
+        assert great_django_family.auto_unique is auto_unique
+        assert set(great_django_family.__all__) <= set(dir(great_django_family))
+        with pytest.raises(AttributeError, match="missing"):
+            great_django_family.missing  # noqa: B018 - Testing the attribute access
+
+
 class TestAutoUnique:
     def test_auto_unique(self) -> None:
         # Auto unique dynamically gets the class name when executed so it needs
@@ -56,6 +138,104 @@ class TestAutoUnique:
                     name="UQ_ModelName_field1-field2",
                 )
 
+    def test_auto_unique_outside_meta(self) -> None:
+        with pytest.raises(StackInspectionError):
+            auto_unique("field1")
+
+    def test_natural_keys(self) -> None:
+        assert natural_keys(ImplementedChildGetOrNew) == (("parent", "number"),)
+        assert natural_keys(ImplementedGetOrNew) == ()
+
+    def test_check_unique_constraints(self) -> None:
+        assert check_unique_constraints() == []
+
+        with isolate_apps("test_project.test_app") as isolated_apps:
+
+            class Redundant(models.Model):  # noqa: DJ008 - Only used for checks
+                first = models.IntegerField(unique=True)
+                second = models.IntegerField()
+
+                class Meta:
+                    app_label = "test_app"
+                    constraints = (
+                        auto_unique("first", "second"),
+                        auto_unique("second"),
+                        models.UniqueConstraint(fields=["second"], name="second"),
+                    )
+
+            assert natural_keys(Redundant) == (("first", "second"), ("second",))
+            messages = check_unique_constraints(
+                [isolated_apps.get_app_config("test_app")],
+            )
+
+        assert [(message.id, message.msg) for message in messages] == [
+            (
+                "great_django_family.W002",
+                (
+                    "The constraint UQ_Redundant_first-second is implied by the "
+                    "constraint UQ_Redundant_second."
+                ),
+            ),
+            (
+                "great_django_family.W001",
+                (
+                    "The constraint second is a duplicate of the constraint "
+                    "UQ_Redundant_second."
+                ),
+            ),
+        ]
+
+
+class TestBenchmarks:
+    @pytest.mark.django_db
+    def test_benchmarks_run(self) -> None:
+        # The benchmarks are run with a tiny table so they don't break unnoticed
+        results = run_benchmarks(
+            sizes=(10,),
+            repeat=1,
+            sample_size=10,
+            model_count=10,
+        )
+        assert all(result.seconds > 0 for result in results)
+
+
+class TestAutoIndex:
+    def test_auto_index(self) -> None:
+        class Model:  # type: ignore[reportUnusedClass]
+            class Meta:
+                assert auto_index("field1") == models.Index(
+                    fields=["field1"],
+                    name="IX_Model_field1",
+                )
+
+    def test_auto_index_long_name(self) -> None:
+        class ModelWithALongName:  # type: ignore[reportUnusedClass]
+            class Meta:
+                indexes = (
+                    auto_index("field1", "field2"),
+                    auto_index("field1", "field2"),
+                )
+                conditional_index = auto_index(
+                    "field1",
+                    "field2",
+                    condition=models.Q(field1__isnull=False),
+                )
+                assert indexes[0] == indexes[1]
+                assert indexes[0].name.startswith("IX_ModelWithALong")
+                assert len(indexes[0].name) == models.Index.max_name_length
+                assert conditional_index.name != indexes[0].name
+
+    def test_auto_timestamp_indexes(self) -> None:
+        class Model:  # type: ignore[reportUnusedClass]
+            class Meta:
+                fields = tuple(index.fields for index in auto_timestamp_indexes())
+                assert fields == (
+                    ["info_timestamp", "info_modified_timestamp"],
+                    ["info_modified_timestamp"],
+                )
+                indexes = auto_timestamp_indexes(updated_at=True)
+                assert indexes[-1].fields == ["updated_at"]
+
 
 @pytest.mark.django_db
 class TestGetOrNew:
@@ -71,6 +251,645 @@ class TestGetOrNew:
         assert missing is False
         assert obj2.id == instance.id
 
+    def test_get_or_new_many(self) -> None:
+        existing = ImplementedGetOrNew.objects.create(name="existing")
+        lookups = [
+            {"name": "existing"},
+            {"name": "new"},
+            {"name": "new"},
+            {"pk": existing.pk, "name": "existing"},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            results = ImplementedGetOrNew.objects.get_or_new_many(lookups)
+        assert len(queries) == 1
+
+        assert [created for _instance, created in results] == [
+            False,
+            True,
+            False,
+            False,
+        ]
+        assert results[0][0].pk == existing.pk
+        assert results[3][0].pk == existing.pk
+        assert results[1][0] is results[2][0]
+        assert results[1][0].pk is None
+
+    def test_get_or_new_many_none(self) -> None:
+        without_nickname = ImplementedGetOrNew.objects.create(name="without")
+        with_nickname = ImplementedGetOrNew.objects.create(name="with", nickname="a")
+        assert ImplementedGetOrNew.objects.get_or_new(nickname=None) == (
+            without_nickname,
+            False,
+        )
+
+        results = ImplementedGetOrNew.objects.get_or_new_many(
+            [{"nickname": None}, {"nickname": "a"}, {"nickname": "b"}],
+        )
+
+        assert [(instance.pk, created) for instance, created in results] == [
+            (without_nickname.pk, False),
+            (with_nickname.pk, False),
+            (None, True),
+        ]
+        results = ImplementedGetOrNew.objects.get_or_new_many([{"nickname": None}])
+        assert results == [(without_nickname, False)]
+
+    def test_get_or_new_many_unsupported_lookup(self) -> None:
+        with pytest.raises(ValueError, match="only supports exact lookups"):
+            ImplementedGetOrNew.objects.get_or_new_many([{"name__iexact": "test"}])
+
+    def test_get_or_new_many_batches(self) -> None:
+        ImplementedGetOrNew.objects.bulk_create(
+            ImplementedGetOrNew(name=str(i)) for i in range(0, 10, 2)
+        )
+        lookups = [{"name": str(i)} for i in range(10)]
+        batch_size = 3
+        with CaptureQueriesContext(connection) as queries:
+            results = ImplementedGetOrNew.objects.get_or_new_many(
+                lookups,
+                batch_size=batch_size,
+            )
+        assert len(queries) == math.ceil(len(lookups) / batch_size)
+        assert [created for _instance, created in results] == [
+            i % 2 == 1 for i in range(10)
+        ]
+        assert [instance.name for instance, _created in results] == [
+            str(i) for i in range(10)
+        ]
+
+    def test_aget_or_new(self) -> None:
+        ImplementedGetOrNew.objects.create(name="existing")
+        get_or_new = async_to_sync(ImplementedGetOrNew.objects.aget_or_new)
+        assert get_or_new(name="existing")[1] is False
+        assert get_or_new(name="new")[1] is True
+
+    def test_aget_or_new_many(self) -> None:
+        ImplementedGetOrNew.objects.create(name="existing")
+        results = async_to_sync(ImplementedGetOrNew.objects.aget_or_new_many)(
+            [{"name": "existing"}, {"name": "new"}],
+        )
+        assert [created for _instance, created in results] == [False, True]
+
+
+@pytest.mark.django_db
+class TestIterGetOrNew:
+    def test_windows(self) -> None:
+        ImplementedGetOrNew.objects.bulk_create(
+            ImplementedGetOrNew(name=str(i)) for i in range(0, 10, 2)
+        )
+        consumed: list[int] = []
+
+        def lookups() -> Iterator[dict[str, str]]:
+            for i in range(10):
+                consumed.append(i)
+                yield {"name": str(i)}
+
+        batch_size = 4
+        results = ImplementedGetOrNew.objects.iter_get_or_new(lookups(), batch_size)
+        with CaptureQueriesContext(connection) as queries:
+            first = next(results)
+        assert len(consumed) == batch_size
+        assert len(queries) == 1
+        assert first[0].name == "0"
+        assert first[1] is False
+
+        with CaptureQueriesContext(connection) as queries:
+            rest = list(results)
+        expected_queries = 2
+        assert len(queries) == expected_queries
+        assert [instance.name for instance, _created in [first, *rest]] == [
+            str(i) for i in range(10)
+        ]
+        assert [created for _instance, created in [first, *rest]] == [
+            bool(i % 2) for i in range(10)
+        ]
+
+    def test_aiter_get_or_new(self) -> None:
+        ImplementedGetOrNew.objects.create(name="existing")
+
+        async def lookups() -> AsyncIterator[dict[str, str]]:
+            for name in ("existing", "new", "other"):
+                yield {"name": name}
+
+        async def collect() -> list[tuple[ImplementedGetOrNew, bool]]:
+            return [
+                result
+                async for result in ImplementedGetOrNew.objects.aiter_get_or_new(
+                    lookups(),
+                    batch_size=2,
+                )
+            ]
+
+        results = async_to_sync(collect)()
+        assert [(instance.name, created) for instance, created in results] == [
+            ("existing", False),
+            ("new", True),
+            ("other", True),
+        ]
+
+
+@pytest.mark.django_db
+class TestWarm:
+    def test_warm(self) -> None:
+        existing = ImplementedUniqueGetOrNew.objects.create(name="existing")
+        with GetOrNewCache(), CaptureQueriesContext(connection) as queries:
+            fetched = ImplementedUniqueGetOrNew.objects.warm(
+                [("existing",), {"name": "missing"}],
+            )
+            instance, created = ImplementedUniqueGetOrNew.objects.get_or_new(
+                name="existing",
+            )
+            new, new_created = ImplementedUniqueGetOrNew.objects.get_or_new(
+                name="missing",
+            )
+            results = ImplementedUniqueGetOrNew.objects.get_or_new_many(
+                [{"name": "existing"}, {"name": "missing"}],
+            )
+        assert fetched == 1
+        assert len(queries) == 1
+        assert (instance.pk, created) == (existing.pk, False)
+        assert (new.pk, new_created) == (None, True)
+        assert [created for _instance, created in results] == [False, True]
+
+    def test_save_invalidates_missing(self) -> None:
+        with GetOrNewCache():
+            ImplementedUniqueGetOrNew.objects.warm([("missing",)])
+            ImplementedUniqueGetOrNew.objects.create(name="missing")
+            _instance, created = ImplementedUniqueGetOrNew.objects.get_or_new(
+                name="missing",
+            )
+        assert created is False
+
+    def test_bulk_save_invalidates_missing(self) -> None:
+        with GetOrNewCache():
+            ImplementedGetOrNewWithTimestamps.objects.warm([("missing",)])
+            ImplementedGetOrNewWithTimestamps.add_timestamps_and_save_many(
+                [ImplementedGetOrNewWithTimestamps(name="missing")],
+                CURRENT_TIMESTAMP,
+            )
+            _instance, created = ImplementedGetOrNewWithTimestamps.objects.get_or_new(
+                name="missing",
+            )
+        assert created is False
+
+    def test_update_or_new_many_invalidates_missing(self) -> None:
+        with GetOrNewCache():
+            ImplementedUniqueGetOrNew.objects.warm([("missing",)])
+            ImplementedUniqueGetOrNew.objects.update_or_new_many(
+                [ImplementedUniqueGetOrNew(name="missing")],
+            )
+            _instance, created = ImplementedUniqueGetOrNew.objects.get_or_new(
+                name="missing",
+            )
+        assert created is False
+
+    def test_warm_requires_cache(self) -> None:
+        with pytest.raises(RuntimeError, match="GetOrNewCache"):
+            ImplementedUniqueGetOrNew.objects.warm([("name",)])
+
+    def test_resolve_graph(self) -> None:
+        parent = ImplementedUniqueGetOrNew.objects.create(name="parent")
+        ImplementedChildGetOrNew.objects.create(parent=parent, number=1)
+
+        def child_lookups() -> list[dict[str, object]]:
+            new_parent, _created = ImplementedUniqueGetOrNew.objects.get_or_new(
+                name="new",
+            )
+            return [
+                {"parent": parent, "number": 1},
+                {"parent": parent, "number": 2},
+                {"parent": new_parent, "number": 1},
+            ]
+
+        with CaptureQueriesContext(connection) as queries:
+            cache = resolve_graph(
+                {
+                    ImplementedUniqueGetOrNew: [("parent",), ("new",)],
+                    ImplementedChildGetOrNew: child_lookups,
+                },
+            )
+        expected_queries = 2
+        assert len(queries) == expected_queries
+
+        with cache, CaptureQueriesContext(connection) as queries:
+            _child, created = ImplementedChildGetOrNew.objects.get_or_new(
+                parent=parent,
+                number=1,
+            )
+            assert created is False
+            _child, created = ImplementedChildGetOrNew.objects.get_or_new(
+                parent=parent,
+                number=2,
+            )
+            assert created is True
+            new_parent, created = ImplementedUniqueGetOrNew.objects.get_or_new(
+                name="new",
+            )
+            assert created is True
+            _child, created = ImplementedChildGetOrNew.objects.get_or_new(
+                parent=new_parent,
+                number=1,
+            )
+            assert created is True
+        assert len(queries) == 0
+
+
+@pytest.mark.django_db
+class TestExistsOrNew:
+    def test_only_lookup_fields_are_loaded(self) -> None:
+        existing = ImplementedUniqueGetOrNew.objects.create(name="test", value=1)
+        with CaptureQueriesContext(connection) as queries:
+            instance, created = ImplementedUniqueGetOrNew.objects.exists_or_new(
+                name="test",
+            )
+        assert created is False
+        assert instance.pk == existing.pk
+        assert instance.get_deferred_fields() == {"value"}
+        assert '"value"' not in queries[0]["sql"]
+        with CaptureQueriesContext(connection) as queries:
+            assert instance.value == existing.value
+        assert len(queries) == 1
+
+    def test_missing_is_new(self) -> None:
+        instance, created = ImplementedUniqueGetOrNew.objects.exists_or_new(
+            name="missing",
+        )
+        assert created is True
+        assert instance.pk is None
+
+    def test_aexists_or_new(self) -> None:
+        ImplementedUniqueGetOrNew.objects.create(name="test")
+        instance, created = async_to_sync(
+            ImplementedUniqueGetOrNew.objects.aexists_or_new,
+        )(name="test")
+        assert created is False
+        assert instance.get_deferred_fields() == {"value"}
+
+
+@pytest.mark.django_db
+class TestGetOrNewCache:
+    def test_repeated_lookups_are_cached(self) -> None:
+        ImplementedGetOrNew.objects.create(name="test")
+        with GetOrNewCache(), CaptureQueriesContext(connection) as queries:
+            instance, created = ImplementedGetOrNew.objects.get_or_new(name="test")
+            cached, cached_created = ImplementedGetOrNew.objects.get_or_new(name="test")
+            results = ImplementedGetOrNew.objects.get_or_new_many([{"name": "test"}])
+        assert len(queries) == 1
+        assert created is cached_created is False
+        assert cached is instance
+        assert results == [(instance, False)]
+
+    def test_save_and_delete_invalidate(self) -> None:
+        ImplementedGetOrNew.objects.create(name="test")
+        with GetOrNewCache() as cache:
+            instance, _created = ImplementedGetOrNew.objects.get_or_new(name="test")
+            instance.name = "renamed"
+            instance.save()
+            assert len(cache) == 0
+            _instance, created = ImplementedGetOrNew.objects.get_or_new(name="test")
+            assert created is True
+
+            instance, _created = ImplementedGetOrNew.objects.get_or_new(name="renamed")
+            instance.delete()
+            assert len(cache) == 0
+
+    def test_other_models_use_fast_delete(self) -> None:
+        ImplementedModelWithTimestamps.objects.bulk_create(
+            ImplementedModelWithTimestamps(
+                name=name,
+                info_timestamp=CURRENT_TIMESTAMP,
+                info_modified_timestamp=CURRENT_TIMESTAMP,
+            )
+            for name in ("a", "b", "c")
+        )
+        with GetOrNewCache(), CaptureQueriesContext(connection) as queries:
+            ImplementedModelWithTimestamps.objects.all().delete()
+        assert len(queries) == 1
+        assert queries[0]["sql"].startswith("DELETE")
+
+    def test_least_recently_used_are_evicted(self) -> None:
+        ImplementedGetOrNew.objects.bulk_create(
+            ImplementedGetOrNew(name=name) for name in ("a", "b", "c")
+        )
+        with GetOrNewCache(maxsize=2) as cache:
+            ImplementedGetOrNew.objects.get_or_new(name="a")
+            ImplementedGetOrNew.objects.get_or_new(name="b")
+            ImplementedGetOrNew.objects.get_or_new(name="a")
+            ImplementedGetOrNew.objects.get_or_new(name="c")
+            assert len(cache) == cache.maxsize
+            with CaptureQueriesContext(connection) as queries:
+                ImplementedGetOrNew.objects.get_or_new(name="a")
+            assert len(queries) == 0
+            with CaptureQueriesContext(connection) as queries:
+                ImplementedGetOrNew.objects.get_or_new(name="b")
+            assert len(queries) == 1
+
+    def test_decorator_uses_a_new_cache_for_every_call(self) -> None:
+        ImplementedGetOrNew.objects.create(name="test")
+
+        @GetOrNewCache()
+        def lookup() -> tuple[ImplementedGetOrNew, bool]:
+            return ImplementedGetOrNew.objects.get_or_new(name="test")
+
+        assert lookup()[1] is False
+        # QuerySet.update does not send post_save so only a new cache sees the change
+        ImplementedGetOrNew.objects.update(name="renamed")
+        assert lookup()[1] is True
+        assert get_active_cache() is None
+
+    def test_decorator_in_threads(self) -> None:
+        thread_count = 5
+        barrier = threading.Barrier(thread_count)
+
+        @GetOrNewCache()
+        def active_cache() -> GetOrNewCache | None:
+            # Every thread is inside of the decorated function at the same time
+            barrier.wait(timeout=5)
+            return get_active_cache()
+
+        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+            futures = [executor.submit(active_cache) for _ in range(thread_count)]
+            caches = [future.result() for future in futures]
+
+        assert None not in caches
+        assert len({id(cache) for cache in caches}) == thread_count
+
+
+@pytest.mark.django_db
+class TestInstrumentation:
+    def test_decorator_in_threads(self) -> None:
+        thread_count = 5
+        barrier = threading.Barrier(thread_count)
+        instrumentation = Instrumentation()
+
+        @instrumented("wait")
+        def wait(owner: type[models.Model]) -> type[models.Model]:
+            return owner
+
+        @instrumentation
+        def instrumented_wait() -> None:
+            # Every thread is inside of the decorated function at the same time
+            barrier.wait(timeout=5)
+            wait(ImplementedGetOrNew)
+
+        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+            futures = [executor.submit(instrumented_wait) for _ in range(thread_count)]
+            for future in futures:
+                future.result()
+
+        stats = instrumentation.stats["test_app.ImplementedGetOrNew"]["wait"]
+        assert stats.calls == thread_count
+
+    def test_record_in_threads(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        class SlowStats(OperationStats):
+            def __setattr__(self, name: str, value: object) -> None:
+                # Let another thread read the old value before it is replaced
+                time.sleep(0)
+                super().__setattr__(name, value)
+
+        monkeypatch.setattr(
+            "src.great_django_family.instrumentation.OperationStats",
+            SlowStats,
+        )
+        thread_count = 8
+        record_count = 100
+        instrumentation = Instrumentation()
+
+        def record() -> None:
+            for _ in range(record_count):
+                instrumentation.record(
+                    ImplementedGetOrNew,
+                    "record",
+                    hits=1,
+                    misses=0,
+                    queries=0,
+                    seconds=0,
+                )
+
+        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+            for future in [executor.submit(record) for _ in range(thread_count)]:
+                future.result()
+
+        stats = instrumentation.stats["test_app.ImplementedGetOrNew"]["record"]
+        assert stats.calls == stats.hits == thread_count * record_count
+
+    def test_get_or_new_stats(self) -> None:
+        ImplementedGetOrNew.objects.create(name="found")
+        with Instrumentation() as instrumentation:
+            ImplementedGetOrNew.objects.get_or_new(name="found")
+            ImplementedGetOrNew.objects.get_or_new(name="missing")
+            ImplementedGetOrNew.objects.get_or_new_many(
+                [{"name": "found"}, {"name": "other"}],
+            )
+        ImplementedGetOrNew.objects.get_or_new(name="found")
+
+        stats = instrumentation.stats["test_app.ImplementedGetOrNew"]
+        get_or_new = stats["get_or_new"]
+        expected_calls = 2
+        assert get_or_new.calls == expected_calls
+        assert (get_or_new.hits, get_or_new.misses) == (1, 1)
+        assert get_or_new.queries == expected_calls
+        get_or_new_many = stats["get_or_new_many"]
+        assert get_or_new_many.calls == 1
+        assert (get_or_new_many.hits, get_or_new_many.misses) == (1, 1)
+        assert get_or_new_many.queries == 1
+
+    def test_async_stats(self) -> None:
+        with Instrumentation() as instrumentation:
+            async_to_sync(ImplementedGetOrNew.objects.aget_or_new)(name="missing")
+        stats = instrumentation.stats["test_app.ImplementedGetOrNew"]["aget_or_new"]
+        assert (stats.calls, stats.misses) == (1, 1)
+
+    def test_operation_finished_signal(self) -> None:
+        received: list[dict[str, object]] = []
+
+        def receiver(**kwargs: object) -> None:
+            received.append(kwargs)
+
+        instance = ImplementedModelWithTimestamps(name="test")
+        operation_finished.connect(receiver)
+        try:
+            instance.add_timestamps_and_save(CURRENT_TIMESTAMP)
+        finally:
+            operation_finished.disconnect(receiver)
+        instance.add_timestamps_and_save(CURRENT_TIMESTAMP)
+
+        assert len(received) == 1
+        assert received[0]["sender"] is ImplementedModelWithTimestamps
+        assert received[0]["operation"] == "add_timestamps_and_save"
+        assert received[0]["queries"] == 1
+
+
+@pytest.mark.django_db
+class TestSaveNewOrRefetch:
+    def test_new(self) -> None:
+        instance, created = ImplementedUniqueGetOrNew(name="test").save_new_or_refetch()
+        assert created is True
+        assert ImplementedUniqueGetOrNew.objects.get().pk == instance.pk
+
+    def test_conflict_is_merged(self) -> None:
+        existing = ImplementedUniqueGetOrNew.objects.create(name="test", value=1)
+        pending = ImplementedUniqueGetOrNew(name="test", value=2)
+        instance, created = pending.save_new_or_refetch()
+        assert created is False
+        assert instance.pk == existing.pk
+        assert ImplementedUniqueGetOrNew.objects.get().value == pending.value
+
+    def test_merge_fields(self) -> None:
+        existing = ImplementedUniqueGetOrNew.objects.create(name="test", value=1)
+        instance, _created = ImplementedUniqueGetOrNew(
+            name="test",
+            value=2,
+        ).save_new_or_refetch(merge_fields=[])
+        assert instance.value == existing.value
+        assert ImplementedUniqueGetOrNew.objects.get().value == existing.value
+
+    @pytest.mark.django_db(transaction=True)
+    def test_autocommit_has_no_savepoint(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            _instance, created = ImplementedUniqueGetOrNew(
+                name="test",
+            ).save_new_or_refetch()
+        assert created is True
+        assert len(queries) == 1
+
+        instance, created = ImplementedUniqueGetOrNew(
+            name="test",
+            value=1,
+        ).save_new_or_refetch()
+        assert created is False
+        assert instance.value == 1
+
+    def test_other_errors_are_raised(self) -> None:
+        existing = ImplementedGetOrNew.objects.create(name="test")
+        with pytest.raises(IntegrityError):
+            ImplementedGetOrNew(pk=existing.pk, name="other").save_new_or_refetch()
+        assert ImplementedGetOrNew.objects.get().name == existing.name
+
+
+@pytest.mark.django_db
+class TestSharedGetOrNewCache:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self) -> None:
+        cache.clear()
+
+    def test_hit_skips_query(self) -> None:
+        existing = ImplementedSharedCacheGetOrNew.objects.create(name="test", value=1)
+        ImplementedSharedCacheGetOrNew.objects.get_or_new(name="test")
+        with CaptureQueriesContext(connection) as queries:
+            instance, created = ImplementedSharedCacheGetOrNew.objects.get_or_new(
+                name="test",
+            )
+        assert len(queries) == 0
+        assert created is False
+        assert (instance.pk, instance.name) == (existing.pk, existing.name)
+        assert instance.get_deferred_fields() == {"value"}
+        assert instance.value == existing.value
+
+    def test_miss_is_cached_until_save(self) -> None:
+        ImplementedSharedCacheGetOrNew.objects.get_or_new(name="test")
+        with CaptureQueriesContext(connection) as queries:
+            instance, created = ImplementedSharedCacheGetOrNew.objects.get_or_new(
+                name="test",
+            )
+        assert len(queries) == 0
+        assert created is True
+
+        instance.save()
+        fetched, created = ImplementedSharedCacheGetOrNew.objects.get_or_new(
+            name="test",
+        )
+        assert created is False
+        assert fetched.pk == instance.pk
+
+    def test_delete_invalidates(self) -> None:
+        ImplementedSharedCacheGetOrNew.objects.create(name="test")
+        instance, _created = ImplementedSharedCacheGetOrNew.objects.get_or_new(
+            name="test",
+        )
+        instance.delete()
+        _instance, created = ImplementedSharedCacheGetOrNew.objects.get_or_new(
+            name="test",
+        )
+        assert created is True
+
+    def test_aget_or_new(self) -> None:
+        existing = ImplementedSharedCacheGetOrNew.objects.create(name="test")
+        aget_or_new = async_to_sync(ImplementedSharedCacheGetOrNew.objects.aget_or_new)
+        aget_or_new(name="test")
+        with CaptureQueriesContext(connection) as queries:
+            instance, created = aget_or_new(name="test")
+        assert len(queries) == 0
+        assert created is False
+        assert instance.pk == existing.pk
+
+
+@pytest.mark.django_db
+class TestUpdateOrNewMany:
+    def test_natural_key_fields(self) -> None:
+        assert ImplementedUniqueGetOrNew.objects.natural_key_fields() == ("name",)
+        with pytest.raises(ValueError, match="does not have any unique fields"):
+            ImplementedGetOrNew.objects.natural_key_fields()
+
+    @pytest.mark.parametrize("supports_update_conflicts", [True, False])
+    def test_update_or_new_many(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        *,
+        supports_update_conflicts: bool,
+    ) -> None:
+        monkeypatch.setattr(
+            connection.features,
+            "supports_update_conflicts_with_target",
+            supports_update_conflicts,
+        )
+        existing = ImplementedUniqueGetOrNew.objects.create(name="existing", value=1)
+
+        instances = ImplementedUniqueGetOrNew.objects.update_or_new_many(
+            [
+                ImplementedUniqueGetOrNew(name="existing", value=2),
+                ImplementedUniqueGetOrNew(name="new", value=3),
+            ],
+        )
+
+        assert instances[0].pk == existing.pk
+        assert instances[1].pk is not None
+        assert dict(ImplementedUniqueGetOrNew.objects.values_list("name", "value")) == {
+            "existing": 2,
+            "new": 3,
+        }
+
+    def test_fallback_ignores_caches(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            connection.features,
+            "supports_update_conflicts_with_target",
+            False,
+        )
+        with GetOrNewCache():
+            ImplementedUniqueGetOrNew.objects.warm([("existing",)])
+            # bulk_create does not send post_save so the missing lookup is stale
+            ImplementedUniqueGetOrNew.objects.bulk_create(
+                [ImplementedUniqueGetOrNew(name="existing", value=1)],
+            )
+            instances = ImplementedUniqueGetOrNew.objects.update_or_new_many(
+                [ImplementedUniqueGetOrNew(name="existing", value=2)],
+            )
+
+        existing = ImplementedUniqueGetOrNew.objects.get()
+        assert instances[0].pk == existing.pk
+        assert existing.value == instances[0].value
+
+    def test_aupdate_or_new_many(self) -> None:
+        existing = ImplementedUniqueGetOrNew.objects.create(name="existing", value=1)
+        update_or_new_many = async_to_sync(
+            ImplementedUniqueGetOrNew.objects.aupdate_or_new_many,
+        )
+        instances = update_or_new_many(
+            [ImplementedUniqueGetOrNew(name="existing", value=2)],
+        )
+        assert instances[0].pk == existing.pk
+        assert ImplementedUniqueGetOrNew.objects.get().value == instances[0].value
+
 
 @pytest.mark.django_db
 class TestModelWithTimestamps:
@@ -92,3 +911,661 @@ class TestModelWithTimestamps:
             is_outdated = FUTURE_TIMESTAMP in (info_timestamp, modified_timestamp)
             output = instance.is_outdated(info_timestamp, modified_timestamp)
             assert output is is_outdated
+
+    def test_add_timestamps_and_save_many(self) -> None:
+        existing = ImplementedModelWithTimestamps(name="existing")
+        existing.add_timestamps_and_save(PAST_TIMESTAMP)
+        existing.name = "updated"
+        instances = [
+            existing,
+            *(ImplementedModelWithTimestamps(name="new") for _ in range(3)),
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            created, updated = (
+                ImplementedModelWithTimestamps.add_timestamps_and_save_many(
+                    instances,
+                    CURRENT_TIMESTAMP,
+                )
+            )
+        assert [query["sql"].split()[0] for query in queries] == ["INSERT", "UPDATE"]
+        assert (created, updated) == (len(instances) - 1, 1)
+
+        saved = ImplementedModelWithTimestamps.objects.all()
+        assert {instance.info_timestamp for instance in saved} == {CURRENT_TIMESTAMP}
+        assert len({instance.info_modified_timestamp for instance in saved}) == 1
+        assert (
+            ImplementedModelWithTimestamps.objects.get(pk=existing.pk).name == "updated"
+        )
+
+    def test_add_timestamps_and_save_many_with_default_pk(self) -> None:
+        existing = ImplementedUuidTimestamps(name="existing")
+        existing.add_timestamps_and_save(PAST_TIMESTAMP)
+        # New instances already have a primary key from the default
+        instances = [
+            existing,
+            ImplementedUuidTimestamps(name="new"),
+            ImplementedUuidTimestamps(name="new"),
+        ]
+
+        created, updated = ImplementedUuidTimestamps.add_timestamps_and_save_many(
+            instances,
+            CURRENT_TIMESTAMP,
+        )
+
+        assert (created, updated) == (len(instances) - 1, 1)
+        assert ImplementedUuidTimestamps.objects.count() == len(instances)
+        assert not ImplementedUuidTimestamps.objects.outdated(CURRENT_TIMESTAMP)
+        # Created instances are updated the next time they are saved
+        assert ImplementedUuidTimestamps.bulk_save(instances) == (0, len(instances))
+
+    def test_aadd_timestamps_and_save_many(self) -> None:
+        existing = ImplementedModelWithTimestamps(name="existing")
+        existing.add_timestamps_and_save(PAST_TIMESTAMP)
+        instances = [existing, ImplementedModelWithTimestamps(name="new")]
+
+        created, updated = async_to_sync(
+            ImplementedModelWithTimestamps.aadd_timestamps_and_save_many,
+        )(instances, CURRENT_TIMESTAMP)
+
+        assert (created, updated) == (1, 1)
+        assert not ImplementedModelWithTimestamps.objects.outdated(CURRENT_TIMESTAMP)
+
+    def test_up_to_date_queryset_matches_is_up_to_date(self) -> None:
+        ImplementedModelWithTimestamps.objects.bulk_create(
+            ImplementedModelWithTimestamps(
+                name="test",
+                info_timestamp=info_timestamp,
+                info_modified_timestamp=modified_timestamp,
+            )
+            for info_timestamp, modified_timestamp in TIMESTAMP_COMBINATIONS
+            if info_timestamp and modified_timestamp
+        )
+        saved = list(ImplementedModelWithTimestamps.objects.all())
+
+        for info_timestamp, modified_timestamp in TIMESTAMP_COMBINATIONS:
+            up_to_date = ImplementedModelWithTimestamps.objects.up_to_date(
+                info_timestamp,
+                modified_timestamp,
+            )
+            outdated = ImplementedModelWithTimestamps.objects.outdated(
+                info_timestamp,
+                modified_timestamp,
+            )
+            assert set(up_to_date) == {
+                instance
+                for instance in saved
+                if instance.is_up_to_date(info_timestamp, modified_timestamp)
+            }
+            assert set(outdated) == {
+                instance
+                for instance in saved
+                if instance.is_outdated(info_timestamp, modified_timestamp)
+            }
+
+
+class TestStaleness:
+    ROWS: tuple[tuple[datetime.datetime | None, datetime.datetime | None], ...] = (
+        (None, CURRENT_TIMESTAMP),
+        (CURRENT_TIMESTAMP, None),
+        (PAST_TIMESTAMP, CURRENT_TIMESTAMP),
+        (CURRENT_TIMESTAMP, PAST_TIMESTAMP),
+        (CURRENT_TIMESTAMP, CURRENT_TIMESTAMP),
+    )
+
+    def _expected(
+        self,
+        info_timestamp: datetime.datetime | None,
+        modified_timestamp: datetime.datetime | None,
+    ) -> list[bool]:
+        return [
+            ImplementedModelWithTimestamps(
+                info_timestamp=row_info_timestamp,
+                info_modified_timestamp=row_modified_timestamp,
+            ).is_outdated(info_timestamp, modified_timestamp)
+            for row_info_timestamp, row_modified_timestamp in self.ROWS
+        ]
+
+    @pytest.mark.parametrize(
+        ("info_timestamp", "modified_timestamp"),
+        TIMESTAMP_COMBINATIONS,
+    )
+    def test_matches_is_outdated(
+        self,
+        info_timestamp: datetime.datetime | None,
+        modified_timestamp: datetime.datetime | None,
+    ) -> None:
+        info_timestamps, modified_timestamps = zip(*self.ROWS, strict=True)
+        expected = self._expected(info_timestamp, modified_timestamp)
+
+        mask = outdated_mask(
+            info_timestamps,
+            modified_timestamps,
+            info_timestamp,
+            modified_timestamp,
+        )
+        assert mask == expected
+        pks = outdated_pks(
+            range(len(self.ROWS)),
+            info_timestamps,
+            modified_timestamps,
+            info_timestamp,
+            modified_timestamp,
+        )
+        assert pks == [pk for pk, outdated in enumerate(expected) if outdated]
+
+    @pytest.mark.parametrize(
+        ("info_timestamp", "modified_timestamp"),
+        TIMESTAMP_COMBINATIONS,
+    )
+    def test_numpy_matches_is_outdated(
+        self,
+        info_timestamp: datetime.datetime | None,
+        modified_timestamp: datetime.datetime | None,
+    ) -> None:
+        np = pytest.importorskip("numpy")
+
+        def to_datetime64(timestamp: datetime.datetime | None) -> object:
+            if timestamp is None:
+                return np.datetime64("NaT")
+            return np.datetime64(
+                timestamp.astimezone(datetime.UTC).replace(tzinfo=None),
+            )
+
+        info_timestamps, modified_timestamps = (
+            np.array(
+                [to_datetime64(timestamp) for timestamp in column],
+                dtype="datetime64[us]",
+            )
+            for column in zip(*self.ROWS, strict=True)
+        )
+        expected = self._expected(info_timestamp, modified_timestamp)
+
+        mask = outdated_mask(
+            info_timestamps,
+            modified_timestamps,
+            info_timestamp,
+            modified_timestamp,
+        )
+        assert mask.tolist() == expected
+        pks = outdated_pks(
+            np.arange(len(self.ROWS)),
+            info_timestamps,
+            modified_timestamps,
+            info_timestamp,
+            modified_timestamp,
+        )
+        assert pks.tolist() == [pk for pk, outdated in enumerate(expected) if outdated]
+
+    def test_different_lengths(self) -> None:
+        with pytest.raises(ValueError, match="same length"):
+            outdated_mask([CURRENT_TIMESTAMP], [])
+
+
+@pytest.mark.django_db
+class TestModelWithChangeTracking:
+    def _load(self) -> ImplementedModelWithChangeTracking:
+        instance = ImplementedModelWithChangeTracking(name="test")
+        instance.add_timestamps_and_save(PAST_TIMESTAMP)
+        return ImplementedModelWithChangeTracking.objects.get(pk=instance.pk)
+
+    def test_unchanged_is_not_saved(self) -> None:
+        instance = self._load()
+        with CaptureQueriesContext(connection) as queries:
+            instance.save()
+        assert len(queries) == 0
+
+    def test_only_changed_fields_are_saved(self) -> None:
+        instance = self._load()
+        with CaptureQueriesContext(connection) as queries:
+            instance.add_timestamps_and_save(CURRENT_TIMESTAMP)
+            instance.save()
+        assert len(queries) == 1
+        assert '"name"' not in queries[0]["sql"]
+        assert '"info_timestamp"' in queries[0]["sql"]
+
+        instance.name = "renamed"
+        with CaptureQueriesContext(connection) as queries:
+            instance.save()
+        assert len(queries) == 1
+        assert '"info_timestamp"' not in queries[0]["sql"]
+        assert ImplementedModelWithChangeTracking.objects.get().name == instance.name
+
+    def test_mutable_values_are_always_saved(self) -> None:
+        instance = self._load()
+        instance.data = {"key": 1}
+        instance.save()
+        instance.data["key"] = 2
+        instance.save()
+        assert ImplementedModelWithChangeTracking.objects.get().data == instance.data
+
+    def test_deferred_fields(self) -> None:
+        self._load()
+        instance = ImplementedModelWithChangeTracking.objects.only("name").get()
+        assert instance.get_dirty_fields() == []
+        assert instance.data is None
+        assert instance.get_dirty_fields() == []
+        instance.data = {"key": 1}
+        assert instance.get_dirty_fields() == ["data"]
+
+
+@pytest.mark.django_db
+class TestIterChunks:
+    def _create(self, count: int) -> list[ImplementedModelWithTimestamps]:
+        return ImplementedModelWithTimestamps.objects.bulk_create(
+            ImplementedModelWithTimestamps(
+                name=str(i),
+                info_timestamp=PAST_TIMESTAMP,
+                info_modified_timestamp=PAST_TIMESTAMP,
+            )
+            for i in range(count)
+        )
+
+    def test_changes_are_saved(self) -> None:
+        rows = self._create(5)
+        chunk_size = 2
+        chunk_sizes: list[int] = []
+        with CaptureQueriesContext(connection) as queries:
+            for chunk in ImplementedModelWithTimestamps.objects.outdated(
+                CURRENT_TIMESTAMP,
+            ).iter_chunks(chunk_size=chunk_size):
+                chunk_sizes.append(len(chunk))
+                for row in chunk[::2]:
+                    row.add_timestamps(CURRENT_TIMESTAMP)
+
+        assert chunk_sizes == [2, 2, 1]
+        assert not any("OFFSET" in query["sql"] for query in queries)
+        outdated = ImplementedModelWithTimestamps.objects.outdated(CURRENT_TIMESTAMP)
+        assert list(outdated.order_by("pk").values_list("pk", flat=True)) == [
+            rows[1].pk,
+            rows[3].pk,
+        ]
+
+    def test_only_changed_fields_are_written(self) -> None:
+        self._create(2)
+        with CaptureQueriesContext(connection) as queries:
+            for chunk in ImplementedModelWithTimestamps.objects.iter_chunks():
+                chunk[0].info_timestamp = CURRENT_TIMESTAMP
+        updates = [
+            query["sql"] for query in queries if query["sql"].startswith("UPDATE")
+        ]
+        assert len(updates) == 1
+        assert "info_modified_timestamp" not in updates[0]
+        saved = ImplementedModelWithTimestamps.objects.order_by("pk")
+        assert [row.info_timestamp for row in saved] == [
+            CURRENT_TIMESTAMP,
+            PAST_TIMESTAMP,
+        ]
+
+
+@pytest.mark.django_db
+class TestTouch:
+    def _create(self, count: int) -> None:
+        ImplementedModelWithTimestamps.objects.bulk_create(
+            ImplementedModelWithTimestamps(
+                name=str(i),
+                info_timestamp=PAST_TIMESTAMP,
+                info_modified_timestamp=PAST_TIMESTAMP,
+            )
+            for i in range(count)
+        )
+
+    def test_touch(self) -> None:
+        count = 3
+        self._create(count)
+        with CaptureQueriesContext(connection) as queries:
+            touched = ImplementedModelWithTimestamps.objects.outdated(
+                CURRENT_TIMESTAMP,
+            ).touch(CURRENT_TIMESTAMP)
+        assert touched == count
+        assert len(queries) == 1
+        assert not ImplementedModelWithTimestamps.objects.outdated(
+            CURRENT_TIMESTAMP,
+            CURRENT_TIMESTAMP - datetime.timedelta(minutes=1),
+        )
+
+    def test_touch_modified(self) -> None:
+        self._create(2)
+        touched = ImplementedModelWithTimestamps.objects.filter(
+            name="0",
+        ).touch_modified(CURRENT_TIMESTAMP)
+        assert touched == 1
+        saved = ImplementedModelWithTimestamps.objects.order_by("pk")
+        assert [row.info_modified_timestamp for row in saved] == [
+            CURRENT_TIMESTAMP,
+            PAST_TIMESTAMP,
+        ]
+        assert {row.info_timestamp for row in saved} == {PAST_TIMESTAMP}
+
+
+class TestPartitionBuckets:
+    def test_bucket_start(self) -> None:
+        timestamp = datetime.datetime(2024, 3, 14, 15, 9, tzinfo=datetime.UTC)
+        assert bucket_start(timestamp, "day") == timestamp.replace(hour=0, minute=0)
+        assert bucket_start(timestamp, "week") == datetime.datetime(
+            2024,
+            3,
+            11,
+            tzinfo=datetime.UTC,
+        )
+        assert bucket_start(timestamp, "month") == datetime.datetime(
+            2024,
+            3,
+            1,
+            tzinfo=datetime.UTC,
+        )
+
+    def test_shift_bucket(self) -> None:
+        start = datetime.datetime(2024, 12, 1, tzinfo=datetime.UTC)
+        assert shift_bucket(start, "month", 1) == start.replace(year=2025, month=1)
+        assert shift_bucket(start, "month", -12) == start.replace(year=2023)
+        assert shift_bucket(start, "week", -1) == start.replace(month=11, day=24)
+
+    def test_invalid_interval(self) -> None:
+        with pytest.raises(ValueError, match="interval"):
+            TimestampPartitioning(interval="year")  # type: ignore[reportArgumentType]
+
+
+@pytest.mark.django_db
+class TestMaintainPartitions:
+    NOW = datetime.datetime(2024, 3, 15, tzinfo=datetime.UTC)
+
+    @pytest.fixture(autouse=True)
+    def partitioning(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            ImplementedModelWithTimestamps,
+            "partitioning",
+            TimestampPartitioning(retain=1),
+        )
+        ImplementedModelWithTimestamps.objects.bulk_create(
+            ImplementedModelWithTimestamps(
+                name=name,
+                info_timestamp=info_timestamp,
+                info_modified_timestamp=info_timestamp,
+            )
+            for name, info_timestamp in (
+                ("old", datetime.datetime(2024, 1, 31, tzinfo=datetime.UTC)),
+                ("retained", datetime.datetime(2024, 2, 1, tzinfo=datetime.UTC)),
+                ("current", self.NOW),
+            )
+        )
+
+    def test_archive_fallback(self) -> None:
+        report = maintain_partitions(ImplementedModelWithTimestamps, now=self.NOW)
+        assert report.archived_rows == 1
+        assert report.created == report.detached == []
+        assert sorted(
+            ImplementedModelWithTimestamps.objects.values_list("name", flat=True),
+        ) == ["current", "retained"]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM test_app_implementedmodelwithtimestamps_archive",
+            )
+            assert cursor.fetchall() == [("old",)]
+
+    def test_archive_fallback_in_batches(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        ImplementedModelWithTimestamps.objects.filter(name="retained").update(
+            info_timestamp=datetime.datetime(2023, 12, 1, tzinfo=datetime.UTC),
+        )
+        # Every archived row is copied and deleted in a separate batch
+        monkeypatch.setattr(connection.ops, "bulk_batch_size", lambda _fields, _objs: 1)
+
+        report = maintain_partitions(ImplementedModelWithTimestamps, now=self.NOW)
+
+        assert report.archived_rows == 2  # noqa: PLR2004 - The old and retained rows
+        assert list(
+            ImplementedModelWithTimestamps.objects.values_list("name", flat=True),
+        ) == ["current"]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM test_app_implementedmodelwithtimestamps_archive",
+            )
+            assert sorted(cursor.fetchall()) == [("old",), ("retained",)]
+
+    def test_not_enabled(self) -> None:
+        with pytest.raises(ValueError, match="not enabled"):
+            maintain_partitions(ImplementedGetOrNew)
+
+    def test_command(self) -> None:
+        output = StringIO()
+        call_command("manage_partitions", stdout=output)
+        # The command uses the current time so every row is older than the cutoff
+        assert "archived 3 rows" in output.getvalue()
+        with pytest.raises(CommandError, match="not enabled"):
+            call_command("manage_partitions", "test_app.ImplementedGetOrNew")
+
+
+def refresh_name(instance: ImplementedModelWithTimestamps) -> datetime.datetime:
+    """Refresh a row for the refresh_stale command, which imports fetch by path."""
+    instance.name = "refreshed"
+    return CURRENT_TIMESTAMP
+
+
+@pytest.mark.django_db
+class TestRefreshOutdated:
+    OUTDATED_COUNT = 3
+
+    @pytest.fixture(autouse=True)
+    def rows(self) -> None:
+        ImplementedModelWithTimestamps.objects.bulk_create(
+            ImplementedModelWithTimestamps(
+                name="outdated",
+                info_timestamp=timestamp,
+                info_modified_timestamp=timestamp,
+            )
+            for timestamp in [PAST_TIMESTAMP] * self.OUTDATED_COUNT + [FUTURE_TIMESTAMP]
+        )
+
+    def test_refresh_outdated(self) -> None:
+        outdated_count = self.OUTDATED_COUNT
+
+        def fetch(instance: ImplementedModelWithTimestamps) -> datetime.datetime:
+            instance.name = "refreshed"
+            return CURRENT_TIMESTAMP
+
+        refreshed = refresh_outdated(
+            ImplementedModelWithTimestamps,
+            fetch,
+            CURRENT_TIMESTAMP,
+            chunk_size=2,
+            max_workers=2,
+            batch_size=2,
+        )
+
+        assert refreshed == outdated_count
+        assert not ImplementedModelWithTimestamps.objects.outdated(CURRENT_TIMESTAMP)
+        refreshed_rows = ImplementedModelWithTimestamps.objects.filter(name="refreshed")
+        assert refreshed_rows.count() == outdated_count
+
+    # The test database is not visible to other processes so the batches are run in
+    # the test process, the worker processes run the same _refresh_batch function.
+    def test_refresh_outdated_in_processes(self) -> None:
+        stats = refresh_outdated_in_processes(
+            ImplementedModelWithTimestamps,
+            refresh_name,
+            CURRENT_TIMESTAMP,
+            processes=0,
+            batch_size=2,
+        )
+
+        assert stats.rows == self.OUTDATED_COUNT
+        assert stats.batches == math.ceil(self.OUTDATED_COUNT / 2)
+        assert not ImplementedModelWithTimestamps.objects.outdated(CURRENT_TIMESTAMP)
+        refreshed_rows = ImplementedModelWithTimestamps.objects.filter(name="refreshed")
+        assert refreshed_rows.count() == self.OUTDATED_COUNT
+
+    def test_refresh_stats(self) -> None:
+        stats = RefreshStats(rows=10, seconds=2.0, batch_seconds=[0.4, 0.1, 0.3, 0.2])
+        assert stats.batches == 4  # noqa: PLR2004 - The number of batch times
+        assert stats.rows_per_second == 5  # noqa: PLR2004 - 10 rows in 2 seconds
+        assert stats.batch_percentile(50) == 0.2  # noqa: PLR2004 - The second time
+        assert stats.batch_percentile(100) == 0.4  # noqa: PLR2004 - The largest time
+        assert RefreshStats().batch_percentile(95) == 0
+
+    def test_outdated_counts(self) -> None:
+        counts = ImplementedModelWithTimestamps.objects.outdated_counts(
+            CURRENT_TIMESTAMP,
+        )
+        assert counts == (self.OUTDATED_COUNT + 1, self.OUTDATED_COUNT)
+
+    def test_stale_report_command(self) -> None:
+        output = StringIO()
+        call_command(
+            "stale_report",
+            "test_app.ImplementedModelWithTimestamps",
+            f"--minimum-info-timestamp={CURRENT_TIMESTAMP.isoformat()}",
+            stdout=output,
+        )
+        assert output.getvalue() == (
+            "test_app.ImplementedModelWithTimestamps: 3 of 4 rows outdated (75.0%)\n"
+        )
+
+        output = StringIO()
+        call_command("stale_report", stdout=output)
+        assert "test_app.ImplementedModelWithChangeTracking" in output.getvalue()
+        assert "test_app.ImplementedGetOrNew:" not in output.getvalue()
+
+        with pytest.raises(CommandError, match="not a subclass"):
+            call_command("stale_report", "test_app.ImplementedGetOrNew")
+        with pytest.raises(CommandError, match="ISO 8601"):
+            call_command("stale_report", "--minimum-info-timestamp=yesterday")
+
+    def test_refresh_stale_command(self) -> None:
+        output = StringIO()
+        call_command(
+            "refresh_stale",
+            "tests.test_thing.refresh_name",
+            "test_app.ImplementedModelWithTimestamps",
+            f"--minimum-info-timestamp={CURRENT_TIMESTAMP.isoformat()}",
+            "--processes=0",
+            "--batch-size=2",
+            stdout=output,
+        )
+        assert output.getvalue().startswith(
+            "test_app.ImplementedModelWithTimestamps: refreshed 3 rows in ",
+        )
+        assert "in 2 batches, batch latency p50 " in output.getvalue()
+        assert not ImplementedModelWithTimestamps.objects.outdated(CURRENT_TIMESTAMP)
+
+        with pytest.raises(CommandError, match="missing"):
+            call_command("refresh_stale", "tests.test_thing.missing")
+
+
+@pytest.mark.django_db
+class TestCombinedManagers:
+    def test_combined_manager(self) -> None:
+        instance, created = ImplementedGetOrNewWithTimestamps.objects.get_or_new(
+            name="name",
+        )
+        assert created
+        instance.add_timestamps_and_save(PAST_TIMESTAMP)
+
+        manager = ImplementedGetOrNewWithTimestamps.objects
+        assert manager.get_or_new(name="name") == (instance, False)
+        assert list(manager.outdated(CURRENT_TIMESTAMP)) == [instance]
+        assert manager.filter(name="name").outdated_counts(CURRENT_TIMESTAMP) == (1, 1)
+        assert ImplementedGetOrNewWithTimestamps._default_manager is manager  # noqa: SLF001 - Testing the default manager
+
+    def test_refresh_outdated(self) -> None:
+        ImplementedGetOrNewWithTimestamps.objects.bulk_create(
+            ImplementedGetOrNewWithTimestamps(
+                name=str(number),
+                info_timestamp=PAST_TIMESTAMP,
+                info_modified_timestamp=PAST_TIMESTAMP,
+            )
+            for number in range(2)
+        )
+
+        refreshed = refresh_outdated(
+            ImplementedGetOrNewWithTimestamps,
+            lambda _instance: CURRENT_TIMESTAMP,
+            CURRENT_TIMESTAMP,
+        )
+
+        assert refreshed == 2  # noqa: PLR2004 - Both rows are outdated
+        assert not ImplementedGetOrNewWithTimestamps.objects.outdated(CURRENT_TIMESTAMP)
+
+    def test_commands_do_not_use_objects(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        ImplementedGetOrNewWithTimestamps(name="name").add_timestamps_and_save(
+            PAST_TIMESTAMP,
+        )
+        # The commands must work with any manager, such as a manager defined by the
+        # model that does not have the timestamp methods
+        monkeypatch.setattr(ImplementedGetOrNewWithTimestamps, "objects", None)
+        label = "test_app.ImplementedGetOrNewWithTimestamps"
+        timestamp = f"--minimum-info-timestamp={CURRENT_TIMESTAMP.isoformat()}"
+
+        output = StringIO()
+        call_command("stale_report", stdout=output)
+        assert f"{label}: 0 of 1 rows outdated" in output.getvalue()
+
+        output = StringIO()
+        call_command("stale_report", label, timestamp, stdout=output)
+        assert output.getvalue().startswith(f"{label}: 1 of 1 rows outdated")
+
+        output = StringIO()
+        call_command(
+            "refresh_stale",
+            "tests.test_thing.refresh_name",
+            label,
+            timestamp,
+            "--processes=0",
+            stdout=output,
+        )
+        assert output.getvalue().startswith(f"{label}: refreshed 1 rows in ")
+        queryset = ImplementedGetOrNewWithTimestamps.timestamps_queryset()
+        assert not queryset.outdated(CURRENT_TIMESTAMP)
+        assert queryset.get().name == "refreshed"
+
+
+@pytest.mark.django_db
+class TestProcessDue:
+    def test_process_due(self) -> None:
+        ImplementedModelWithUpdateAt.objects.bulk_create(
+            ImplementedModelWithUpdateAt(
+                name=name,
+                info_timestamp=CURRENT_TIMESTAMP,
+                info_modified_timestamp=CURRENT_TIMESTAMP,
+                updated_at=updated_at,
+            )
+            for name, updated_at in (
+                ("second", PAST_TIMESTAMP),
+                ("first", PAST_TIMESTAMP - datetime.timedelta(days=1)),
+                ("not due", FUTURE_TIMESTAMP),
+            )
+        )
+        processed: list[list[str]] = []
+
+        def worker(rows: list[ImplementedModelWithUpdateAt]) -> None:
+            processed.append([row.name for row in rows])
+
+        backoff = datetime.timedelta(days=2)
+        process_due = ImplementedModelWithUpdateAt.objects.process_due
+        assert process_due(worker, limit=1, backoff=backoff, now=CURRENT_TIMESTAMP) == 1
+        assert process_due(worker, backoff=backoff, now=CURRENT_TIMESTAMP) == 1
+        assert process_due(worker, backoff=backoff, now=CURRENT_TIMESTAMP) == 0
+
+        assert processed == [["first"], ["second"]]
+        assert not ImplementedModelWithUpdateAt.objects.due(CURRENT_TIMESTAMP)
+        rescheduled = ImplementedModelWithUpdateAt.objects.get(name="first")
+        assert rescheduled.updated_at == CURRENT_TIMESTAMP + backoff
+
+    def test_process_due_worker_error(self) -> None:
+        ImplementedModelWithUpdateAt.objects.create(
+            name="due",
+            info_timestamp=CURRENT_TIMESTAMP,
+            info_modified_timestamp=CURRENT_TIMESTAMP,
+            updated_at=PAST_TIMESTAMP,
+        )
+
+        def worker(_rows: list[ImplementedModelWithUpdateAt]) -> None:
+            msg = "worker failed"
+            raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError, match="worker failed"):
+            ImplementedModelWithUpdateAt.objects.process_due(worker)
+        assert ImplementedModelWithUpdateAt.objects.get().updated_at == PAST_TIMESTAMP